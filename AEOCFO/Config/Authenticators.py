@@ -1,7 +1,15 @@
 from googleapiclient.discovery import build
 from google.oauth2 import service_account
+from google.auth.transport.requests import Request
+from google.cloud import bigquery, storage
+import threading
 import os
 
+try:
+    from google.cloud import bigquery_storage_v1
+except ImportError: # optional, only needed for the BigQuery Storage Write API
+    bigquery_storage_v1 = None
+
 #NOTE
 # Removing function calls from datastructures and dictionaries
 # makes it so that service_account.Credentials.from_service_account_file(key_file) doesn't get invoked at import time 
@@ -31,6 +39,106 @@ accounts_info = {
     },
 }
 
+# ----------------------------
+# Client Registry
+# ----------------------------
+# Credentials are built once per (account, platform) and shared by the whole process.
+# googleapiclient service objects are not thread safe (they sit on an httplib2 connection) so drive services are cached per thread instead.
+
+_registry_lock = threading.Lock()
+_credentials_registry = {}
+_thread_local = threading.local()
+
+def _platform_scopes(platform):
+    return {
+        "drive": SCOPES["DRIVE"],
+        "bigquery": SCOPES["BQ"],
+        "googlecloud": SCOPES["GCP"],
+    }[platform]
+
+def _refresh_if_expired(creds):
+    """Refreshes credentials whose token has expired. Fresh credentials with no token yet are fetched lazily on their first request."""
+    if creds.token is not None and not creds.valid:
+        with _registry_lock:
+            if not creds.valid: # another thread may have refreshed while we waited
+                creds.refresh(Request())
+    return creds
+
+def get_cached_credentials(acc, platform):
+    """Returns the process-wide service account credentials for an account and platform, reading the key file only on first use."""
+    key = (acc, platform)
+    creds = _credentials_registry.get(key)
+    if creds is None:
+        with _registry_lock:
+            creds = _credentials_registry.get(key)
+            if creds is None:
+                key_file = accounts_info[acc]["key_file"]
+                creds = service_account.Credentials.from_service_account_file(key_file, scopes=_platform_scopes(platform))
+                _credentials_registry[key] = creds
+    return _refresh_if_expired(creds)
+
+def get_cached_drive_client(acc):
+    """Returns this thread's drive service for an account, building it on first use. Credentials are shared across threads."""
+    services = getattr(_thread_local, "services", None)
+    if services is None:
+        services = _thread_local.services = {}
+    if acc not in services:
+        creds = get_cached_credentials(acc, "drive")
+        services[acc] = build(API["NAME"], API["VERSION"], credentials=creds, cache_discovery=False)
+    else:
+        _refresh_if_expired(get_cached_credentials(acc, "drive"))
+    return services[acc]
+
+_cloud_client_registry = {}
+
+def get_cached_bigquery_client(project_id, acc="primary"):
+    """Returns the process-wide bigquery.Client for a project. Unlike googleapiclient services these clients are safe to share between threads."""
+    key = (acc, "bigquery", project_id)
+    client = _cloud_client_registry.get(key)
+    if client is None:
+        creds = authenticate_credentials(acc, "bigquery")
+        with _registry_lock:
+            client = _cloud_client_registry.get(key)
+            if client is None:
+                client = bigquery.Client(project=project_id, credentials=creds)
+                _cloud_client_registry[key] = client
+    return client
+
+def get_cached_storage_client(project_id, acc="pusher"):
+    """Returns the process-wide storage.Client for a project, shared between threads like the bigquery clients."""
+    key = (acc, "googlecloud", project_id)
+    client = _cloud_client_registry.get(key)
+    if client is None:
+        creds = authenticate_credentials(acc, "googlecloud")
+        with _registry_lock:
+            client = _cloud_client_registry.get(key)
+            if client is None:
+                client = storage.Client(project=project_id, credentials=creds)
+                _cloud_client_registry[key] = client
+    return client
+
+def get_cached_bigquery_write_client(acc="primary"):
+    """Returns the process-wide BigQuery Storage Write API client. Requires google-cloud-bigquery-storage."""
+    if bigquery_storage_v1 is None:
+        raise ImportError("The BigQuery Storage Write API requires google-cloud-bigquery-storage, install it with `pip install google-cloud-bigquery-storage`")
+    key = (acc, "bigquery-write")
+    client = _cloud_client_registry.get(key)
+    if client is None:
+        creds = authenticate_credentials(acc, "bigquery")
+        with _registry_lock:
+            client = _cloud_client_registry.get(key)
+            if client is None:
+                client = bigquery_storage_v1.BigQueryWriteClient(credentials=creds)
+                _cloud_client_registry[key] = client
+    return client
+
+def reset_clients():
+    """Drops every cached credential, cloud client and this thread's services (eg. after rotating a key file)."""
+    with _registry_lock:
+        _credentials_registry.clear()
+        _cloud_client_registry.clear()
+    _thread_local.services = {}
+
 def get_drive_client(key_file):
     creds = service_account.Credentials.from_service_account_file(key_file, scopes=SCOPES["DRIVE"])
     return build(API["NAME"], API["VERSION"], credentials=creds)
@@ -42,6 +150,11 @@ def get_googlecloud_credentials(key_file):
     return service_account.Credentials.from_service_account_file(key_file, scopes=SCOPES["GCP"])
 
 def authenticate_credentials(acc, platform):
+    """
+    Returns a drive service (platform 'drive') or credentials (platforms 'bigquery' and 'googlecloud') for an account.
+    Clients come from the process-wide registry so the key file is read and the drive service is built once per process
+    (once per thread for drive services) rather than on every call.
+    """
     acc = acc.strip().lower()
     platform = platform.strip().lower()
 
@@ -49,19 +162,15 @@ def authenticate_credentials(acc, platform):
         raise ValueError(f"Account '{acc}' not supported. Choose from: {list(accounts_info.keys())}")
 
     info = accounts_info[acc]
-    key_file = info["key_file"]
     platforms = info["platforms"]
 
     if platform not in platforms:
         raise ValueError(f"Platform '{platform}' not supported for account '{acc}'. Supported: {list(platforms)}")
 
-    # Instantiate on demand 
+    # Instantiate on demand, then reuse
     if platform == "drive":
-        return get_drive_client(key_file)
-    elif platform == "bigquery":
-        return get_bq_credentials(key_file)
-    elif platform == "googlecloud":
-        return get_googlecloud_credentials(key_file)
+        return get_cached_drive_client(acc)
+    elif platform in ("bigquery", "googlecloud"):
+        return get_cached_credentials(acc, platform)
     else:
         raise ValueError(f"Unknown platform '{platform}' requested.")
-
@@ -0,0 +1,127 @@
+# Explicit BigQuery schemas for each processing type's cleaned outputs.
+# 'Columns' maps a cleaned output column name to its BigQuery type. Columns that aren't listed
+# (eg. the raw sheet columns ABSA and FR carry through) keep their pandas type if it's numeric, bool or
+# datetime (eg. ABSA budget amounts stay FLOAT64) and otherwise load as 'Default Type', so a text column
+# where a week's values happen to look numeric doesn't change the table's type.
+# Supported types: 'STRING', 'FLOAT64', 'INT64', 'BOOL', 'DATE', 'TIMESTAMP'.
+#
+# Incremental ('merge') and consolidated ('consolidate') loads write every cleaned file into one long-lived 'Target Table' per dataset:
+# - 'Merge Keys': natural key columns identifying a row across weeks.
+# - 'Name Columns': columns parsed from the cleaned file name with a regex (first group) when the
+#   cleaned file doesn't already carry them, eg. the FR meeting date and FR number.
+# - 'Partition': column the target table is partitioned on, either by 'Granularity' for DATE columns
+#   or by integer 'Range' [start, end, interval] (eg. two digit fiscal years).
+# - 'Cluster': columns the target table is clustered on, at most 4.
+# Rows in a target table also carry the RUN_METADATA_COLUMNS identifying the file and run they came from.
+
+# Fiscal year as the two digit number in FY25, fr25, 24-25 or 24_25
+FISCAL_YEAR_PATTERN = r'(?:FY|fr|\d{2}[-_])(\d{2})'
+
+RUN_METADATA_COLUMNS = {
+    'Source File': 'STRING',
+    'Loaded At': 'TIMESTAMP'
+}
+BQ_SCHEMAS = {
+    'ABSA': {
+        'Columns': {
+            'Organization': 'STRING',
+            'Org Category': 'STRING',
+            'Year': 'STRING',
+            'Fiscal Year': 'INT64'
+        },
+        'Default Type': 'STRING',
+        'Target Table': 'ABSA_ALL',
+        'Merge Keys': ['Organization', 'Org Category', 'Year'],
+        'Name Columns': {'Year': r'(FY\d{2})', 'Fiscal Year': FISCAL_YEAR_PATTERN},
+        'Partition': {'Column': 'Fiscal Year', 'Range': [0, 100, 1]},
+        'Cluster': ['Organization']
+    },
+    'OASIS': {
+        'Columns': {
+            'Org ID': 'STRING',
+            'Organization Name': 'STRING',
+            'OASIS RSO Designation': 'STRING',
+            'Blue Heart': 'BOOL',
+            'Active': 'BOOL',
+            'Year': 'STRING',
+            'Fiscal Year': 'INT64'
+        },
+        'Default Type': 'STRING',
+        'Target Table': 'OASIS_ALL',
+        'Merge Keys': ['Org ID', 'Year'],
+        'Name Columns': {'Fiscal Year': FISCAL_YEAR_PATTERN},
+        'Partition': {'Column': 'Fiscal Year', 'Range': [0, 100, 1]},
+        'Cluster': ['Organization Name']
+    },
+    'CONTINGENCY': {
+        'Columns': {
+            'Organization Name': 'STRING',
+            'Ficomm Decision': 'STRING',
+            'Amount Allocated': 'FLOAT64',
+            'Date': 'DATE'
+        },
+        'Default Type': 'STRING',
+        'Target Table': 'CONTINGENCY_ALL',
+        'Merge Keys': ['Organization Name', 'Date'],
+        'Name Columns': {'Date': r'(\d{2}/\d{2}/\d{4})'},
+        'Partition': {'Column': 'Date', 'Granularity': 'MONTH'},
+        'Cluster': ['Organization Name']
+    },
+    'FR': {
+        'Columns': {
+            'Org Name': 'STRING',
+            'Type': 'STRING',
+            'Amount Requested': 'FLOAT64',
+            'Date': 'DATE',
+            'FR Number': 'STRING'
+        },
+        'Default Type': 'STRING',
+        'Target Table': 'FR_ALL',
+        'Merge Keys': ['Org Name', 'Date', 'FR Number'],
+        'Name Columns': {'Date': r'(\d{2}/\d{2}/\d{4})', 'FR Number': r'-((?:F|S)\d{1,2})-'},
+        'Partition': {'Column': 'Date', 'Granularity': 'MONTH'},
+        'Cluster': ['Org Name']
+    },
+    'FICCOMBINE': {
+        'Columns': {
+            'club_name': 'STRING',
+            'Amount Requested': 'FLOAT64',
+            'Amount Allocated': 'FLOAT64',
+            'Org Type_matched': 'STRING',
+            'BlueHeart_matched': 'STRING',
+            'Org ID Status_matched': 'STRING',
+            'Fiscal Year': 'INT64'
+        },
+        'Default Type': 'STRING',
+        'Target Table': 'FICCOMBINE_ALL',
+        'Name Columns': {'Fiscal Year': r'FY(\d{2})'}, # names also hold the meeting date as mm_dd
+        'Partition': {'Column': 'Fiscal Year', 'Range': [0, 100, 1]},
+        'Cluster': ['club_name']
+    }
+}
+
+DEFAULT_SCHEMA = {'Columns': {}, 'Default Type': 'STRING'}
+
+def get_bq_schemas():
+    return BQ_SCHEMAS
+
+def get_bq_schema(process_type):
+    """Returns the schema registered for a process type. Unregistered types (eg. ACCOUNTS) load every column as 'STRING'."""
+    return BQ_SCHEMAS.get(process_type.upper(), DEFAULT_SCHEMA)
+
+def get_run_metadata_columns():
+    return RUN_METADATA_COLUMNS
+
+def get_target_config(process_type):
+    """Returns the target table, name columns, partitioning and clustering for a process type's consolidated table."""
+    schema = get_bq_schema(process_type)
+    if not schema.get('Target Table'):
+        raise ValueError(f"No target table registered for process type '{process_type}', consolidated loading isn't supported")
+    return schema['Target Table'], schema.get('Name Columns', {}), schema.get('Partition'), schema.get('Cluster', [])
+
+def get_merge_config(process_type):
+    """Returns the target table, merge keys and name columns for a process type's incremental loads."""
+    schema = get_bq_schema(process_type)
+    if not schema.get('Merge Keys'):
+        raise ValueError(f"No merge keys registered for process type '{process_type}', incremental loading isn't supported")
+    return schema['Target Table'], schema['Merge Keys'], schema.get('Name Columns', {})
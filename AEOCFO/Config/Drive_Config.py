@@ -1,37 +1,37 @@
-from AEOCFO.Utility.Drive_Helpers import download_csv, download_text, download_any_spreadsheet
+from AEOCFO.Utility.Drive_Helpers import download_csv, download_text, download_any_spreadsheet, download_dataframe
 
 PROCESS_CONFIG = {
     'ABSA': {
         'query_type': 'csv',
-        'handler': lambda fid, mime, svc: download_csv(fid, svc)
+        'handler': lambda fid, mime, svc, version=None: download_csv(fid, svc, version=version)
     },
     'OASIS': {
         'query_type': 'csv',
-        'handler': lambda fid, mime, svc: download_csv(fid, svc)
+        'handler': lambda fid, mime, svc, version=None: download_csv(fid, svc, version=version)
     },
     'CONTINGENCY': {
         'query_type': 'gdoc',
-        'handler': lambda fid, mime, svc: download_text(fid, mime, svc)
+        'handler': lambda fid, mime, svc, version=None: download_text(fid, mime, svc, version=version)
     },
     'FR' : {
         'query_type': 'csv+gspreadsheet',
-        'handler': lambda fid, mime, svc: download_any_spreadsheet(fid, mime, svc, output='both')
+        'handler': lambda fid, mime, svc, version=None: download_any_spreadsheet(fid, mime, svc, output='both', version=version)
     }, 
-    'BIGQUERY' : {
-        'query_type': 'csv', 
-        'handler': lambda fid, mime, svc: download_csv(fid, svc)
+    'BIGQUERY' : { # cleaned outputs, in whichever output format their processing type is configured with
+        'query_type': 'csv+csv.gz+parquet', 
+        'handler': lambda fid, mime, svc, version=None: download_dataframe(fid, mime, svc, version=version)
     }, 
-    'FICCOMBINE' : {
-        'query_type': 'csv', 
-        'handler': lambda fid, mime, svc: download_csv(fid, svc)
+    'FICCOMBINE' : { # cleaned outputs, in whichever output format their processing type is configured with
+        'query_type': 'csv+csv.gz+parquet', 
+        'handler': lambda fid, mime, svc, version=None: download_dataframe(fid, mime, svc, version=version)
     }, 
     'ACCOUNTS' : {
         'query_type': 'csv', 
-        'handler': lambda fid, mime, svc: download_csv(fid, svc)
+        'handler': lambda fid, mime, svc, version=None: download_csv(fid, svc, version=version)
     }, 
     'TRANSACS' : {
         'query_type': 'csv', 
-        'handler': lambda fid, mime, svc: download_csv(fid, svc)
+        'handler': lambda fid, mime, svc, version=None: download_csv(fid, svc, version=version)
     }
 }
 
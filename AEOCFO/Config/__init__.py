@@ -1,3 +1,4 @@
 from .Drive_Config import *
 from .Folders import *
 from .Authenticators import authenticate_credentials
+from .BQ_Config import *
@@ -1,17 +1,115 @@
 from google.cloud import bigquery
+import io
+import re
+import hashlib
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from AEOCFO.Utility.Logger_Utils import get_logger
+from AEOCFO.Utility.Drive_Cache import get_bigquery_cache
+from AEOCFO.Config.Authenticators import get_cached_bigquery_client
 
-def pull_from_bigquery(project_id: str, query: str) -> pd.DataFrame:
+# Functions whose result changes between runs of the same query, BigQuery doesn't cache these queries either
+NONDETERMINISTIC_FUNCTIONS = re.compile(r"\bCURRENT_(?:DATE|DATETIME|TIME|TIMESTAMP)\b|\b(?:RAND|GENERATE_UUID|SESSION_USER)\s*\(", re.IGNORECASE)
+
+def build_select_query(table: str, columns: list[str] = None, row_filter: str = None) -> str:
+    """
+    Builds a SELECT over a single table, only reading the requested columns.
+    table (str): fully qualified 'project.dataset.table' id.
+    columns (list[str]): columns to read, all columns if None.
+    row_filter (str): SQL boolean expression for the WHERE clause, eg. "Fiscal_Year = 25".
+    """
+    select = ", ".join(f"`{col}`" for col in columns) if columns else "*"
+    query = f"SELECT {select} FROM `{table}`"
+    if row_filter:
+        query += f" WHERE {row_filter}"
+    return query
+
+def _tables_version(client: bigquery.Client, query: str) -> str | None:
+    """
+    Returns a token that changes whenever any table the query reads is modified, found with a free dry run of the query.
+    Returns None when the result shouldn't be cached: the query calls a non-deterministic function (eg. CURRENT_DATE() for
+    "last 7 days" pulls), reads no tables, or reads a table with no modification time (eg. a view) or with rows still in its
+    streaming buffer (eg. from Storage Write API appends), whose modification time doesn't cover those rows.
+    """
+    if NONDETERMINISTIC_FUNCTIONS.search(query):
+        return None
+    dry_run = client.query(query, job_config=bigquery.QueryJobConfig(dry_run=True, use_query_cache=False))
+    if not dry_run.referenced_tables:
+        return None
+    versions = []
+    for ref in dry_run.referenced_tables:
+        table = client.get_table(ref)
+        if table.modified is None or table.streaming_buffer is not None:
+            return None
+        versions.append(f"{table.full_table_id}@{table.modified.isoformat()}")
+    return "|".join(sorted(versions))
+
+def pull_from_bigquery(project_id: str,
+                       query: str = None,
+                       table: str = None,
+                       columns: list[str] = None,
+                       row_filter: str = None,
+                       use_cache: bool = True,
+                       use_storage_api: bool = True,
+                       acc: str = "primary",
+                       output: str = "pandas",
+                       reporting: bool = False) -> pd.DataFrame | pa.Table:
     """
     Executes a SQL query on BigQuery and returns the result as a DataFrame.
+    Instead of a query a single table can be read with optional column and row filters, so only the needed columns are scanned.
+    Results are downloaded as Arrow, through the BigQuery Storage read API when google-cloud-bigquery-storage is installed.
+
+    Results are cached on disk as Parquet keyed by the query plus the last modified time of every table it references,
+    so repeated pulls are served locally until one of those tables changes. Queries BigQuery wouldn't cache either (non-deterministic
+    functions, no tables, tables with a streaming buffer) always run, see _tables_version.
 
     Args:
         project_id (str): Google Cloud project ID.
         query (str): SQL query string.
+        table (str): Fully qualified 'project.dataset.table' to read instead of a query.
+        columns (list[str]): Columns to read from 'table'.
+        row_filter (str): SQL boolean expression restricting the rows read from 'table'.
+        use_cache (bool): Whether or not to serve and store results in the local cache.
+        use_storage_api (bool): Whether or not to download results through the Storage read API when it's available.
+        acc (str): Account to authenticate with (see authenticate_credentials).
+        output (str): 'pandas' for a DataFrame or 'arrow' for a pyarrow Table.
+        reporting (bool): If True, print extra info.
 
     Returns:
-        pd.DataFrame: Query result as a DataFrame.
+        pd.DataFrame: Query result as a DataFrame (or pa.Table with output='arrow').
     """
-    client = bigquery.Client(project=project_id)
-    df = client.query(query).to_dataframe()
-    return df
\ No newline at end of file
+    if (query is None) == (table is None):
+        raise ValueError("Specify exactly one of 'query' or 'table'")
+    if query is not None and (columns or row_filter):
+        raise ValueError("'columns' and 'row_filter' only apply when reading a 'table'")
+    if output not in ("pandas", "arrow"):
+        raise ValueError(f"Unknown output '{output}'. Please specify either 'pandas' or 'arrow'")
+    if table is not None:
+        query = build_select_query(table, columns, row_filter)
+
+    logger = get_logger("BIGQUERY")
+    client = get_cached_bigquery_client(project_id, acc=acc)
+
+    cache, key = None, None
+    if use_cache:
+        version = _tables_version(client, query)
+        if version is not None:
+            cache = get_bigquery_cache()
+            key = cache.key(hashlib.sha256(query.encode("utf-8")).hexdigest(), version, variant="parquet")
+            data = cache.get(key)
+            if data is not None:
+                result = pq.read_table(io.BytesIO(data))
+                logger.info(f"Served {result.num_rows} rows from the bigquery cache")
+                if reporting: print(f"Served {result.num_rows} rows from the bigquery cache")
+                return result if output == "arrow" else result.to_pandas()
+
+    result = client.query(query).result().to_arrow(create_bqstorage_client=use_storage_api)
+    logger.info(f"Pulled {result.num_rows} rows from bigquery")
+    if reporting: print(f"Pulled {result.num_rows} rows from bigquery")
+
+    if cache is not None:
+        buffer = io.BytesIO()
+        pq.write_table(result, buffer)
+        cache.put(key, buffer.getvalue())
+    return result if output == "arrow" else result.to_pandas()
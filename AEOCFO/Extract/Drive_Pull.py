@@ -1,21 +1,55 @@
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from collections import deque
 from AEOCFO.Utility.Logger_Utils import get_logger
 from AEOCFO.Config.Authenticators import authenticate_credentials
 from AEOCFO.Utility.Drive_Helpers import list_files
+from AEOCFO.Utility.Drive_Cache import file_version
 from AEOCFO.Config.Drive_Config import get_process_config
 from AEOCFO.Config.Folders import get_test_file_names
 
 PROCESS_CONFIG = get_process_config()
 
-def drive_pull(folder_id: str, process_type: str, name_keywords: Iterable[str] = None, reporting=False, debug=False, testing=False) -> tuple[dict[str, pd.DataFrame | str | tuple], dict[str, str]]:
+def _pull_file(file: dict, handler, service, logger, reporting=False, debug=False, use_cache=True) -> tuple[str, str, object, Exception | None]:
     """
-    Pulls files for a given process type from a Google Drive folder and loads them.
+    Downloads a single file with the process type's handler. Errors are caught and returned rather than raised
+    so one bad file doesn't take down the rest of the pull.
+    If use_cache is set the file's version token is handed to the handler so unchanged files are read from the local DriveCache.
 
     Returns:
-    - dict[file_id] = processed file (DataFrame, str, or tuple[DataFrame, str])
-    - dict[file_id] = file name
+    - (file_id, file_name, result, error) where exactly one of result/error is None
+    """
+    file_id = file['id']
+    file_name = file['name']
+    mime = file.get('mimeType')
+
+    try:
+        version = file_version(file) if use_cache else None
+        result = handler(file_id, mime, service, version=version) # will be a tuple containing dataframe and txt doc in teh case of processing_type = 'FR'
+        if debug:
+            print(f"DEBUG: drive_pull file_name, id, mimeType:{file_name}, {file_id}, {mime}")
+            print(f"DEBUG: drive_pull result:\n{result}")
+
+        msg = f"Loaded: {file_name} ({file_id})"
+        if reporting: print(f"\n{msg}")
+        logger.info(msg)
+        return file_id, file_name, result, None
+
+    except Exception as e:
+        if reporting: print(f"Error processing {file_name} ({file_id}): {str(e)}")
+        logger.error(f"Error processing {file_name} ({file_id}): {str(e)}")
+        return file_id, file_name, None, e
+
+def drive_pull_iter(folder_id: str, process_type: str, name_keywords: Iterable[str] = None, reporting=False, debug=False, testing=False, max_workers: int = 1, use_cache: bool = True) -> Iterator[tuple[str, str, pd.DataFrame | str | tuple]]:
+    """
+    Generator version of drive_pull that yields each file as soon as it is downloaded instead of materialising the whole folder.
+    Files are yielded in folder listing order and files that fail to download are logged and skipped.
+    At most 2 * max_workers downloads are held in memory at once.
+
+    Yields:
+    - (file_id, file name, processed file (DataFrame, str, or tuple[DataFrame, str]))
     """
     process_type = process_type.upper()
     logger = get_logger(process_type)
@@ -23,6 +57,7 @@ def drive_pull(folder_id: str, process_type: str, name_keywords: Iterable[str] =
     if reporting: print(f"--- START: {process_type} drive_pull (Test Mode: {testing})---")
 
     assert process_type in PROCESS_CONFIG, f"Unsupported process_type '{process_type}'"
+    assert isinstance(max_workers, int) and max_workers >= 1, f"max_workers must be a positive integer but is {max_workers}"
 
     config = PROCESS_CONFIG[process_type]
     query_type = config['query_type']
@@ -41,40 +76,72 @@ def drive_pull(folder_id: str, process_type: str, name_keywords: Iterable[str] =
     if not files:
         logger.warning(f"No files found in designated extract folder {folder_id}")
         if reporting: print(f"No files found in designated extract folder {folder_id}")
-        return {}, {}
+        return
 
-    service = authenticate_credentials(acc='primary', platform='drive')
-    processed_data = {}
-    id_to_name = {}
+    if max_workers == 1:
+        service = authenticate_credentials(acc='primary', platform='drive')
+        outcomes = (_pull_file(file, handler, service, logger, reporting=reporting, debug=debug, use_cache=use_cache) for file in files)
+    else:
+        def worker(file):
+            service = authenticate_credentials(acc='primary', platform='drive') # the client registry hands each worker thread its own service
+            return _pull_file(file, handler, service, logger, reporting=reporting, debug=debug, use_cache=use_cache)
 
-    for file in tqdm(files, desc="Pulling files from folder", ncols=100):
-        file_id = file['id']
-        file_name = file['name']
-        mime = file.get('mimeType')
+        def ordered_outcomes(executor):
+            # keep a bounded window of downloads in flight and yield them in submission order so outputs line up with the folder listing
+            in_flight = deque()
+            for file in files:
+                in_flight.append(executor.submit(worker, file))
+                if len(in_flight) >= 2 * max_workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
 
-        try:
-            result = handler(file_id, mime, service) # will be a tuple containing dataframe and txt doc in teh case of processing_type = 'FR'
-            if debug:
-                print(f"DEBUG: drive_pull file_name, id, mimeType:{file_name}, {file_id}, {mime}")
-                print(f"DEBUG: drive_pull result:\n{result}")
-                
-            processed_data[file_id] = result
-            id_to_name[file_id] = file_name
+        logger.info(f"Pulling {len(files)} files with {max_workers} workers")
+        if reporting: print(f"Pulling {len(files)} files with {max_workers} workers")
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        outcomes = ordered_outcomes(executor)
 
-            msg = f"Loaded: {file_name} ({file_id})"
-            if reporting: print(f"\n{msg}")
-            logger.info(msg)
+    failed = []
+    try:
+        for file_id, file_name, result, error in tqdm(outcomes, total=len(files), desc="Pulling files from folder", ncols=100):
+            if error is not None:
+                failed.append(file_name)
+                continue
+            yield file_id, file_name, result
+    finally:
+        if max_workers != 1:
+            executor.shutdown(wait=True, cancel_futures=True) # consumer may stop early
 
-        except Exception as e:
-            if reporting: print(f"Error processing {file_name} ({file_id}): {str(e)}")
-            logger.error(f"Error processing {file_name} ({file_id}): {str(e)}")
+    if failed:
+        if reporting: print(f"drive_pull failed to load {len(failed)} file(s): {failed}")
+        logger.warning(f"drive_pull failed to load {len(failed)} file(s): {failed}")
 
     if reporting: 
         print("drive_pull successfully complete!")
         print(f"--- END: {process_type} drive_pull ---")
     logger.info("drive_pull successfully complete!")
     logger.info(f"--- END: {process_type} drive_pull ---")
+
+def drive_pull(folder_id: str, process_type: str, name_keywords: Iterable[str] = None, reporting=False, debug=False, testing=False, max_workers: int = 1, use_cache: bool = True) -> tuple[dict[str, pd.DataFrame | str | tuple], dict[str, str]]:
+    """
+    Pulls files for a given process type from a Google Drive folder and loads them.
+
+    Parameters:
+    - max_workers (int): Number of files to download concurrently. Default is 1 which downloads files one at a time.
+        Each worker thread builds its own Drive service since googleapiclient service objects are not thread safe.
+        Results are returned in the same order as the folder listing regardless of which download finishes first.
+    - use_cache (bool): Whether or not to serve files whose version hasn't changed since the last run from the local DriveCache.
+
+    Returns:
+    - dict[file_id] = processed file (DataFrame, str, or tuple[DataFrame, str])
+    - dict[file_id] = file name
+    """
+    processed_data = {}
+    id_to_name = {}
+    for file_id, file_name, result in drive_pull_iter(folder_id, process_type, name_keywords=name_keywords, reporting=reporting, debug=debug, testing=testing, max_workers=max_workers, use_cache=use_cache):
+        processed_data[file_id] = result
+        id_to_name[file_id] = file_name
     return processed_data, id_to_name
 
 
-# Processing Functions: in ASUCExplore > Processor.py
\ No newline at end of file
+# Processing Functions: in ASUCExplore > Processor.py
@@ -1,16 +1,71 @@
 from google.cloud import bigquery
+from google.api_core.exceptions import NotFound
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
+import io
+import uuid
+from datetime import datetime, timezone
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from AEOCFO.Utility.Logger_Utils import get_logger
-from AEOCFO.Config.Authenticators import authenticate_credentials
-from AEOCFO.Utility.BQ_Helpers import col_name_conversion, clean_name
+from AEOCFO.Config.Authenticators import get_cached_bigquery_client, get_cached_bigquery_write_client, bigquery_storage_v1
+from AEOCFO.Utility.BQ_Helpers import ARROW_TYPES, clean_name, resolve_bq_columns, to_arrow_table, name_columns, build_merge_query, build_replace_sources_query
 from AEOCFO.Config.Folders import get_overwrite_dataset_id
+from AEOCFO.Config.BQ_Config import get_bq_schema, get_merge_config, get_target_config, get_run_metadata_columns
 
 OVERWRITE_DATASET_ID = get_overwrite_dataset_id()
 
-def push_table(df: pd.DataFrame, project_id: str, dataset_id: str, table_id: str, if_exists: str = "replace"):
+WRITE_MODES = {
+    "replace": bigquery.WriteDisposition.WRITE_TRUNCATE,
+    "append": bigquery.WriteDisposition.WRITE_APPEND,
+    "fail": bigquery.WriteDisposition.WRITE_EMPTY
+}
+
+TARGET_MODES = ["merge", "consolidate"] # modes writing into the dataset's long-lived target table instead of a table per file
+
+ARCHIVE_METHODS = {
+    "snapshot": bigquery.job.OperationType.SNAPSHOT, # read-only, only stores what later changes
+    "copy": bigquery.job.OperationType.COPY
+}
+
+# Storage Write API (needs google-cloud-bigquery-storage). Small increments are appended through a write stream instead of a load job,
+# which skips load job scheduling and doesn't count against load job quotas.
+STREAM_ROW_THRESHOLD = 10000 # with write_api='auto', appends of at most this many rows are streamed
+STREAM_REQUEST_ROWS = 5000 # rows per append request, keeps requests well under the 10 MB limit
+WRITE_API_MODES = ["auto", "always", "never"]
+
+BATCH_INDEX_COL = "_batch_index" # staging-only column recording which file a row came from so the latest file wins a merge
+
+def load_arrow_table(client: bigquery.Client, table: pa.Table, table_ref: str, if_exists: str = "replace") -> bigquery.LoadJob:
+    """
+    Serialises an Arrow table to Parquet and submits a load job for it with an explicit schema taken from the table.
+    Returns the running job.
+    """
+    job_config = parquet_load_config(bq_schema_fields(table.schema), if_exists)
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    buffer.seek(0)
+    return client.load_table_from_file(buffer, table_ref, job_config=job_config)
+
+def parquet_load_config(fields: list[bigquery.SchemaField], if_exists: str = "replace") -> bigquery.LoadJobConfig:
+    """Load job config for Parquet files with an explicit schema."""
+    if if_exists not in WRITE_MODES:
+        raise ValueError(f"Invalid if_exists value: {if_exists}. Must be one of {list(WRITE_MODES.keys())}.")
+    job_config = bigquery.LoadJobConfig(
+        write_disposition=WRITE_MODES[if_exists],
+        source_format=bigquery.SourceFormat.PARQUET,
+        schema=fields
+    )
+    if if_exists == "append": # files of one dataset don't always share every column
+        job_config.schema_update_options = [bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION, bigquery.SchemaUpdateOption.ALLOW_FIELD_RELAXATION]
+    return job_config
+
+def push_table(df: pd.DataFrame, project_id: str, dataset_id: str, table_id: str, if_exists: str = "replace", client: bigquery.Client = None, wait: bool = True, schema: dict = None, constants: dict = None):
     """
     Uploads a DataFrame to BigQuery.
+    With a schema the frame is converted to Arrow, serialised as Parquet and loaded with an explicit BigQuery schema.
+    Without one BigQuery autodetects the column types.
 
     Args:
         df (pd.DataFrame): DataFrame to upload.
@@ -18,29 +73,224 @@ def push_table(df: pd.DataFrame, project_id: str, dataset_id: str, table_id: str
         dataset_id (str): BigQuery dataset ID.
         table_id (str): BigQuery table ID.
         if_exists (str): 'replace', 'append', or 'fail'.
+        client (bigquery.Client): Client to reuse. Default is the process-wide client for the project.
+        wait (bool): If True block until the load job finishes, otherwise return the running job.
+        schema (dict): Schema registry entry (see AEOCFO.Config.BQ_Config) for the frame's processing type.
+        constants (dict): Extra columns holding the same value on every row. Only used with a schema.
+
+    Returns:
+        bigquery.LoadJob: The submitted load job.
     """
-    creds = authenticate_credentials(acc='primary', platform='bigquery')
-    client = bigquery.Client(project=project_id, credentials=creds)
+    if client is None:
+        client = get_cached_bigquery_client(project_id)
     table_ref = f"{project_id}.{dataset_id}.{table_id}"
 
-    write_modes = {
-        "replace": bigquery.WriteDisposition.WRITE_TRUNCATE,
-        "append": bigquery.WriteDisposition.WRITE_APPEND,
-        "fail": bigquery.WriteDisposition.WRITE_EMPTY
-    }
+    if if_exists not in WRITE_MODES:
+        raise ValueError(f"Invalid if_exists value: {if_exists}. Must be one of {list(WRITE_MODES.keys())}.")
 
-    if if_exists not in write_modes:
-        raise ValueError(f"Invalid if_exists value: {if_exists}. Must be one of {list(write_modes.keys())}.")
+    if schema is None:
+        job_config = bigquery.LoadJobConfig(
+            write_disposition=WRITE_MODES[if_exists],
+            autodetect=True
+        )
+        job = client.load_table_from_dataframe(df, table_ref, job_config=job_config)
+    else:
+        constants = constants or {}
+        columns = resolve_bq_columns(list(df.columns) + list(constants.keys()), schema, dtypes=dict(df.dtypes))
+        job = load_arrow_table(client, to_arrow_table(df, columns, constants), table_ref, if_exists=if_exists)
+    if wait:
+        job.result()  # Wait for the job to complete
+        print(f"Uploaded {len(df)} rows to {table_ref} (mode: {if_exists}).")
+    return job
 
-    job_config = bigquery.LoadJobConfig(
-        write_disposition=write_modes[if_exists],
-        autodetect=True
-    )
+def bq_schema_fields(schema: pa.Schema) -> list[bigquery.SchemaField]:
+    """BigQuery schema matching an Arrow schema built by to_arrow_table."""
+    arrow_to_bq = {str(arrow_type): bq_type for bq_type, arrow_type in ARROW_TYPES.items()}
+    return [bigquery.SchemaField(field.name, arrow_to_bq[str(field.type)]) for field in schema]
+
+def _ensure_target(client: bigquery.Client, target_ref: str, fields: list[bigquery.SchemaField], partition: dict = None, cluster: list[str] = None) -> bigquery.Table:
+    """
+    Creates a dataset's target table on first use, partitioned and clustered as registered, and adds any columns 'fields' introduces.
+    partition (dict): 'Column' plus either 'Granularity' ('DAY', 'MONTH', 'YEAR') for DATE columns or 'Range' [start, end, interval] for INT64 columns.
+    cluster (list[str]): columns to cluster on.
+    """
+    table = bigquery.Table(target_ref, schema=fields)
+    if partition is not None:
+        column = clean_name(partition['Column'])
+        if 'Range' in partition:
+            start, end, interval = partition['Range']
+            table.range_partitioning = bigquery.RangePartitioning(field=column, range_=bigquery.PartitionRange(start=start, end=end, interval=interval))
+        else:
+            table.time_partitioning = bigquery.TimePartitioning(type_=partition.get('Granularity', 'DAY'), field=column)
+    if cluster:
+        table.clustering_fields = [clean_name(col) for col in cluster]
+    target = client.create_table(table, exists_ok=True)
 
-    job = client.load_table_from_dataframe(df, table_ref, job_config=job_config)
-    job.result()  # Wait for the job to complete
+    existing = {field.name for field in target.schema}
+    new_fields = [field for field in fields if field.name not in existing]
+    if new_fields:
+        target.schema = list(target.schema) + new_fields
+        target = client.update_table(target, ["schema"])
+    return target
+
+def _merge_staging(client: bigquery.Client, staging_ref: str, target_ref: str, merge_keys: list[str], partition: dict = None, cluster: list[str] = None) -> int:
+    """
+    Upserts a staging table into its target table on the merge keys. Creates the target on first use and adds any columns
+    the staged files introduce. Returns the number of target rows inserted or updated.
+    """
+    staging = client.get_table(staging_ref)
+    fields = [field for field in staging.schema if field.name != BATCH_INDEX_COL]
+    _ensure_target(client, target_ref, fields, partition, cluster)
+
+    query = build_merge_query(target_ref, staging_ref, [field.name for field in fields], [clean_name(key) for key in merge_keys], BATCH_INDEX_COL)
+    job = client.query(query)
+    job.result()
+    return job.num_dml_affected_rows or 0
+
+def use_write_api(num_rows: int, write_api: str = "auto", threshold: int = STREAM_ROW_THRESHOLD) -> bool:
+    """Whether an append of 'num_rows' rows should go through the Storage Write API ('always', 'never', or 'auto' for small appends when it's installed)."""
+    if write_api not in WRITE_API_MODES:
+        raise ValueError(f"Invalid write_api value: {write_api}. Must be one of {WRITE_API_MODES}.")
+    if write_api == "never":
+        return False
+    if write_api == "always":
+        return True
+    return bigquery_storage_v1 is not None and num_rows <= threshold
+
+def stream_arrow_table(table: pa.Table, table_ref: str, stream_type: str = "pending", write_client = None) -> int:
+    """
+    Appends an Arrow table to an existing BigQuery table with the Storage Write API.
+    stream_type (str): 'pending' makes every row visible at once when the stream is committed, so a failed append writes nothing.
+        'committed' makes rows visible as each request is acknowledged.
+
+    Returns:
+    - number of rows appended
+    """
+    if stream_type not in ("pending", "committed"):
+        raise ValueError(f"Invalid stream_type value: {stream_type}. Must be 'pending' or 'committed'.")
+    if write_client is None:
+        write_client = get_cached_bigquery_write_client() # raises ImportError without google-cloud-bigquery-storage
+    write_types = bigquery_storage_v1.types
+    project_id, dataset_id, table_id = table_ref.split(".")
+    parent = write_client.table_path(project_id, dataset_id, table_id)
+    stream_kind = write_types.WriteStream.Type.PENDING if stream_type == "pending" else write_types.WriteStream.Type.COMMITTED
+    stream = write_client.create_write_stream(parent=parent, write_stream=write_types.WriteStream(type_=stream_kind))
 
-    print(f"Uploaded {len(df)} rows to {table_ref} (mode: {if_exists}).")
+    writer_schema = write_types.ArrowSchema(serialized_schema=table.schema.serialize().to_pybytes())
+    requests, offset = [], 0
+    for batch in table.to_batches(max_chunksize=STREAM_REQUEST_ROWS):
+        requests.append(write_types.AppendRowsRequest(
+            write_stream=stream.name,
+            offset=offset, # offsets make retried requests idempotent
+            arrow_rows=write_types.AppendRowsRequest.ArrowData(
+                writer_schema=writer_schema,
+                rows=write_types.ArrowRecordBatch(serialized_record_batch=batch.serialize().to_pybytes(), row_count=batch.num_rows)
+            )
+        ))
+        offset += batch.num_rows
+    # the backend routes the bidi AppendRows stream on this header, writer.AppendRowsStream sends the same one
+    routing = (("x-goog-request-params", f"write_stream={stream.name}"),)
+    for response in write_client.append_rows(iter(requests), metadata=routing):
+        if response.error.code != 0:
+            raise RuntimeError(f"Storage Write API append to {table_ref} failed: {response.error.message}")
+
+    write_client.finalize_write_stream(name=stream.name)
+    if stream_type == "pending":
+        commit = write_client.batch_commit_write_streams(write_types.BatchCommitWriteStreamsRequest(parent=parent, write_streams=[stream.name]))
+        if commit.stream_errors:
+            raise RuntimeError(f"Storage Write API commit to {table_ref} failed: {commit.stream_errors[0].error_message}")
+    return offset
+
+def _append_arrow_table(client: bigquery.Client, table: pa.Table, table_ref: str, write_api: str = "auto", stream_threshold: int = STREAM_ROW_THRESHOLD,
+                        stream_type: str = "pending", logger = None) -> str:
+    """
+    Appends an Arrow table to an existing table, through the Storage Write API for small appends and a load job otherwise.
+    A failed pending stream writes nothing, so it falls back to a load job. Returns 'stream' or 'load', whichever was used.
+    """
+    if use_write_api(table.num_rows, write_api, stream_threshold):
+        try:
+            stream_arrow_table(table, table_ref, stream_type=stream_type)
+            return "stream"
+        except Exception as e:
+            if write_api == "always" or stream_type != "pending":
+                raise
+            if logger is not None: logger.warning(f"Storage Write API append to {table_ref} failed, falling back to a load job: {e}")
+    load_arrow_table(client, table, table_ref, if_exists="append").result()
+    return "load"
+
+def _unify_tables(tables: list[pa.Table]) -> list[pa.Table]:
+    """Gives every table the same columns in the same order, filling columns a file doesn't have with nulls."""
+    schema = pa.unify_schemas([table.schema for table in tables])
+    return [pa.Table.from_arrays([table.column(field.name) if field.name in table.column_names else pa.nulls(table.num_rows, field.type) for field in schema], schema=schema)
+            for table in tables]
+
+def _consolidate(client: bigquery.Client, tables: list[pa.Table], source_files: list[str], target_ref: str, staging_ref: str, partition: dict = None, cluster: list[str] = None,
+                 stage = None, stage_prefix: str = None, max_workers: int = 8, write_api: str = "auto", stream_threshold: int = STREAM_ROW_THRESHOLD,
+                 stream_type: str = "pending", logger = None) -> int:
+    """
+    Writes a run's files into the target table, replacing any rows previously loaded from the same source files so re-pushing a file
+    doesn't duplicate its rows. Returns the number of rows loaded.
+    The files are loaded into 'staging_ref' with a single load job first, then one transaction deletes the old rows and inserts the staged ones,
+    so a failed load leaves the target untouched. The caller deletes the staging table.
+    With a stage (see AEOCFO.Load.GCP_Push) every file is first written to 'stage_prefix' as Parquet and the load job reads them all from there
+    by wildcard, otherwise the combined files are uploaded with the load job, or appended through the Storage Write API when they're small.
+    """
+    tables = _unify_tables(tables)
+    fields = bq_schema_fields(tables[0].schema)
+    if stage is not None:
+        def write(item):
+            i, (table, source) = item
+            buffer = io.BytesIO()
+            pq.write_table(table, buffer)
+            return stage.write(f"{stage_prefix}/{i:04d}_{clean_name(source)}.parquet", buffer.getvalue())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(write, enumerate(zip(tables, source_files))))
+
+    client.create_table(bigquery.Table(staging_ref, schema=fields)) # exists up front so small runs can be streamed into it
+    if stage is not None:
+        stage.load(client, stage_prefix, staging_ref, parquet_load_config(fields, if_exists="append")).result()
+    else:
+        _append_arrow_table(client, pa.concat_tables(tables), staging_ref, write_api, stream_threshold, stream_type, logger)
+
+    _ensure_target(client, target_ref, fields, partition, cluster)
+    query = build_replace_sources_query(target_ref, staging_ref, [field.name for field in fields], clean_name('Source File'))
+    client.query(query, job_config=bigquery.QueryJobConfig(query_parameters=[bigquery.ArrayQueryParameter("source_files", "STRING", source_files)])).result()
+    return sum(table.num_rows for table in tables)
+
+def archive_table(client: bigquery.Client, table_ref: str, archive_dataset_id: str, stamp: str, method: str = "snapshot") -> str | None:
+    """
+    Archives a table into 'archive_dataset_id' with a server-side snapshot or copy job, so no data passes through this machine.
+    The archive is named '<dataset>__<table>__<stamp>'. Blocks until the job finishes.
+
+    Returns:
+    - the archive's table id, or None if the table doesn't exist yet so there is nothing to archive
+    """
+    if method not in ARCHIVE_METHODS:
+        raise ValueError(f"Invalid archive method: {method}. Must be one of {list(ARCHIVE_METHODS.keys())}.")
+    try:
+        table = client.get_table(table_ref)
+    except NotFound:
+        return None
+    archive_ref = f"{table.project}.{archive_dataset_id}.{table.dataset_id}__{table.table_id}__{stamp}"
+    job_config = bigquery.CopyJobConfig(operation_type=ARCHIVE_METHODS[method], write_disposition=bigquery.WriteDisposition.WRITE_EMPTY)
+    client.copy_table(table_ref, archive_ref, job_config=job_config).result()
+    return archive_ref
+
+def _has_columns(client: bigquery.Client, table_ref: str, df: pd.DataFrame, schema: dict) -> bool:
+    """Whether a table exists and already has every column of a frame, so rows can be streamed into it without a schema change."""
+    try:
+        table = client.get_table(table_ref)
+    except NotFound:
+        return False
+    existing = {field.name for field in table.schema}
+    return all(bq_name in existing for _, bq_name, _ in resolve_bq_columns(df.columns, schema, dtypes=dict(df.dtypes)))
+
+def _file_constants(df: pd.DataFrame, name: str, name_patterns: dict, loaded_at: datetime) -> dict:
+    """Columns added to every row of a file written to a target table: values parsed from its name (None if missing) and run metadata."""
+    parsed = name_columns(name, name_patterns)
+    constants = {col: parsed.get(col) for col in name_patterns if col not in df.columns}
+    constants.update({'Source File': name, 'Loaded At': loaded_at})
+    return constants
 
 def bigquery_push(dataset_id: str,
                   df_list: list[pd.DataFrame],
@@ -49,42 +299,171 @@ def bigquery_push(dataset_id: str,
                   duplicate_handling: str = "replace",
                   archive_dataset_id: str = OVERWRITE_DATASET_ID,
                   reporting: bool = False,
-                  project_id: str = "ocfo-primary"):
+                  project_id: str = "ocfo-primary",
+                  max_concurrent_jobs: int = 8,
+                  stage = None,
+                  archive_method: str = "snapshot",
+                  write_api: str = "auto",
+                  stream_threshold: int = STREAM_ROW_THRESHOLD,
+                  stream_type: str = "pending") -> dict[str, int]:
     """
     Pushes a list of DataFrames to BigQuery tables.
+    Column names and types come from the schema registered for 'processing_type' in AEOCFO.Config.BQ_Config.
+    All tables share one client and their load jobs run concurrently, at most 'max_concurrent_jobs' at a time.
+    A failed table doesn't stop the others; every failure is logged and a RuntimeError listing them is raised once all jobs are done.
+
+    Before a table is replaced (or a target table is merged into or consolidated) its current contents are archived into
+    'archive_dataset_id' with a server-side snapshot/copy job, run concurrently like the loads. A table that fails to archive isn't loaded.
+
+    Small appends ('append' into an existing table with the same columns, and unstaged 'consolidate' runs) go through the
+    Storage Write API instead of a load job when google-cloud-bigquery-storage is installed, see 'write_api'.
+
+    'merge' and 'consolidate' don't write a table per file. They write into the dataset's long-lived target table (eg. FR_ALL),
+    partitioned by meeting date or fiscal year and clustered by organization as registered. Every row also carries the
+    'Source File' it came from and when it was 'Loaded At'. Nothing is written to the target table if any file fails.
+    - 'merge': files are appended to one temporary staging table, which is then MERGEd into the target on the registered merge keys
+      (eg. org + date + FR number for FR). Existing rows with the same keys are updated and the rest are inserted.
+    - 'consolidate': all files go into a temporary staging table in a single load job, then one transaction replaces any target rows
+      previously loaded from the same files with the staged rows.
+      With a 'stage' the files are first written as Parquet under '<processing_type>/<run>/' in the stage and loaded from there by wildcard;
+      the staged files are kept as an archive of the run.
 
     Args:
         dataset_id (str): Target BigQuery dataset ID.
         df_list (list[pd.DataFrame]): List of DataFrames to push.
         names (list[str]): Corresponding table names.
         processing_type (str): Descriptive tag for logs/reports.
-        duplicate_handling (str): Currently ignored — placeholder.
-        archive_dataset_id (str): Dataset to archive overwritten tables (stub).
+        duplicate_handling (str): 'replace', 'append' or 'fail' to write each file to its own table, 'merge' or 'consolidate' to write into the target table.
+        archive_dataset_id (str): Dataset to archive replaced tables into, None to skip archiving.
         reporting (bool): If True, print extra info.
         project_id (str): Google Cloud project ID.
+        max_concurrent_jobs (int): Maximum number of load jobs (or staged file writes) running at once.
+        stage (GCSStage | LocalStage): Staging area for 'consolidate' loads (see AEOCFO.Load.GCP_Push.make_stage).
+        archive_method (str): 'snapshot' or 'copy'.
+        write_api (str): 'auto' streams appends of at most 'stream_threshold' rows, 'always' streams every append, 'never' only uses load jobs.
+        stream_threshold (int): Largest append in rows that 'auto' streams.
+        stream_type (str): 'pending' (all rows visible at once, falls back to a load job on failure) or 'committed' write streams.
+
+    Returns:
+        dict[str, int]: Number of rows loaded into each table, or with 'merge'/'consolidate' the number of rows written to the target table.
     """
+    df_list = list(df_list)
+    names = list(names)
     if len(df_list) != len(names):
         raise ValueError("The number of dataframes and names must match.")
-    
+    if duplicate_handling not in WRITE_MODES and duplicate_handling not in TARGET_MODES:
+        raise ValueError(f"Invalid duplicate_handling value: {duplicate_handling}. Must be one of {list(WRITE_MODES.keys()) + TARGET_MODES}.")
+    if stage is not None and duplicate_handling != "consolidate":
+        raise ValueError("Staged loading is only supported with duplicate_handling='consolidate'")
+    if write_api not in WRITE_API_MODES:
+        raise ValueError(f"Invalid write_api value: {write_api}. Must be one of {WRITE_API_MODES}.")
+
     logger = get_logger(processing_type)
     logger.info(f"--- START: {processing_type} bigquery_push (mode: {duplicate_handling}) ---")
     if reporting: print(f"--- START: {processing_type} bigquery_push (mode: {duplicate_handling}) ---")
 
-    for df, name in tqdm(zip(df_list, names), desc="Pushing to bigqeury", ncols=100):
+    client = get_cached_bigquery_client(project_id)
+    schema = get_bq_schema(processing_type)
+    archive_stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    merging = duplicate_handling == "merge"
+    consolidating = duplicate_handling == "consolidate"
+    if merging or consolidating:
+        target_table, name_patterns, partition, cluster = get_target_config(processing_type)
+        target_ref = f"{project_id}.{dataset_id}.{target_table}"
+        loaded_at = datetime.now(timezone.utc)
+        schema = dict(schema, Columns=dict(schema['Columns'], **get_run_metadata_columns()))
+        staging_table = f"_staging_{target_table}_{uuid.uuid4().hex[:8]}"
+        staging_ref = f"{project_id}.{dataset_id}.{staging_table}"
+    if merging:
+        _, merge_keys, _ = get_merge_config(processing_type)
+        schema = dict(schema, Columns=dict(schema['Columns'], **{BATCH_INDEX_COL: 'INT64'}))
+    arrow_tables = [None] * len(df_list)
+
+    def load(item):
+        i, (df, name) = item
+        table_name = staging_table if merging else clean_name(name)
         if reporting: print(f"[{processing_type}] Uploading '{name}' to dataset '{dataset_id}'...")
         logger.info(f"[{processing_type}] Uploading '{name}' to dataset '{dataset_id}'...")
 
-        # Optional: archive logic (stub)
-        # TODO: Add logic to move current table to archive_dataset_id before overwrite
+        try:
+            if duplicate_handling == "replace" and archive_dataset_id:
+                archived = archive_table(client, f"{project_id}.{dataset_id}.{table_name}", archive_dataset_id, archive_stamp, method=archive_method)
+                if archived is not None:
+                    logger.info(f"[{processing_type}] Archived '{table_name}' to '{archived}'")
+            if merging and df.empty: # nothing to stage, and an empty load wouldn't create the staging table
+                return clean_name(name), 0, None
+            if merging:
+                constants = _file_constants(df, name, name_patterns, loaded_at)
+                constants[BATCH_INDEX_COL] = i
+                missing = [key for key in merge_keys if key not in df.columns and constants.get(key) is None]
+                if missing:
+                    raise ValueError(f"merge keys {missing} are neither columns of '{name}' nor parsable from its name")
+                job = push_table(df, project_id, dataset_id, table_name, if_exists="append", client=client, wait=False, schema=schema, constants=constants)
+            elif consolidating: # only convert here, the whole run is loaded in one job afterwards
+                constants = _file_constants(df, name, name_patterns, loaded_at)
+                columns = resolve_bq_columns(list(df.columns) + list(constants.keys()), schema, dtypes=dict(df.dtypes))
+                arrow_tables[i] = to_arrow_table(df, columns, constants)
+                return clean_name(name), len(df), None
+            elif duplicate_handling == "append" and use_write_api(len(df), write_api, stream_threshold) and _has_columns(client, f"{project_id}.{dataset_id}.{table_name}", df, schema):
+                table = to_arrow_table(df, resolve_bq_columns(df.columns, schema, dtypes=dict(df.dtypes)))
+                _append_arrow_table(client, table, f"{project_id}.{dataset_id}.{table_name}", write_api, stream_threshold, stream_type, logger)
+                return clean_name(name), len(df), None
+            else:
+                job = push_table(df, project_id, dataset_id, table_name, if_exists=duplicate_handling, client=client, wait=False, schema=schema)
+            job.result()
+        except Exception as e:
+            return clean_name(name), None, e
+        return clean_name(name), len(df), None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_concurrent_jobs) as executor:
+            outcomes = list(tqdm(executor.map(load, enumerate(zip(df_list, names))), total=len(df_list), desc="Pushing to bigqeury", ncols=100))
+
+        loaded = {}
+        failed = {}
+        for table_name, rows, error in outcomes:
+            if error is not None:
+                failed[table_name] = error
+                if reporting: print(f"[{processing_type}] Failed uploading '{table_name}': {error}")
+                logger.error(f"[{processing_type}] Failed uploading '{table_name}': {error}")
+                continue
+            loaded[table_name] = rows
+            if reporting: print(f"[{processing_type}] Finished uploading {rows} rows to '{table_name}'.")
+            logger.info(f"[{processing_type}] Finished uploading {rows} rows to '{table_name}'")
+
+        if reporting: print(f"successfully pushed {len(loaded)} file(s) to bigqeury {project_id}.{dataset_id}, {len(failed)} failed")
+        logger.info(f"successfully pushed {len(loaded)} file(s) to bigqeury {project_id}.{dataset_id}, {len(failed)} failed")
+        if failed:
+            raise RuntimeError(f"bigquery_push failed for {len(failed)} table(s): " + "; ".join(f"{table}: {error}" for table, error in failed.items()))
 
-        df = col_name_conversion(df)[0]
-        name = clean_name(name)
-        push_table(df, project_id, dataset_id, name, if_exists=duplicate_handling)
+        # no files (or with 'merge' only empty ones, which leave no staging table) so the target table is left untouched
+        nothing_to_write = (merging and not any(loaded.values())) or (consolidating and not arrow_tables)
+        if (merging or consolidating) and archive_dataset_id and not nothing_to_write:
+            archived = archive_table(client, target_ref, archive_dataset_id, archive_stamp, method=archive_method)
+            if archived is not None:
+                if reporting: print(f"[{processing_type}] Archived '{target_ref}' to '{archived}'")
+                logger.info(f"[{processing_type}] Archived '{target_ref}' to '{archived}'")
 
-        if reporting: print(f"[{processing_type}] Finished uploading '{name}'.\n")
-        logger.info(f"[{processing_type}] Finished uploading '{name}'")
+        if merging and nothing_to_write:
+            if reporting: print(f"[{processing_type}] No rows to merge into '{target_ref}', skipping the merge.")
+            logger.info(f"[{processing_type}] No rows to merge into '{target_ref}', skipping the merge.")
+            loaded = {target_table: 0}
+        elif merging:
+            merged = _merge_staging(client, staging_ref, target_ref, merge_keys, partition, cluster)
+            if reporting: print(f"[{processing_type}] Merged {sum(loaded.values())} staged rows into '{target_ref}', {merged} rows inserted or updated.")
+            logger.info(f"[{processing_type}] Merged {sum(loaded.values())} staged rows into '{target_ref}', {merged} rows inserted or updated.")
+            loaded = {target_table: merged}
+        elif consolidating and arrow_tables:
+            stage_prefix = f"{processing_type.upper()}/{loaded_at.strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
+            rows = _consolidate(client, arrow_tables, names, target_ref, staging_ref, partition, cluster, stage=stage, stage_prefix=stage_prefix, max_workers=max_concurrent_jobs,
+                                write_api=write_api, stream_threshold=stream_threshold, stream_type=stream_type, logger=logger)
+            if reporting: print(f"[{processing_type}] Loaded {rows} rows from {len(names)} file(s) into '{target_ref}'.")
+            logger.info(f"[{processing_type}] Loaded {rows} rows from {len(names)} file(s) into '{target_ref}'.")
+            loaded = {target_table: rows}
+    finally:
+        if merging or consolidating:
+            client.delete_table(staging_ref, not_found_ok=True)
 
-    if reporting: print(f"successfully pushed {len(df_list)} file(s) to bigqeury {project_id}.{dataset_id}")
     if reporting: print(f"--- END: {processing_type} bigquery_push (mode: {duplicate_handling}) ---")
-    logger.info(f"successfully pushed {len(df_list)} file(s) to bigqeury {project_id}.{dataset_id}")
     logger.info(f"--- END: {processing_type} bigquery_push (mode: {duplicate_handling}) ---")
+    return loaded
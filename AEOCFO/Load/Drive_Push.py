@@ -1,7 +1,11 @@
 from googleapiclient.http import MediaIoBaseUpload
+from googleapiclient.errors import HttpError
+import httplib2
 
 import os
 import io
+import time
+from concurrent.futures import ThreadPoolExecutor
 from collections.abc import Iterable
 from tqdm import tqdm
 
@@ -11,16 +15,145 @@ import pandas as pd
 from AEOCFO.Utility.Logger_Utils import get_logger
 from AEOCFO.Utility.Cleaning import is_type
 from AEOCFO.Transform import ASUCProcessor 
-from AEOCFO.Utility.Drive_Helpers import get_unique_name_in_folder, list_files
+from AEOCFO.Utility.Drive_Helpers import FolderNameIndex, DataFrameMediaUpload, execute_batched
+from AEOCFO.Utility.Format_Helpers import hash_dataframe, get_output_format
 from AEOCFO.Config.Authenticators import authenticate_credentials
 from AEOCFO.Config.Folders import get_overwrite_folder_id
 
 OVERWRITE_FOLDER_ID = get_overwrite_folder_id()
+CONTENT_HASH_PROPERTY = "contentHash" # appProperties key holding the hash of an uploaded file's contents
+
+# Resumable uploads send a file in chunks and pick up from the last byte Drive acknowledged after a transient failure
+DEFAULT_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024 # must be a multiple of 256 KiB
+MAX_UPLOAD_RETRIES = 5 # consecutive failed chunks before an upload gives up, reset whenever a chunk goes through
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUSES
+    return isinstance(error, (OSError, httplib2.HttpLib2Error)) # dropped connections, timeouts
+
+def _execute_resumable(request, file_name: str, logger=None) -> dict:
+    """
+    Sends a resumable upload request chunk by chunk. After a transient failure the next call to next_chunk asks Drive how many
+    bytes it has and resumes from there, so completed chunks are never sent again.
+
+    Returns:
+    - the API response once the last chunk is accepted
+    """
+    response, retries, resumes, chunks = None, 0, 0, 0
+    while response is None:
+        try:
+            status, response = request.next_chunk()
+        except Exception as e:
+            if not _is_transient(e) or retries >= MAX_UPLOAD_RETRIES:
+                raise
+            retries += 1
+            resumes += 1
+            if logger is not None: logger.warning(f"Upload of {file_name} interrupted at byte {request.resumable_progress} ({e}), resuming (attempt {retries}/{MAX_UPLOAD_RETRIES})")
+            time.sleep(min(2 ** retries, 32))
+            continue
+        retries = 0
+        chunks += 1
+        if status is not None and logger is not None:
+            logger.debug(f"Uploading {file_name}: {status.resumable_progress}/{status.total_size} bytes ({status.progress():.0%})")
+    if logger is not None: logger.info(f"Uploaded {file_name}: {request.resumable.size()} bytes in {chunks} chunk(s), resumed {resumes} time(s)")
+    return response
+
+def _upload_df(df: pd.DataFrame, file_name: str, folder_id: str, account: str,
+               chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE, resumable: bool = None, logger=None, output_format: str = 'csv') -> tuple[str, str]:
+    """
+    Serialises a DataFrame to 'output_format' ('csv', 'csv.gz' or 'parquet') and uploads it to a drive folder.
+    The file is encoded in row chunks as the upload consumes it (see DataFrameMediaUpload), so at most about two upload chunks of it are in memory,
+    and hashed along the way.
+    Returns the new file's id and the hash of its contents.
+    resumable (bool): Whether to upload in resumable 'chunk_size' chunks. None (default) only does so for files bigger than one chunk.
+        False sends the whole file in one request and so holds all of it in memory.
+    """
+    service = authenticate_credentials(acc=account, platform='drive') # thread-local service from the client registry
+
+    mime_type = get_output_format(output_format)['content_type']
+    streamed = DataFrameMediaUpload(df, output_format, chunksize=chunk_size) # encodes the first chunk, small files are fully encoded here
+    media = streamed
+    if resumable is None:
+        resumable = media.size() is None or media.size() > chunk_size
+    if not resumable:
+        media = MediaIoBaseUpload(io.BytesIO(streamed.read_all()), mimetype=mime_type)
+
+    # Prepare metadata
+    file_metadata = {
+        "name": file_name,
+        "parents": [folder_id],
+        "mimeType": mime_type
+    }
+    request = service.files().create(
+        body=file_metadata,
+        media_body=media,
+        fields="id", 
+        supportsAllDrives=True 
+    )
+    file = _execute_resumable(request, file_name, logger=logger) if resumable else request.execute()
+    return file.get("id"), streamed.content_hash()
+
+def _record_hashes(service, ids: dict[str, str], hashes: dict[str, str], logger, reporting=False) -> None:
+    """
+    Stores each uploaded file's content hash in its appProperties, batched through execute_batched.
+    ids, hashes (dict[str, str]): file name -> uploaded file id and file name -> content hash.
+    A file whose hash couldn't be stored is only re-uploaded next time rather than skipped, so failures are logged, not raised.
+    """
+    requests = [(file_name, service.files().update(fileId=ids[file_name], body={"appProperties": {CONTENT_HASH_PROPERTY: content_hash}}, fields="id", supportsAllDrives=True))
+                for file_name, content_hash in hashes.items()]
+    for file_name, (_, error) in execute_batched(service, requests).items():
+        if error is not None:
+            if reporting: print(f"Couldn't record the content hash of {file_name}: {error}")
+            logger.warning(f"Couldn't record the content hash of {file_name}: {error}")
+
+def _run_uploads(uploads: list[tuple[str, pd.DataFrame]], folder_id: str, account: str, max_workers: int, logger, reporting=False,
+                 chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE, resumable: bool = None, output_format: str = 'csv') -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Uploads (file name, DataFrame) pairs whose names have already been reserved, running up to 'max_workers' uploads at once.
+    Every upload is attempted; failures are logged per file and the first one is re-raised once the rest have finished.
+    The hash of each uploaded file's contents, computed while it streams, is then stored in its appProperties (see _record_hashes).
+
+    Returns:
+    - dict[file name] = uploaded file id, in the same order as 'uploads'
+    - dict[file name] = content hash of the uploaded file
+    """
+    def upload(pair):
+        file_name, df = pair
+        try:
+            return _upload_df(df, file_name, folder_id, account, chunk_size=chunk_size, resumable=resumable, logger=logger, output_format=output_format), None
+        except Exception as e:
+            return (None, None), e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = list(tqdm(executor.map(upload, uploads), total=len(uploads), desc="Uploading files to drive", ncols=100))
+
+    ids, hashes = {}, {}
+    errors = []
+    for (file_name, _), ((file_id, content_hash), error) in zip(uploads, outcomes):
+        if error is not None:
+            if reporting: print(f"Errored while uploading {file_name} with account {account} to folder {folder_id}: {error}")
+            logger.warning(f"Errored while uploading {file_name} with account {account} to folder {folder_id}: {error}")
+            errors.append(error)
+            continue
+        ids[file_name] = file_id
+        hashes[file_name] = content_hash
+        success_msg = f"\nSuccessfully uploaded {file_name} to Drive. File ID: {file_id}"
+        if reporting: print(success_msg)
+        logger.info(success_msg)
+
+    if hashes:
+        _record_hashes(authenticate_credentials(acc=account, platform='drive'), ids, hashes, logger, reporting=reporting)
+    if errors:
+        raise errors[0]
+    return ids, hashes
 
 # Drive Push Functions
-def drive_push(folder_id, df_list, names, processing_type, account='pusher', duplicate_handling = "Ignore", blind_to = None, archive_folder_id = OVERWRITE_FOLDER_ID, reporting=False) -> dict[str : str]:
+def drive_push(folder_id, df_list, names, processing_type, account='pusher', duplicate_handling = "Ignore", blind_to = None, archive_folder_id = OVERWRITE_FOLDER_ID, reporting=False, max_workers: int = 1, skip_unchanged: bool = True,
+               chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE, resumable: bool = None, output_format: str = None, name_index: FolderNameIndex = None) -> dict[str : str]:
     """
-    Uploads a Pandas DataFrame to Google Drive without saving it locally. Currently only handles for pushing CSV files to drive
+    Uploads a Pandas DataFrame to Google Drive without saving it locally, as CSV, gzip compressed CSV or Parquet.
 
     Parameters:
     - folder_id (str): ID of the target Drive folder to upload files to.
@@ -31,7 +164,19 @@ def drive_push(folder_id, df_list, names, processing_type, account='pusher', dup
         Ignore: Ignore the file, don't push it and move onto the next
         Number: Number the file then push it 
         Overwrite: Replace files of the same name
-
+    - max_workers (int): Number of files to upload concurrently. Default is 1.
+        File names are always reserved one at a time so duplicate handling stays correct, only the uploads themselves run in parallel.
+        In Overwrite mode the replaced files are archived together in batched requests before any upload starts.
+    - skip_unchanged (bool): Every uploaded file stores a hash of its contents in its appProperties. If True (default), a file whose contents
+        hash the same as the existing file of the same name is skipped in Number and Overwrite mode instead of being numbered or replaced.
+    - chunk_size (int): Size in bytes of each chunk of a resumable upload, a multiple of 256 KiB. Default is 8 MiB.
+    - resumable (bool): Whether to upload files in resumable chunks that resume from the last acknowledged byte after a transient failure.
+        Default (None) does so for files bigger than one chunk.
+    - output_format (str): 'csv', 'csv.gz' or 'parquet'. Default (None) is the processing type's 'Output Format' in ASUCProcessor.process_configs.
+        File names don't change with the format, the file's MIME type tells drive_pull how to read it back.
+    - name_index (FolderNameIndex): Index of the target (and in Overwrite mode archive) folder to reuse across several pushes to the same folder.
+        Folders it doesn't cover yet are listed into it, and it's kept up to date with the files this push uploads and archives.
+        Default (None) lists the folders for this push only.
 
     Returns:
     - file_id (dict): The Names and ID of the uploaded file.
@@ -43,6 +188,11 @@ def drive_push(folder_id, df_list, names, processing_type, account='pusher', dup
     assert is_type(df_list, pd.DataFrame), f"df_list is not a dataframe or list of dataframes"
     assert is_type(names, str), f"names is not a string or list of strings"
     assert isinstance(processing_type, str), f"Processing type must be a single string specifying one type of processing done on all files fed into the function."
+    assert isinstance(max_workers, int) and max_workers >= 1, f"max_workers must be a positive integer but is {max_workers}"
+    if output_format is None:
+        output_format = ASUCProcessor.get_config(process=processing_type, key='Output Format', substitute='csv')
+    get_output_format(output_format) # raises on unknown formats
+    assert isinstance(chunk_size, int) and chunk_size > 0 and chunk_size % (256 * 1024) == 0, f"chunk_size must be a positive multiple of 256 KiB but is {chunk_size}"
     if blind_to is not None:
         if isinstance(blind_to, str):
             blind_set = set([blind_to])
@@ -58,78 +208,60 @@ def drive_push(folder_id, df_list, names, processing_type, account='pusher', dup
         names = [names]   
 
     service = authenticate_credentials(acc=account, platform='drive')
+    # one paginated listing of the target (and archive) folder, kept up to date as names are reserved and files archived
+    index_folders = [folder_id, archive_folder_id] if duplicate_handling == "Overwrite" and archive_folder_id is not None else [folder_id]
+    if name_index is None:
+        name_index = FolderNameIndex({})
+    name_index.list_from_drive(service, index_folders) # inputted 'names' will sometimes be different from names in google drive
+
+    unchanged_counts = 0
+
+    def unchanged(i, file_name) -> bool:
+        """Whether the existing file named 'file_name' already holds exactly df_list[i]. Only frames with a stored hash to compare against are hashed."""
+        nonlocal unchanged_counts
+        if not skip_unchanged:
+            return False
+        stored_hash = name_index.app_properties(folder_id, file_name).get(CONTENT_HASH_PROPERTY)
+        if stored_hash is None or stored_hash != hash_dataframe(df_list[i], output_format):
+            return False
+        unchanged_counts += 1
+        if reporting: print(f"Skipping {file_name}, contents are unchanged")
+        logger.info(f"Skipping {file_name}, contents are unchanged")
+        return True
     match duplicate_handling:
         case "Number":
-            existing_names = set(list_files(folder_id=folder_id, query_type="ALL", rv="NAME", reporting=False)) # need to pull to check because inputted 'names' list will sometimes be different from names in google drive
-            name_counter = dict(zip(existing_names, [1]*len(existing_names))) # assume that naturally the drive has only unique file names
-            
-            # Setup Regex pattern to clean out old identification tag for raw files (usually its just 'RF') and the file type (eg. cleaning out .csv at the end of the file name)
-
-            ids = {}
-            for i, df in tqdm(enumerate(df_list), desc="Uploading files to drive", ncols=100):
+            uploads = []
+            for i, df in enumerate(df_list):
                 base_name = os.path.splitext(names[i])[0] # splits file name from it's file type eg 'ABSA-FY25-RF.csv' --> 'ABSA-FY25-RF' and '.csv'
-                final_name = base_name
 
                 # Checking against blinded names
-                if final_name in blind_set:
-                    if reporting: print(f"drive_push blinded to file name {file_name}")
-                    logger.info(f"drive_push blinded to file name {file_name}")
+                if base_name in blind_set:
+                    if reporting: print(f"drive_push blinded to file name {base_name}")
+                    logger.info(f"drive_push blinded to file name {base_name}")
+                    continue
+
+                # Skipping identical outputs instead of numbering a copy
+                if unchanged(i, base_name):
                     continue
 
                 # Incrementing name
-                if final_name in existing_names:
-                    count = name_counter.get(file_name, 1) # default value is 1
-                    while f"{file_name} ({count})" in existing_names:
-                        count += 1
-                    final_name = f"{file_name} ({count})"
-                    name_counter[file_name] = count + 1
+                final_name = name_index.unique_name(folder_id, base_name)
 
                 # Checking again against blinded names
                 if final_name in blind_set:
-                    if reporting: print(f"drive_push blinded to file name {file_name}")
-                    logger.info(f"drive_push blinded to file name {file_name}")
+                    if reporting: print(f"drive_push blinded to file name {final_name}")
+                    logger.info(f"drive_push blinded to file name {final_name}")
                     continue
 
-                existing_names.add(final_name)
-
-                # Convert DataFrame to CSV and write to an in-memory buffer
-                file_buffer = io.BytesIO()
-                df.to_csv(file_buffer, index=False) # Save CSV content into memory
-                file_buffer.seek(0)  # Reset buffer position
-
-                # Prepare metadata
-                file_metadata = {
-                    "name": final_name,
-                    "parents": [folder_id],
-                    "mimeType": "text/csv"
-                }
-
-                media = MediaIoBaseUpload(file_buffer, mimetype="text/csv")
-
-                # Upload file
-                try:
-                    file = service.files().create(
-                        body=file_metadata,
-                        media_body=media,
-                        fields="id", 
-                        supportsAllDrives=True 
-                    ).execute()
-                except Exception as e:
-                    if reporting: print(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                    logger.warning(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                    raise e
-
-                ids[final_name] = file.get("id")
-                success_msg = f"\nSuccessfully uploaded {final_name} to Drive. File ID: {file.get('id')}"
-                if reporting: print(success_msg)
-                logger.info(success_msg)
+                name_index.add(folder_id, final_name)
+                uploads.append((final_name, df))
 
-        case "Ignore":
-            existing_names = set(list_files(folder_id=folder_id, query_type="ALL", rv="NAME", reporting=False)) # need to pull to check because inputted 'names' list will sometimes be different from names in google drive
+            ids, content_hashes = _run_uploads(uploads, folder_id, account, max_workers, logger, reporting=reporting, chunk_size=chunk_size, resumable=resumable, output_format=output_format)
 
-            ids = {}
+        case "Ignore":
+            uploads = []
             ignored_counts = 0
-            for i, df in tqdm(enumerate(df_list), desc="Uploading files to drive", ncols=100):
+            for i, df in enumerate(df_list):
                 base_name = os.path.splitext(names[i])[0] # splits file name from it's file type eg 'ABSA-FY25-RF.csv' --> 'ABSA-FY25-RF' and '.csv'
                 file_name = base_name
 
@@ -140,56 +272,25 @@ def drive_push(folder_id, df_list, names, processing_type, account='pusher', dup
                     continue
 
                 # Ignoring 
-                if file_name in existing_names:
+                if (folder_id, file_name) in name_index:
                     if reporting:
                         print(f"\nIgnoring file {base_name}")
                         logger.info(f"Ignoring file {base_name}")
                     ignored_counts += 1
                     continue
 
-                existing_names.add(file_name)
-
-                # Convert DataFrame to CSV and write to an in-memory buffer
-                file_buffer = io.BytesIO()
-                df.to_csv(file_buffer, index=False) # Save CSV content into memory
-                file_buffer.seek(0)  # Reset buffer position
-
-                # Prepare metadata
-                file_metadata = {
-                    "name": file_name,
-                    "parents": [folder_id],
-                    "mimeType": "text/csv"
-                }
-
-                media = MediaIoBaseUpload(file_buffer, mimetype="text/csv")
-
-                # Upload file
-                try:
-                    file = service.files().create(
-                        body=file_metadata,
-                        media_body=media,
-                        fields="id", 
-                        supportsAllDrives=True
-                    ).execute()
-                except Exception as e:
-                    if reporting: print(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                    logger.warning(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                    raise e
-
-                ids[file_name] = file.get("id")
-                success_msg = f"\nSuccessfully uploaded {file_name} to Drive. File ID: {file.get('id')}"
-                if reporting: print(success_msg)
-                logger.info(success_msg)
+                name_index.add(folder_id, file_name)
+                uploads.append((file_name, df))
+
+            ids, content_hashes = _run_uploads(uploads, folder_id, account, max_workers, logger, reporting=reporting, chunk_size=chunk_size, resumable=resumable, output_format=output_format)
             if reporting: print(f"Uploaded {len(df_list) - ignored_counts} files, ignored {ignored_counts} files")
             logger.info(f"Uploaded {len(df_list) - ignored_counts} files, ignored {ignored_counts} files")
 
         case "Overwrite":
             assert archive_folder_id is not None, "archive_folder_id must be provided when using 'Overwrite' mode"
-            existing_files = list_files(folder_id=folder_id, query_type="ALL", rv="FULL", reporting=False)
-            name_to_fileid = {f['name']: f['id'] for f in existing_files}
-            ids = {}
-            overwrite_counts = 0
-            for i, df in tqdm(enumerate(df_list), desc="Uploading files to drive", ncols=100):
+            uploads = []
+            archive_requests = {} # file name -> rename + move request for the file it replaces
+            for i, df in enumerate(df_list):
                 base_name = os.path.splitext(names[i])[0]
                 file_name = base_name
 
@@ -199,73 +300,59 @@ def drive_push(folder_id, df_list, names, processing_type, account='pusher', dup
                     logger.info(f"drive_push blinded to file name {file_name}")
                     continue
 
-                # Check for existing file
-                if file_name in name_to_fileid:
-                    old_file_id = name_to_fileid[file_name]
-                    overwrite_counts += 1
-
-                    # Rename old file with OVERWRITE- prefix and adds counts if overwrote name is not unique
-                    base_archive_name = f"OVERWRITE-{file_name}"
-                    unique_archive_name = get_unique_name_in_folder(service, archive_folder_id, base_archive_name)
-                    service.files().update(
-                        fileId=old_file_id, 
-                        body={"name": unique_archive_name}
-                    ).execute()
-
-                    # Move to archive folder
-                    try:
-                        service.files().update(
-                            fileId=old_file_id,
-                            addParents=archive_folder_id,
-                            removeParents=folder_id,
-                            fields='id, parents'
-                        ).execute()
-                    except Exception as e:
-                        if reporting: print(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                        logger.warning(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                        raise e
+                # Skipping identical outputs instead of replacing them
+                if unchanged(i, file_name):
+                    continue
 
-                    if reporting:
-                        print(f"\nOverwrote and archived existing file: {file_name}")
-                        logger.info(f"Overwrote and archived existing file: {file_name}")
-
-                # Upload new file
-                file_buffer = io.BytesIO()
-                df.to_csv(file_buffer, index=False)
-                file_buffer.seek(0)
-
-                file_metadata = {
-                    "name": file_name,
-                    "parents": [folder_id],
-                    "mimeType": "text/csv"
-                }
-
-                try:
-                    media = MediaIoBaseUpload(file_buffer, mimetype="text/csv")
-                    file = service.files().create(
-                        body=file_metadata,
-                        media_body=media,
-                        fields="id", 
-                        supportsAllDrives=True 
-                    ).execute()
-                except Exception as e:
-                    if reporting: print(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                    logger.warning(f"Errored while uploading with account {account} to folder {folder_id}, passing error")
-                    raise e
-
-                ids[file_name] = file.get("id")
-                success_msg = f"Successfully uploaded {file_name} to Drive. File ID: {file.get('id')}"
-                if reporting: print(success_msg)
-                logger.info(success_msg)
-
-            if reporting: print(f"\nUploaded {len(df_list)} files, overwrote {overwrite_counts}")
-            logger.info(f"Uploaded {len(df_list)} files, overwrote {overwrite_counts}")
+                # Check for existing file, names reserved earlier in this push have no id yet and aren't archived
+                old_file_id = name_index.file_id(folder_id, file_name)
+                if old_file_id is not None:
+                    # Rename old file with OVERWRITE- prefix (numbered if the archived name is not unique) and move it to the archive folder
+                    unique_archive_name = name_index.unique_name(archive_folder_id, f"OVERWRITE-{file_name}")
+                    archive_requests[file_name] = service.files().update(
+                        fileId=old_file_id,
+                        body={"name": unique_archive_name},
+                        addParents=archive_folder_id,
+                        removeParents=folder_id,
+                        fields='id, parents'
+                    )
+                    name_index.move(file_name, folder_id, archive_folder_id, new_name=unique_archive_name)
+
+                name_index.add(folder_id, file_name)
+                uploads.append((file_name, df))
+
+            # Archive every replaced file in batched round trips, a file is only uploaded once the one it replaces is archived
+            archive_errors = {}
+            for file_name, (_, error) in execute_batched(service, archive_requests.items()).items():
+                if error is not None:
+                    if reporting: print(f"Errored while archiving {file_name} with account {account} from folder {folder_id}: {error}")
+                    logger.warning(f"Errored while archiving {file_name} with account {account} from folder {folder_id}: {error}")
+                    archive_errors[file_name] = error
+                    continue
+                if reporting:
+                    print(f"\nOverwrote and archived existing file: {file_name}")
+                    logger.info(f"Overwrote and archived existing file: {file_name}")
+            overwrite_counts = len(archive_requests) - len(archive_errors)
+
+            uploads = [(file_name, df) for file_name, df in uploads if file_name not in archive_errors] # don't leave two files with the same name
+            ids, content_hashes = _run_uploads(uploads, folder_id, account, max_workers, logger, reporting=reporting, chunk_size=chunk_size, resumable=resumable, output_format=output_format)
+            if archive_errors:
+                raise next(iter(archive_errors.values()))
+
+            if reporting: print(f"\nUploaded {len(uploads)} files, overwrote {overwrite_counts}")
+            logger.info(f"Uploaded {len(uploads)} files, overwrote {overwrite_counts}")
             
         case _:
             error_msg = f"Unknown duplicate handling logic '{duplicate_handling}'."
             logger.error(error_msg)
             raise ValueError(error_msg)
+
+    for file_name, file_id in ids.items(): # record the uploaded files' ids and hashes so a shared name_index stays in step with the folder
+        name_index.add(folder_id, file_name, file_id, {CONTENT_HASH_PROPERTY: content_hashes[file_name]} if content_hashes.get(file_name) else None)
         
+    if unchanged_counts:
+        if reporting: print(f"Skipped {unchanged_counts} unchanged files")
+        logger.info(f"Skipped {unchanged_counts} unchanged files")
     logger.info("drive_push successfully complete!")
     logger.info(f"--- END: {processing_type} drive_push ---")
     return ids
@@ -1,34 +1,43 @@
 from google.cloud import storage
 from AEOCFO.Utility.Logger_Utils import get_logger
-from AEOCFO.Config.Authenticators import authenticate_credentials
+from AEOCFO.Config.Authenticators import get_cached_storage_client
 from AEOCFO.Utility.BQ_Helpers import clean_name
+from AEOCFO.Utility.Format_Helpers import get_output_format, write_dataframe
 from AEOCFO.Config.Folders import get_overwrite_bucket_id
 
 import pandas as pd
-from io import StringIO
+import pyarrow as pa
+import pyarrow.parquet as pq
+from io import BytesIO
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
+import glob
 import os
 
 OVERWRITE_BUCKET_ID = get_overwrite_bucket_id()
+DEFAULT_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024 # 8 MiB, resumable uploads need a multiple of 256 KiB
 
-def push_df_to_gcs(df: pd.DataFrame, bucket_name: str, destination_blob_name: str, project_id: str):
+def push_df_to_gcs(df: pd.DataFrame, bucket_name: str, destination_blob_name: str, project_id: str, output_format: str = "csv",
+                   client: storage.Client = None, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE):
     """
-    Uploads a DataFrame to GCS as a CSV.
+    Uploads a DataFrame to GCS. The frame is serialised straight into a resumable blob writer, so only one upload chunk is held in memory.
 
     Args:
         df (pd.DataFrame): DataFrame to upload.
         bucket_name (str): GCS bucket name.
         destination_blob_name (str): Path in bucket.
         project_id (str): GCP project ID.
+        output_format (str): 'csv', 'csv.gz' or 'parquet'.
+        client (storage.Client): Client to reuse. Default is the process-wide client for the project.
+        chunk_size (int): Bytes sent per upload request, a multiple of 256 KiB.
     """
-    creds = authenticate_credentials(acc='pusher', platform='googlecloud')
-    client = storage.Client(project=project_id, credentials=creds)
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
+    content_type = get_output_format(output_format)['content_type']
+    if client is None:
+        client = get_cached_storage_client(project_id)
+    blob = client.bucket(bucket_name).blob(destination_blob_name)
 
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False)
-    blob.upload_from_string(csv_buffer.getvalue(), content_type="text/csv")
+    with blob.open("wb", content_type=content_type, chunk_size=chunk_size, ignore_flush=True) as writer:
+        write_dataframe(df, writer, fmt=output_format)
 
     print(f"Uploaded DataFrame to gs://{bucket_name}/{destination_blob_name}")
 
@@ -40,44 +49,143 @@ def gcs_push_from_dfs(bucket_id: str,
                       duplicate_handling: str = "replace",
                       archive_bucket_id: str = OVERWRITE_BUCKET_ID,
                       reporting: bool = False,
-                      project_id: str = "ocfo-primary"):
+                      project_id: str = "ocfo-primary",
+                      output_format: str = "csv",
+                      max_workers: int = 8) -> list[str]:
     """
-    Pushes a list of DataFrames to Google Cloud Storage as CSVs.
+    Pushes a list of DataFrames to Google Cloud Storage.
+    Every blob is uploaded with one shared client, up to 'max_workers' at a time. A failed upload doesn't stop the others;
+    failures are logged and a RuntimeError listing them is raised once every upload is done.
 
     Args:
         bucket_id (str): Target GCS bucket ID.
         df_list (list[pd.DataFrame]): DataFrames to upload.
-        names (list[str]): Corresponding GCS blob names.
+        names (list[str]): Corresponding GCS blob names. CSV blobs keep the bare name, other formats get their extension
+            appended (eg. '.csv.gz') so they don't overwrite the CSV blob of the same name.
         processing_type (str): Tag for logging.
         duplicate_handling (str): Currently ignored.
         archive_bucket_id (str): Bucket to archive old blobs (stub).
         reporting (bool): If True, print status updates.
         project_id (str): GCP project ID.
+        output_format (str): 'csv', 'csv.gz' or 'parquet'.
+        max_workers (int): Maximum number of concurrent uploads.
+
+    Returns:
+        list[str]: Names of the uploaded blobs, in order.
     """
     if len(df_list) != len(names):
         raise ValueError("The number of DataFrames and names must match.")
+    extension = get_output_format(output_format)['extension'] if output_format != 'csv' else ''
 
     logger = get_logger(processing_type)
-    logger.info(f"--- START: {processing_type} gcs_push_from_dfs (mode: {duplicate_handling}) ---")
+    logger.info(f"--- START: {processing_type} gcs_push_from_dfs (mode: {duplicate_handling}, format: {output_format}) ---")
 
-    for df, name in tqdm(zip(df_list, names), desc="Pushing to GCS", ncols=100):
+    for df in df_list:
         if not isinstance(df, pd.DataFrame):
             logger.error(f"[{processing_type}] Invalid input: Expected DataFrame, got {type(df)}")
             raise TypeError(f"Expected DataFrame, got {type(df)}")
 
-        name = clean_name(name)
+    client = get_cached_storage_client(project_id)
+
+    def upload(pair):
+        df, name = pair
+        name = clean_name(name) + extension
         if reporting:
             print(f"[{processing_type}] Uploading '{name}' to bucket '{bucket_id}'...")
         logger.info(f"[{processing_type}] Uploading '{name}' to bucket '{bucket_id}'...")
-
-        push_df_to_gcs(df, bucket_id, name, project_id)
-
+        try:
+            push_df_to_gcs(df, bucket_id, name, project_id, output_format=output_format, client=client)
+        except Exception as e:
+            return name, e
+        return name, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = list(tqdm(executor.map(upload, zip(df_list, names)), total=len(df_list), desc="Pushing to GCS", ncols=100))
+
+    failed = {}
+    for name, error in outcomes:
+        if error is not None:
+            failed[name] = error
+            if reporting:
+                print(f"[{processing_type}] Failed uploading '{name}': {error}")
+            logger.error(f"[{processing_type}] Failed uploading '{name}': {error}")
+            continue
         if reporting:
             print(f"[{processing_type}] Finished uploading '{name}'.\n")
         logger.info(f"[{processing_type}] Finished uploading '{name}'")
 
     if reporting:
-        print(f"Successfully pushed {len(df_list)} file(s) to GCS {project_id}.{bucket_id}")
-    logger.info(f"Successfully pushed {len(df_list)} file(s) to GCS {project_id}.{bucket_id}")
-    logger.info(f"--- END: {processing_type} gcs_push_from_dfs (mode: {duplicate_handling}) ---")
-
+        print(f"Successfully pushed {len(df_list) - len(failed)} file(s) to GCS {project_id}.{bucket_id}, {len(failed)} failed")
+    logger.info(f"Successfully pushed {len(df_list) - len(failed)} file(s) to GCS {project_id}.{bucket_id}, {len(failed)} failed")
+    if failed:
+        raise RuntimeError(f"gcs_push_from_dfs failed for {len(failed)} blob(s): " + "; ".join(f"{name}: {error}" for name, error in failed.items()))
+    logger.info(f"--- END: {processing_type} gcs_push_from_dfs (mode: {duplicate_handling}, format: {output_format}) ---")
+    return [name for name, _ in outcomes]
+
+# ----------------------------
+# Staging Areas
+# ----------------------------
+# A stage holds a run's cleaned outputs as Parquet files under a prefix so bigquery can load all of them with one job.
+# GCSStage is the real thing; LocalStage is a directory standing in for a bucket (eg. in tests or without a staging bucket).
+
+class GCSStage:
+    """Staging area in a GCS bucket. Staged files are kept after loading and double as an archive of each run."""
+
+    def __init__(self, bucket_id: str, root: str = "", project_id: str = "ocfo-primary", client: storage.Client = None):
+        if not bucket_id:
+            raise ValueError("No staging bucket specified")
+        self.bucket_id = bucket_id
+        self.root = root.strip("/")
+        self.client = client if client is not None else get_cached_storage_client(project_id)
+        self.bucket = self.client.bucket(bucket_id)
+
+    def _path(self, path: str) -> str:
+        return f"{self.root}/{path}" if self.root else path
+
+    def write(self, path: str, data: bytes) -> str:
+        """Writes one staged file and returns its URI."""
+        blob = self.bucket.blob(self._path(path))
+        blob.upload_from_string(data, content_type="application/vnd.apache.parquet")
+        return f"gs://{self.bucket_id}/{blob.name}"
+
+    def uri(self, prefix: str) -> str:
+        """Wildcard URI matching every file staged under a prefix."""
+        return f"gs://{self.bucket_id}/{self._path(prefix)}/*.parquet"
+
+    def load(self, bq_client, prefix: str, table_ref: str, job_config):
+        """Submits a single bigquery load job for every file staged under a prefix."""
+        return bq_client.load_table_from_uri(self.uri(prefix), table_ref, job_config=job_config)
+
+class LocalStage:
+    """Staging area in a local directory, standing in for a GCS bucket."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def write(self, path: str, data: bytes) -> str:
+        """Writes one staged file and returns its path."""
+        full_path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(data)
+        return full_path
+
+    def uri(self, prefix: str) -> str:
+        return os.path.join(self.root, prefix, "*.parquet")
+
+    def load(self, bq_client, prefix: str, table_ref: str, job_config):
+        """Bigquery can't read local files by wildcard, so the staged files are combined and sent in a single load job instead."""
+        paths = sorted(glob.glob(self.uri(prefix)))
+        if not paths:
+            raise FileNotFoundError(f"No staged files under {self.uri(prefix)}")
+        buffer = BytesIO()
+        pq.write_table(pa.concat_tables([pq.read_table(path) for path in paths]), buffer)
+        buffer.seek(0)
+        return bq_client.load_table_from_file(buffer, table_ref, job_config=job_config)
+
+def make_stage(location: str, project_id: str = "ocfo-primary"):
+    """Returns a GCSStage for 'gs://bucket/prefix' locations and a LocalStage for anything else (a directory path)."""
+    if location.startswith("gs://"):
+        bucket_id, _, root = location[len("gs://"):].partition("/")
+        return GCSStage(bucket_id, root, project_id=project_id)
+    return LocalStage(location)
@@ -28,9 +28,16 @@ def run(process=None, args=None):
     parser.add_argument("--dataset", type=str, required=True)
     parser.add_argument("--testing", action="store_true")
     parser.add_argument("--no-verbose", dest="verbose", action="store_false")
-    parser.add_argument("--no-drive", dest="drive", action="store_false")
+    parser.add_argument("--no-drive", dest="drive", action="store_false",
+                        help="skip pulling, cleaning and pushing raw files; bigquery is then loaded from every cleaned file in the drive output folder (as with --backfill)")
     parser.add_argument("--no-bigquery", dest="bigquery", action="store_false")
     parser.add_argument("--halt-push", dest="haltpush", action="store_true")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--backfill", action="store_true",
+                        help="load bigquery from every cleaned file in the drive output folder instead of only the files cleaned in this run")
+    parser.add_argument("--stage", type=str, default=None)
+    parser.add_argument("--bq-mode", dest="bq_mode", choices=["replace", "merge", "consolidate"], default="replace")
     parser.set_defaults(verbose=True, drive=True, bigquery=True, testing=False, haltpush=False)
 
     parsed_args = parser.parse_args(args)
@@ -41,7 +48,12 @@ def run(process=None, args=None):
         drive=parsed_args.drive,
         bigquery=parsed_args.bigquery,
         testing=parsed_args.testing,
-        haltpush=parsed_args.haltpush
+        haltpush=parsed_args.haltpush,
+        workers=parsed_args.workers,
+        streaming=parsed_args.streaming,
+        backfill=parsed_args.backfill,
+        bq_mode=parsed_args.bq_mode,
+        stage=parsed_args.stage
     )
 
 if __name__ == "__main__":
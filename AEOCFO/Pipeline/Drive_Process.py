@@ -1,12 +1,20 @@
+import pandas as pd
 from AEOCFO.Utility.Logger_Utils import get_logger
 from AEOCFO.Transform.Processor import ASUCProcessor
 from AEOCFO.Extract.Drive_Pull import drive_pull
 from AEOCFO.Load.Drive_Push import drive_push
+from AEOCFO.Pipeline.Stream_Process import drive_process_stream
 
-def drive_process(directory_ids: dict[str, str | list[str]], process_type: str, blind_to = None, duplicate_handling: str = "Ignore", year: str | None = None, reporting: bool = False, debug: bool = False, testing: bool = False, haltpush: bool = False) -> None:
+def drive_process(directory_ids: dict[str, str | list[str]], process_type: str, blind_to = None, duplicate_handling: str = "Ignore", year: str | None = None, reporting: bool = False, debug: bool = False, testing: bool = False, haltpush: bool = False, max_workers: int = 1, streaming: bool = False, queue_size: int = 4, keep_outputs: bool = True) -> tuple[list[pd.DataFrame], list[str]]:
     """
     Handles the entire extract, transform and load process given an input and output dir id. Assumes implementation of an _authenticate() func to initiate service account.
     directories: directory with two keys, 'input' and 'output' and corresponding values being either strings or tuples of strings listing out input and output directory ids
+    max_workers: number of concurrent downloads drive_pull and concurrent uploads drive_push are allowed to run
+    streaming: if True pull, transform and push run concurrently as a stream (see drive_process_stream) instead of one stage after another
+    queue_size: maximum number of files buffered between stages in streaming mode
+    keep_outputs: whether or not to return the cleaned outputs. Turn off for streaming runs that don't need them to keep memory bounded.
+
+    Returns the cleaned outputs and their names so later stages (eg. bigquery_push) can use them without pulling them back from drive.
     """
     # dataframes: dict[str : pd.DataFrame]
     # raw_names: list[str]
@@ -20,16 +28,18 @@ def drive_process(directory_ids: dict[str, str | list[str]], process_type: str,
 
     assert 'input' in directory_ids.keys() and 'output' in directory_ids.keys(), f"inputed diction of directory ids malformed, no 'input' and 'output' keys"
 
-    if process_type != 'FICCOMBINE':
+    if streaming and process_type != 'FICCOMBINE':
+        cleaned_dfs, cleaned_names = drive_process_stream(directory_ids, process_type, blind_to=blind_to, duplicate_handling=duplicate_handling, reporting=reporting, debug=debug, testing=testing, haltpush=haltpush, max_workers=max_workers, queue_size=queue_size, collect=keep_outputs)
+    elif process_type != 'FICCOMBINE':
         in_dir_id, out_dir_id = directory_ids['input'], directory_ids['output']
         assert isinstance(in_dir_id, str), f"input directory ID is not a string: {in_dir_id}"
         assert isinstance(out_dir_id, str), f"output directory ID is not a string: {out_dir_id}"
 
-        dataframes, raw_names = drive_pull(in_dir_id, process_type=process_type, reporting=reporting, debug=debug, testing=testing)
-        if dataframes == {} and raw_names == []:
+        dataframes, raw_names = drive_pull(in_dir_id, process_type=process_type, reporting=reporting, debug=debug, testing=testing, max_workers=max_workers)
+        if not dataframes:
             logger.info(f"No files of query type {process_type} found in designated folder ID{in_dir_id}")
             if reporting: print(f"No files of query type {process_type} found in designated folder ID{in_dir_id}")
-            return
+            return [], []
         
         logger.info(f"--- START: {process_type} ASUCProcessor ---")
         if reporting: print(f"--- START: {process_type} ASUCProcessor ---")
@@ -42,7 +52,7 @@ def drive_process(directory_ids: dict[str, str | list[str]], process_type: str,
         if reporting: print(f"--- END: {process_type} ASUCProcessor ---")
         
         if not haltpush:
-            df_ids: dict[str : str] = drive_push(out_dir_id, cleaned_dfs, cleaned_names, processing_type, blind_to=blind_to, duplicate_handling=duplicate_handling, reporting=reporting)
+            df_ids: dict[str : str] = drive_push(out_dir_id, cleaned_dfs, cleaned_names, processing_type, blind_to=blind_to, duplicate_handling=duplicate_handling, reporting=reporting, max_workers=max_workers)
         else:
             logger.info(f"[drive_process] - halt_push call made, ending workloop and stopping push to google drive")
             if reporting: print(f"[drive_process] - halt_push call made, ending workloop and stopping push to google drive")
@@ -59,9 +69,9 @@ def drive_process(directory_ids: dict[str, str | list[str]], process_type: str,
         for dir_id, name in zip([OASIS_ID, CONTINGENCY_ID, FR_ID, FICCOMBINE_ID], ["OASIS", "CONTINGENCY", "FR", "FICCOMBINE"]):
             assert isinstance(dir_id, str), f"{name} directory ID is not a string: {dir_id}"
         
-        oasis_dict, oasis_names_dict = drive_pull(OASIS_ID, process_type=process_type, name_keywords=[year], reporting=reporting)
-        contingency_dict, contingency_names_dict = drive_pull(CONTINGENCY_ID, process_type=process_type, name_keywords=[year], reporting=reporting)
-        fr_dict, fr_names_dict = drive_pull(FR_ID, process_type=process_type, name_keywords=[year], reporting=reporting)
+        oasis_dict, oasis_names_dict = drive_pull(OASIS_ID, process_type=process_type, name_keywords=[year], reporting=reporting, max_workers=max_workers)
+        contingency_dict, contingency_names_dict = drive_pull(CONTINGENCY_ID, process_type=process_type, name_keywords=[year], reporting=reporting, max_workers=max_workers)
+        fr_dict, fr_names_dict = drive_pull(FR_ID, process_type=process_type, name_keywords=[year], reporting=reporting, max_workers=max_workers)
 
         assert len(oasis_dict) != 0, f"No OASIS files for year {year} found"
         assert len(contingency_dict) != 0, f"No Ficomm-Cont files for year {year} found"
@@ -80,9 +90,14 @@ def drive_process(directory_ids: dict[str, str | list[str]], process_type: str,
         )
 
         if not haltpush:
-            df_ids = drive_push(FICCOMBINE_ID, merged_outputs, merged_names, process_type, blind_to=blind_to, duplicate_handling=duplicate_handling, reporting=reporting)
+            df_ids = drive_push(FICCOMBINE_ID, merged_outputs, merged_names, process_type, blind_to=blind_to, duplicate_handling=duplicate_handling, reporting=reporting, max_workers=max_workers)
         else:
             logger.info(f"[drive_process] - halt_push call made, ending workloop and stopping push to google drive")
             if reporting: print(f"[drive_process] - halt_push call made, ending workloop and stopping push to google drive")
 
-    logger.info(f"--- END DRIVE PROCESSING: '{process_type}' ---")
\ No newline at end of file
+        cleaned_dfs, cleaned_names = merged_outputs, merged_names
+
+    logger.info(f"--- END DRIVE PROCESSING: '{process_type}' ---")
+    if not keep_outputs:
+        return [], []
+    return cleaned_dfs, cleaned_names
\ No newline at end of file
@@ -1,17 +1,28 @@
+import os
 from AEOCFO.Utility.Logger_Utils import get_logger
 from AEOCFO.Pipeline.Drive_Process import drive_process
 from AEOCFO.Config.Folders import get_folder_id, get_dataset_ids
 from AEOCFO.Extract.Drive_Pull import drive_pull
 from AEOCFO.Load.BQ_Push import bigquery_push
+from AEOCFO.Load.GCP_Push import make_stage
 from AEOCFO.Config.Drive_Config import get_process_config
 
-def execute(t, verbose=True, drive=True, bigquery=False, testing=False, haltpush=False):
+def execute(t, verbose=True, drive=True, bigquery=False, testing=False, haltpush=False, workers=1, streaming=False, backfill=False, bq_mode="replace", stage=None):
     """
     t (str): Processing type (eg. Contingency, OASIS, FR, etc).
     verbose (bool): Specifies whether or not to print logs fully.
     drive (bool): specifies whether or not run processing of raw files to a clean file in google drive
     bigquery (bool): specifies whether or not to 
     haltpush (bool): tells the function not to push files (helpful for debugging just pulling and processing functionalities)
+    workers (int): number of concurrent downloads/uploads to run when pulling files from and pushing files to drive
+    streaming (bool): overlap pulling, cleaning and pushing files instead of running each stage over the whole folder
+    backfill (bool): push every cleaned file in the drive output folder to bigquery instead of only the files cleaned in this run.
+        By default bigquery receives the cleaned dataframes straight from drive_process without pulling them back from drive.
+        A bigquery-only run (drive=False) has no cleaned dataframes in memory, so it always backfills from the drive output folder.
+    bq_mode (str): 'replace' rewrites one bigquery table per cleaned file, 'merge' upserts the cleaned files into the dataset's long-lived table
+        and 'consolidate' loads them into it in one job (see bigquery_push).
+    stage (str): with bq_mode 'consolidate', stage the cleaned files as Parquet at this location ('gs://bucket/prefix' or a local directory)
+        and load them from there with a single wildcard load job.
     """
     assert t in get_process_config(), f"Inputted type '{t}' not supported. Supported types include: {get_process_config().keys()}"
     
@@ -19,26 +30,41 @@ def execute(t, verbose=True, drive=True, bigquery=False, testing=False, haltpush
     logger.info(f"--- START PIPELINE: '{t}' ---")
     if verbose: print(f"--- START PIPELINE: '{t}' ---")
 
+    INPUT_folderID, OUTPUT_folderID = get_folder_id(process=t, request='both', testing=testing)
+    cleaned_dfs, cleaned_names = [], []
     if drive:
-        INPUT_folderID, OUTPUT_folderID = get_folder_id(process=t, request='both', testing=testing)   
         folder_ids = {
             'input': INPUT_folderID, 
             'output': OUTPUT_folderID
         }
-        drive_process(directory_ids=folder_ids, process_type=t, duplicate_handling="Ignore", reporting=verbose, testing=testing, haltpush=haltpush)
+        keep_outputs = bigquery and not backfill # only hold onto cleaned files if bigquery will consume them
+        cleaned_dfs, cleaned_names = drive_process(directory_ids=folder_ids, process_type=t, duplicate_handling="Ignore", reporting=verbose, testing=testing, haltpush=haltpush, max_workers=workers, streaming=streaming, keep_outputs=keep_outputs)
 
     if bigquery:
         logger.info(f"--- BEGINNING BIG QUERY PIPELINE: '{t} ---")
         if verbose: print(f"--- BEGINNING BIG QUERY PIPELINE: '{t} ---")
 
         DESTINATION_datasetID = get_dataset_ids(process_type=t, testing=testing)
-        dataframes, names = drive_pull(OUTPUT_folderID, process_type="BIGQUERY", reporting=verbose)
-        if not dataframes and not names:
-            logger.warning(f"No files of query type {t} found in folder ID {OUTPUT_folderID}, ending workloop.")
-            if verbose: print(f"No files of query type {t} found in folder ID {OUTPUT_folderID}, ending workloop.")
-        df_list = dataframes.values()
-        name_list = names.values()
-        bigquery_push(DESTINATION_datasetID, df_list, name_list, processing_type=t, duplicate_handling="replace", reporting=verbose)
+        if not drive and not backfill:
+            logger.warning(f"Drive processing is off so no files were cleaned in this run, backfilling bigquery from the drive output folder instead")
+            if verbose: print(f"Drive processing is off so no files were cleaned in this run, backfilling bigquery from the drive output folder instead")
+            backfill = True
+        if backfill:
+            logger.info(f"Backfilling bigquery from every cleaned file in folder ID {OUTPUT_folderID}")
+            if verbose: print(f"Backfilling bigquery from every cleaned file in folder ID {OUTPUT_folderID}")
+            dataframes, names = drive_pull(OUTPUT_folderID, process_type="BIGQUERY", reporting=verbose, max_workers=workers)
+            df_list = list(dataframes.values())
+            name_list = list(names.values())
+        else:
+            df_list = cleaned_dfs
+            name_list = [os.path.splitext(name)[0] for name in cleaned_names] # same names drive_push gives the files in drive
+
+        if not df_list:
+            logger.warning(f"No cleaned {t} files to push to bigquery (backfill: {backfill}), ending workloop.")
+            if verbose: print(f"No cleaned {t} files to push to bigquery (backfill: {backfill}), ending workloop.")
+        else:
+            bq_stage = make_stage(stage) if stage is not None else None
+            bigquery_push(DESTINATION_datasetID, df_list, name_list, processing_type=t, duplicate_handling=bq_mode, reporting=verbose, stage=bq_stage)
 
         logger.info(f"--- ENDING BIG QUERY PIPELINE: '{t} ---")
         if verbose: print(f"--- ENDING BIG QUERY PIPELINE: '{t} ---")
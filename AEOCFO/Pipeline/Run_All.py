@@ -9,6 +9,11 @@ def run_all():
     parser.add_argument("--no-drive", dest="drive", action="store_false", help="Disable Google Drive processing")
     parser.add_argument("--no-bigquery", dest="bigquery", action="store_false", help="Disable BigQuery push")
     parser.add_argument("--halt-push", dest="haltpush", action="store_true", help="Disables pushing cleaned files to Google Drive")
+    parser.add_argument("--workers", type=int, default=1, help="Number of files to download from and upload to Google Drive concurrently")
+    parser.add_argument("--streaming", action="store_true", help="Pull, clean and push files concurrently as a stream")
+    parser.add_argument("--backfill", action="store_true", help="Push every cleaned file in the drive output folder to BigQuery, not just this run's")
+    parser.add_argument("--stage", type=str, default=None, help="With --bq-mode consolidate, stage cleaned files as Parquet at this 'gs://bucket/prefix' or local directory and load them with one job")
+    parser.add_argument("--bq-mode", dest="bq_mode", choices=["replace", "merge", "consolidate"], default="replace", help="'replace' writes a BigQuery table per cleaned file, 'merge' upserts them into one table per dataset and 'consolidate' appends them to it")
 
     parser.set_defaults(verbose=True, drive=True, bigquery=True, testing=False, haltpush=False)
     args = parser.parse_args()
@@ -20,7 +25,12 @@ def run_all():
             drive=args.drive, 
             bigquery=args.bigquery, 
             testing=args.testing, 
-            haltpush=args.haltpush
+            haltpush=args.haltpush, 
+            workers=args.workers, 
+            streaming=args.streaming, 
+            backfill=args.backfill,
+            bq_mode=args.bq_mode,
+            stage=args.stage
         )
 
 if __name__ == "__main__":
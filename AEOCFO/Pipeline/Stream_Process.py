@@ -0,0 +1,145 @@
+import pandas as pd
+import queue
+import threading
+from AEOCFO.Utility.Logger_Utils import get_logger
+from AEOCFO.Transform.Processor import ASUCProcessor
+from AEOCFO.Extract.Drive_Pull import drive_pull_iter
+from AEOCFO.Load.Drive_Push import drive_push
+from AEOCFO.Utility.Drive_Helpers import FolderNameIndex
+
+_DONE = object() # sentinel marking the end of a stage's output
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once another stage has failed. Returns whether or not the item was queued."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Blocking get that returns _DONE once another stage has failed."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+    return _DONE
+
+def drive_process_stream(directory_ids: dict[str, str], process_type: str, blind_to = None, duplicate_handling: str = "Ignore", reporting: bool = False, debug: bool = False, testing: bool = False, haltpush: bool = False, max_workers: int = 1, queue_size: int = 4, push_batch_size: int = 16, collect: bool = False) -> tuple[list[pd.DataFrame], list[str]]:
+    """
+    Streaming version of drive_process. Runs pull -> transform -> push as three concurrent stages connected by bounded queues:
+    - pull: drive_pull_iter yields raw files as they are downloaded
+    - transform: ASUCProcessor cleans each raw file as soon as it arrives
+    - push: cleaned files are uploaded with drive_push in batches of 'push_batch_size'. The output (and archive) folder is listed once
+        for the whole stream and that index is shared by every batch.
+    Network and CPU work overlap and peak memory is bounded by the queue depths rather than by the size of the folder.
+
+    directory_ids: dictionary with keys 'input' and 'output' whose values are single directory ids. FICCOMBINE is not supported since it merges whole folders.
+    queue_size (int): maximum number of raw files and of cleaned files waiting between stages.
+    push_batch_size (int): number of cleaned files to collect before each drive_push call. Bigger batches upload more files concurrently.
+    collect (bool): whether or not to also keep every cleaned file and return them. Memory then grows with the folder again.
+
+    Returns:
+    - list of cleaned DataFrames and list of their names (both empty unless 'collect' is set)
+    """
+    logger = get_logger(process_type)
+    logger.info(f"--- START STREAMING DRIVE PROCESSING: '{process_type}' ---")
+    if reporting: print(f"--- START STREAMING DRIVE PROCESSING: '{process_type}' ---")
+
+    assert 'input' in directory_ids.keys() and 'output' in directory_ids.keys(), f"inputed diction of directory ids malformed, no 'input' and 'output' keys"
+    if process_type.upper() == 'FICCOMBINE':
+        raise ValueError("Streaming mode is not supported for 'FICCOMBINE' processing, use drive_process instead")
+    in_dir_id, out_dir_id = directory_ids['input'], directory_ids['output']
+    assert isinstance(in_dir_id, str), f"input directory ID is not a string: {in_dir_id}"
+    assert isinstance(out_dir_id, str), f"output directory ID is not a string: {out_dir_id}"
+    assert queue_size >= 1 and push_batch_size >= 1, f"queue_size and push_batch_size must be positive but are {queue_size} and {push_batch_size}"
+
+    raw_q = queue.Queue(maxsize=queue_size)
+    clean_q = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    processor = ASUCProcessor(process_type)
+    processing_type = processor.get_type()
+    name_index = FolderNameIndex({}) # filled by the first drive_push, reused by the rest
+
+    def pull_stage():
+        try:
+            for item in drive_pull_iter(in_dir_id, process_type=process_type, reporting=reporting, debug=debug, testing=testing, max_workers=max_workers):
+                if not _put(raw_q, item, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(raw_q, _DONE, stop)
+
+    def transform_stage():
+        try:
+            while True:
+                item = _get(raw_q, stop)
+                if item is _DONE:
+                    return
+                file_id, file_name, raw = item
+                cleaned_dfs, cleaned_names = processor({file_id: raw}, {file_id: file_name}, reporting=reporting)
+                for df, name in zip(cleaned_dfs, cleaned_names):
+                    if not _put(clean_q, (df, name), stop):
+                        return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(clean_q, _DONE, stop)
+
+    def push_batch(dfs, names):
+        if haltpush:
+            logger.info(f"[drive_process_stream] - halt_push call made, skipping push of {len(dfs)} file(s) to google drive")
+            if reporting: print(f"[drive_process_stream] - halt_push call made, skipping push of {len(dfs)} file(s) to google drive")
+            return
+        drive_push(out_dir_id, dfs, names, processing_type, blind_to=blind_to, duplicate_handling=duplicate_handling, reporting=reporting, max_workers=max_workers, name_index=name_index)
+
+    stages = [threading.Thread(target=pull_stage, name=f"{process_type}-pull", daemon=True),
+              threading.Thread(target=transform_stage, name=f"{process_type}-transform", daemon=True)]
+    for stage in stages:
+        stage.start()
+
+    pushed = 0
+    batch_dfs, batch_names = [], []
+    collected_dfs, collected_names = [], []
+    try:
+        while True:
+            item = _get(clean_q, stop)
+            if item is _DONE:
+                break
+            df, name = item
+            batch_dfs.append(df)
+            batch_names.append(name)
+            if collect:
+                collected_dfs.append(df)
+                collected_names.append(name)
+            if len(batch_dfs) >= push_batch_size:
+                push_batch(batch_dfs, batch_names)
+                pushed += len(batch_dfs)
+                batch_dfs, batch_names = [], []
+        if batch_dfs and not stop.is_set():
+            push_batch(batch_dfs, batch_names)
+            pushed += len(batch_dfs)
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        for stage in stages:
+            stage.join()
+
+    if errors:
+        logger.error(f"Streaming drive processing failed after handling {pushed} file(s): {errors[0]}")
+        if reporting: print(f"Streaming drive processing failed after handling {pushed} file(s): {errors[0]}")
+        raise errors[0]
+
+    logger.info(f"Streamed {pushed} cleaned file(s) through drive_push")
+    if reporting: print(f"Streamed {pushed} cleaned file(s) through drive_push")
+    logger.info(f"--- END STREAMING DRIVE PROCESSING: '{process_type}' ---")
+    if reporting: print(f"--- END STREAMING DRIVE PROCESSING: '{process_type}' ---")
+    return collected_dfs, collected_names
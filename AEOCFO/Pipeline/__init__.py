@@ -1,3 +1,4 @@
 from .Drive_Process import *
+from .Stream_Process import drive_process_stream
 from .Execute import execute
 from .Any import run
\ No newline at end of file
@@ -3,7 +3,7 @@ import pandas as pd
 
 # full path should be the way as long as: 
 
-from AEOCFO.Utility.Utils import heading_finder
+from AEOCFO.Utility.Utils import section_index, section_slicer
 from AEOCFO.Utility.Cleaning import is_type
 
 def _dropper(instance, dictionary):
@@ -61,9 +61,11 @@ def ABSA_Processor(df: pd.DataFrame, Cats: dict[str, list[str]] = None, Drop: st
         ### TO DO ###
 
 
+    # one pass over the first column finds every section label and SUBTOTAL row, each section is then sliced out of that index
+    sections = section_index(df, 0, Types['Header'] + Types['No Header'], end = 'SUBTOTAL')
     sub_frames = []
     for label in Types['Header']:
-        header_result: pd.DataFrame = heading_finder(df = df, start_col = 0, start = label, shift = 1, end = 'SUBTOTAL', start_logic = 'exact', end_logic = 'contains')
+        header_result: pd.DataFrame = section_slicer(df, sections, label, shift = 1)
         if header_result.empty: 
             print(f"Warning: No data found for label {label} under the 'Header' category.")
         else: 
@@ -72,7 +74,7 @@ def ABSA_Processor(df: pd.DataFrame, Cats: dict[str, list[str]] = None, Drop: st
             header_result = header_result.reset_index(drop=True)
             sub_frames.append(header_result)
     for label in Types['No Header']:
-        no_header_result: pd.DataFrame = heading_finder(df = df, start_col = 0, start = label, shift = 0, end = 'SUBTOTAL', start_logic = 'exact', end_logic = 'contains') 
+        no_header_result: pd.DataFrame = section_slicer(df, sections, label, shift = 0)
         if no_header_result.empty: 
             print(f"Warning: No data found for label {label} under the 'No Header' category.")
         else:
@@ -54,6 +54,7 @@ class ASUCProcessor:
             'Clean Tag': "GF", 
             'Clean File Name': "ABSA", 
             'Raw Name Dependency': ["Date"], # raw files need to have the date in their file name
+            'Output Format': 'csv', # format cleaned files are written to drive in: 'csv', 'csv.gz' or 'parquet'
             'Processing Function': ABSA_Processor}, 
         "CONTINGENCY" : {
             'Raw Tag': "RF", 
@@ -61,12 +62,14 @@ class ASUCProcessor:
             'Clean File Name': "Ficomm-Cont", 
             'Date Format':"%m/%d/%Y", 
             'Raw Name Dependency': None, 
+            'Output Format': 'csv', 
             'Processing Function': Agenda_Processor}, 
         "OASIS" : {
             'Raw Tag':"RF", 
             'Clean Tag':"GF", 
             'Clean File Name':"OASIS", 
             'Raw Name Dependency':["Date"], 
+            'Output Format':'csv', 
             'Processing Function':OASIS_Abridged}, 
         "FR" : {
             'Raw Tag':"RF", 
@@ -74,12 +77,14 @@ class ASUCProcessor:
             'Clean File Name':"Ficomm-Reso", 
             'Date Format':"%m/%d/%Y", 
             'Raw Name Dependency':["Date", "Numbering", "Coding"], 
+            'Output Format':'csv', 
             'Processing Function':FR_ProcessorV2}, 
         "FICCOMBINE": {
             'Raw Tag': "RF",
             'Clean Tag': "GF",
             'Clean File Name': "Ficomm-Combined",
             'Raw Name Dependency': ["Date"],
+            'Output Format': 'csv',
             'Processing Function': None  # Handled directly by ASUCProcessor
         }
     }
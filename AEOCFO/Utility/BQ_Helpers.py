@@ -1,5 +1,6 @@
 import pandas as pd
 import re
+import pyarrow as pa
 
 def clean_name(name: str) -> str:
     # Replace spaces with underscores
@@ -28,3 +29,163 @@ def col_name_conversion(dfs) -> list[pd.DataFrame]:
 
     return cleaned_dfs
 
+
+ARROW_TYPES = {
+    'STRING': pa.string(),
+    'FLOAT64': pa.float64(),
+    'INT64': pa.int64(),
+    'BOOL': pa.bool_(),
+    'DATE': pa.date32(),
+    'TIMESTAMP': pa.timestamp('us', tz='UTC')
+}
+
+def infer_bq_type(dtype, default: str = 'STRING') -> str:
+    """BigQuery type for a column that isn't in the schema registry: bool, integer, float and datetime dtypes keep their type, anything else loads as 'default'."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOL'
+    elif pd.api.types.is_integer_dtype(dtype):
+        return 'INT64'
+    elif pd.api.types.is_float_dtype(dtype):
+        return 'FLOAT64'
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return default
+
+def resolve_bq_columns(columns, schema: dict, dtypes: dict = None) -> list[tuple[str, str, str]]:
+    """
+    Pairs each dataframe column with its BigQuery name and type.
+    columns: the dataframe's columns, in order
+    schema (dict): a schema registry entry with 'Columns' (column -> type) and 'Default Type' keys
+    dtypes (dict): column -> pandas dtype (eg. dict(df.dtypes)). Columns missing from 'Columns' with a numeric, bool or datetime dtype
+        keep that type (see infer_bq_type), the rest load as 'Default Type'. Without dtypes every unlisted column loads as 'Default Type'.
+
+    Returns:
+    - list of (source column, cleaned BigQuery column name, BigQuery type) tuples
+    """
+    known = schema.get('Columns', {})
+    default = schema.get('Default Type', 'STRING')
+    dtypes = dtypes or {}
+    resolved = []
+    seen = set()
+    for col in columns:
+        if col in known:
+            bq_type = known[col]
+        elif col in dtypes:
+            bq_type = infer_bq_type(dtypes[col], default)
+        else:
+            bq_type = default
+        if bq_type not in ARROW_TYPES:
+            raise ValueError(f"Unsupported BigQuery type '{bq_type}' for column '{col}'. Must be one of {list(ARROW_TYPES.keys())}.")
+        bq_name = clean_name(str(col))
+        if bq_name in seen:
+            raise ValueError(f"Column '{col}' collides with another column once cleaned to '{bq_name}'")
+        seen.add(bq_name)
+        resolved.append((col, bq_name, bq_type))
+    return resolved
+
+def _to_arrow_array(series: pd.Series, bq_type: str) -> pa.Array:
+    """Converts a column to the Arrow type matching bq_type. Columns that already have the right dtype are converted without copying."""
+    arrow_type = ARROW_TYPES[bq_type]
+    match bq_type:
+        case 'FLOAT64' | 'INT64':
+            if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                series = pd.to_numeric(series, errors='coerce')
+            if bq_type == 'INT64':
+                series = series.astype('Int64')
+        case 'BOOL':
+            if not pd.api.types.is_bool_dtype(series):
+                series = series.map(lambda v: v if pd.isna(v) else bool(v)).astype('boolean')
+        case 'DATE':
+            series = pd.to_datetime(series, errors='coerce').dt.date
+        case 'TIMESTAMP':
+            series = pd.to_datetime(series, errors='coerce', utc=True)
+        case 'STRING':
+            if not (pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series)):
+                series = series.map(lambda v: None if pd.isna(v) else str(v))
+            else:
+                try:
+                    return pa.array(series, type=arrow_type, from_pandas=True)
+                except (pa.ArrowInvalid, pa.ArrowTypeError): # object column with mixed values
+                    series = series.map(lambda v: None if pd.isna(v) else str(v))
+    return pa.array(series, type=arrow_type, from_pandas=True)
+
+def to_arrow_table(df: pd.DataFrame, columns: list[tuple[str, str, str]], constants: dict = None) -> pa.Table:
+    """
+    Builds the Arrow table BigQuery loads from, renaming and typing columns at the Arrow level so the dataframe itself is never copied.
+    df (pd.DataFrame): cleaned output
+    columns: output of resolve_bq_columns for df's columns followed by the constants' keys
+    constants (dict): extra columns holding the same value on every row (eg. values parsed from the file name)
+    """
+    constants = constants or {}
+    n_cols = df.shape[1]
+    assert len(columns) == n_cols + len(constants), f"Expected {n_cols + len(constants)} resolved columns but got {len(columns)}"
+    arrays = []
+    for i, (source, _, bq_type) in enumerate(columns):
+        series = df.iloc[:, i] if i < n_cols else pd.Series([constants[source]] * len(df), dtype=object)
+        arrays.append(_to_arrow_array(series, bq_type))
+    schema = pa.schema([pa.field(bq_name, ARROW_TYPES[bq_type]) for _, bq_name, bq_type in columns])
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def name_columns(name: str, patterns: dict[str, str]) -> dict[str, str]:
+    """
+    Parses column values out of a cleaned file name, eg. the meeting date and FR number of 'Ficomm-Reso-FY25-04/12/2024-S09-GF'.
+    patterns (dict): column name -> regex whose first group is the value
+
+    Returns:
+    - dictionary of column name to parsed value, columns whose pattern doesn't match are left out
+    """
+    rv = {}
+    for col, pattern in patterns.items():
+        match = re.search(pattern, name)
+        if match:
+            rv[col] = match.group(1)
+    return rv
+
+def build_replace_sources_query(target_ref: str, staging_ref: str, columns: list[str], source_col: str) -> str:
+    """
+    Builds a multi-statement transaction replacing the target's rows from the staged source files with the staged rows.
+    The DELETE and INSERT commit together, so a failure leaves the target untouched. Expects an '@source_files' ARRAY<STRING> parameter.
+    columns: cleaned BigQuery column names to write
+    """
+    col_list = ", ".join(f"`{col}`" for col in columns)
+    return (
+        f"BEGIN\n"
+        f"  BEGIN TRANSACTION;\n"
+        f"  DELETE FROM `{target_ref}` WHERE `{source_col}` IN UNNEST(@source_files);\n"
+        f"  INSERT INTO `{target_ref}` ({col_list}) SELECT {col_list} FROM `{staging_ref}`;\n"
+        f"  COMMIT TRANSACTION;\n"
+        f"EXCEPTION WHEN ERROR THEN\n"
+        f"  ROLLBACK TRANSACTION;\n"
+        f"  RAISE USING MESSAGE = @@error.message;\n"
+        f"END;"
+    )
+
+def build_merge_query(target_ref: str, staging_ref: str, columns: list[str], keys: list[str], order_col: str) -> str:
+    """
+    Builds a MERGE statement upserting a staging table into a target table.
+    Staging rows are deduplicated on the keys first, keeping the row with the highest 'order_col' (ie. from the latest file),
+    since a MERGE fails when several source rows match the same target row.
+    columns: cleaned BigQuery column names to write, must include the keys
+    keys: cleaned BigQuery names of the natural key columns
+    """
+    missing = [key for key in keys if key not in columns]
+    if missing:
+        raise ValueError(f"Merge keys {missing} are not columns of the staged data: {columns}")
+    key_list = ", ".join(f"`{key}`" for key in keys)
+    on = " AND ".join(f"T.`{key}` IS NOT DISTINCT FROM S.`{key}`" for key in keys)
+    updates = ", ".join(f"`{col}` = S.`{col}`" for col in columns if col not in keys)
+    col_list = ", ".join(f"`{col}`" for col in columns)
+    values = ", ".join(f"S.`{col}`" for col in columns)
+    query = (
+        f"MERGE `{target_ref}` T\n"
+        f"USING (\n"
+        f"  SELECT * EXCEPT(`{order_col}`) FROM `{staging_ref}`\n"
+        f"  WHERE TRUE\n"
+        f"  QUALIFY ROW_NUMBER() OVER (PARTITION BY {key_list} ORDER BY `{order_col}` DESC) = 1\n"
+        f") S\n"
+        f"ON {on}\n"
+    )
+    if updates:
+        query += f"WHEN MATCHED THEN UPDATE SET {updates}\n"
+    query += f"WHEN NOT MATCHED THEN INSERT ({col_list}) VALUES ({values})"
+    return query
@@ -0,0 +1,116 @@
+import os
+import hashlib
+import threading
+
+# Cache location and size can be overridden per machine without touching code
+DEFAULT_CACHE_DIR = os.getenv("OCFO_DRIVE_CACHE_DIR", os.path.join(".cache", "drive"))
+DEFAULT_MAX_BYTES = int(os.getenv("OCFO_DRIVE_CACHE_MAX_BYTES", 2 * 1024 ** 3)) # 2 GiB
+DEFAULT_BQ_CACHE_DIR = os.getenv("OCFO_BQ_CACHE_DIR", os.path.join(".cache", "bigquery"))
+
+# Metadata fields that identify a version of a drive file, in order of preference.
+# Google Docs/Sheets have no md5Checksum or headRevisionId so they fall back to modifiedTime.
+VERSION_FIELDS = ("md5Checksum", "headRevisionId", "modifiedTime")
+
+def file_version(file: dict) -> str | None:
+    """
+    Returns a token that changes whenever the content of a drive file changes, or None if the listing metadata has no version fields.
+    file (dict): File metadata as returned by list_files(rv='FULL').
+    """
+    for field in VERSION_FIELDS:
+        value = file.get(field)
+        if value:
+            return f"{field}:{value}"
+    return None
+
+class DriveCache:
+    """
+    Persistent content-addressed cache for downloaded drive files.
+    Entries are keyed by file id + version token + variant (eg. the export MIME type) so a changed file is simply a cache miss.
+    Least recently used entries are evicted once the cache grows past 'max_bytes'; file modification times track recency.
+    The same store backs the BigQuery query result cache (see get_bigquery_cache), keyed by query + table versions instead.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock() # drive_pull can download concurrently
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    @staticmethod
+    def key(file_id: str, version: str, variant: str = "media") -> str:
+        return hashlib.sha256(f"{file_id}|{version}|{variant}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.cache_dir) if entry.is_file() and not entry.name.endswith(".tmp")]
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return None
+            os.utime(path) # mark as most recently used
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path) # atomic so readers never see a partial entry
+            self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the cache fits within max_bytes. Caller must hold the lock."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+
+    def size(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries():
+                os.remove(entry.path)
+            self._size = 0
+
+_drive_cache = None
+_drive_cache_lock = threading.Lock()
+
+def get_drive_cache() -> DriveCache:
+    """Returns the process-wide DriveCache, creating it on first use."""
+    global _drive_cache
+    with _drive_cache_lock:
+        if _drive_cache is None:
+            _drive_cache = DriveCache()
+        return _drive_cache
+
+_bigquery_cache = None
+
+def get_bigquery_cache() -> DriveCache:
+    """Returns the process-wide cache for BigQuery query results (Parquet bytes), creating it on first use."""
+    global _bigquery_cache
+    with _drive_cache_lock:
+        if _bigquery_cache is None:
+            _bigquery_cache = DriveCache(cache_dir=DEFAULT_BQ_CACHE_DIR)
+        return _bigquery_cache
@@ -1,88 +1,141 @@
 import pandas as pd
 import io
-from collections.abc import Iterable
-from googleapiclient.http import MediaIoBaseDownload
+import re
+import hashlib
+from collections.abc import Iterable, Iterator
+from googleapiclient.http import MediaIoBaseDownload, MediaUpload
 from AEOCFO.Config.Authenticators import authenticate_credentials
+from AEOCFO.Utility.Drive_Cache import get_drive_cache
+from AEOCFO.Utility.Format_Helpers import iter_dataframe_bytes, get_output_format, format_from_mimetype, read_dataframe, DEFAULT_CHUNK_ROWS
 
 
 def get_unique_name_in_folder(service, archive_folder_id, base_name) -> str:
     """
     Returns a unique name in the archive folder by checking for existing files and appending (1), (2), etc.
+    Lists the whole folder on every call, build a FolderNameIndex instead when naming several files.
     """
-    query = f"'{archive_folder_id}' in parents and trashed = false"
-    response = service.files().list(q=query, fields="files(name)").execute()
-    existing_names = set(file['name'] for file in response.get('files', []))
+    return FolderNameIndex.from_drive(service, [archive_folder_id]).unique_name(archive_folder_id, base_name)
 
-    if base_name not in existing_names:
-        return base_name
+MIME_MAP = {
+    'csv': "text/csv",
+    'csv.gz': "application/gzip",
+    'parquet': "application/vnd.apache.parquet",
+    'txt': "text/plain",
+    'gdoc': "application/vnd.google-apps.document",
+    'gspreadsheet': "application/vnd.google-apps.spreadsheet"
+}
 
-    # Find next available numbered name
-    counter = 1
-    while f"{base_name} ({counter})" in existing_names:
-        counter += 1
-    return f"{base_name} ({counter})"
+# Only ask the Drive API for the fields each 'rv' mode actually returns
+RV_FIELDS = {
+    'ID': "id",
+    'NAME': "name",
+    'PATH': "id",
+    'MIMETYPE': "mimeType",
+    'FULL': "id, name, mimeType, md5Checksum, modifiedTime, headRevisionId", # version fields let downloads hit the local cache
+    'FILE': "id, name, mimeType",
+}
 
-def list_files(folder_id, query_type='ALL', rv='ID', name_keywords: Iterable[str] = None, reporting=False) -> list[str]:
+DEFAULT_PAGE_SIZE = 1000 # max page size the Drive files().list endpoint accepts
+DRIVE_BATCH_SIZE = 100 # max calls the Drive batch endpoint accepts in one request
+
+def _escape_query_value(value: str) -> str:
+    """Escapes backslashes and single quotes so a value can sit inside a quoted Drive query string."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+def build_files_query(folder_id, query_type='ALL', include_trashed=False) -> str:
+    """
+    Builds the Drive 'q' string for listing a folder so parent, mimeType and trashed filtering happens server side.
+    Name keywords are deliberately left out: Drive's 'name contains' only matches the start of words in a name,
+    so keywords like 'FY25' or 'S09' inside hyphenated names would be dropped. iter_files checks them client side instead.
+    
+    folder_id (str): ID of the folder to list.
+    query_type (str): 'ALL', a key of MIME_MAP or combos like 'csv+gspreadsheet'.
+    include_trashed (bool): Whether or not to include trashed files. Default is to exclude them.
+    """
+    query_type = query_type.lower()  # Normalize input
+    clauses = [f"'{_escape_query_value(folder_id)}' in parents"]
+
+    if query_type != 'all':
+        query_parts = []
+        for qt in query_type.split('+'):
+            qt = qt.strip()
+            if qt not in MIME_MAP:
+                raise ValueError(f"Unsupported query type '{qt}'. Use 'ALL', {list(MIME_MAP.keys())}, or combos like 'csv+gspreadsheet'.")
+            query_parts.append(f"mimeType='{MIME_MAP[qt]}'")
+        clauses.append(f"({' or '.join(query_parts)})")
+
+    if not include_trashed:
+        clauses.append("trashed = false")
+
+    return " and ".join(clauses)
+
+def iter_files(service, folder_id, query_type='ALL', fields="id, name, mimeType", name_keywords: Iterable[str] = None, page_size=DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+    """
+    Generator that lazily yields file metadata dictionaries from a google drive folder, following 'nextPageToken' until the listing is exhausted.
+    Parent, mimeType and trashed filtering is pushed into the query string (see build_files_query).
+    'name_keywords' is a case insensitive substring check applied to each returned file, the same as filtering the full listing.
+
+    service: Authenticated google drive service.
+    fields (str): Comma separated file fields to request (eg. "id, name").
+    page_size (int): Number of files requested per page.
+    """
+    if name_keywords:
+        assert all(isinstance(word, str) for word in name_keywords), f"not all inputted keywords to search for are strings: {name_keywords}"
+        if 'name' not in [field.strip() for field in fields.split(',')]:
+            fields = f"{fields}, name"
+    query = build_files_query(folder_id, query_type=query_type)
+    lower_keywords = [kw.lower() for kw in name_keywords] if name_keywords else None
+
+    page_token = None
+    while True:
+        response = service.files().list(
+            q=query,
+            fields=f"nextPageToken, files({fields})",
+            pageSize=page_size,
+            pageToken=page_token
+        ).execute()
+
+        for f in response.get("files", []):
+            if lower_keywords is not None and not any(kw in f.get('name', '').lower() for kw in lower_keywords): # check for name contains
+                continue
+            yield f
+
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+
+def list_files(folder_id, query_type='ALL', rv='ID', name_keywords: Iterable[str] = None, reporting=False, service=None) -> list[str]:
     """
     Given a google drive folder id, this function will return a list of all files from that folder that satisfy the 'qeury_type'.
+    Follows every page of the listing so large folders aren't truncated, see iter_files.
     
     folder_id (str): ID of the folder from which to pull files from.
     query_type (str): Specifies what kind of files to pull. Default is 'ALL'.
         Currently only supports: 'ALL', 'csv', 'gdoc', 'gspreadsheet' and 'txt'
     rv (str): Specifies what attributes about each file to return. Default is 'ID' to return file ids. 
         Currently only supports 'ID', 'NAME', 'PATH' and 'FUll'
-        'FUll' returns a list of dictionaries where each dictionaries represents a file with the keys corresponding to id, name and path
+        'FUll' returns a list of dictionaries where each dictionaries represents a file with the keys corresponding to id, name, path and the version fields (md5Checksum, modifiedTime, headRevisionId)
     name_keywords (Iterable[str]): If specified list_files will only pull file names that contain at least one of the keywords in 'name_keywords'
     reporting (bool): Specifies whether or not to turn on print statements to assist in debugging.
+    service: Authenticated google drive service to reuse. Default is to authenticate a new one.
     """
-    service = authenticate_credentials(acc='primary', platform='drive')
-    query_type = query_type.lower()  # Normalize input
-
-    mime_map = {
-        'csv': "text/csv",
-        'txt': "text/plain",
-        'gdoc': "application/vnd.google-apps.document",
-        'gspreadsheet': "application/vnd.google-apps.spreadsheet"
-    }
+    if rv not in RV_FIELDS:
+        raise ValueError(f"Unsupported return value '{rv}'.")
+    if service is None:
+        service = authenticate_credentials(acc='primary', platform='drive')
 
-    if '+' in query_type:
-        query_parts = []
-        for qt in query_type.split('+'):
-            qt = qt.strip()
-            if qt not in mime_map:
-                raise ValueError(f"Unsupported query type part '{qt}'. Supported types: {list(mime_map.keys())}")
-            query_parts.append(f"mimeType='{mime_map[qt]}'")
-        mime_filter = " or ".join(query_parts)
-        query = f"'{folder_id}' in parents and ({mime_filter})"
+    if query_type.lower() == 'all':
+        print(f"Pulling all files from folder '{folder_id}'")
+    elif '+' in query_type:
         print(f"Pulling files from folder '{folder_id}' with MIME types: {query_type}")
     else:
-        match query_type:
-            case 'all':
-                query = f"'{folder_id}' in parents"
-                print(f"Pulling all files from folder '{folder_id}'")
-            case qt if qt in mime_map:
-                query = f"'{folder_id}' in parents and mimeType='{mime_map[qt]}'"
-                print(f"Pulling all {qt.upper()} files from folder '{folder_id}'")
-            case _:
-                raise ValueError(f"Unsupported query type '{query_type}'. Use 'ALL', 'csv', 'gdoc', 'txt', 'gspreadsheet', or combos like 'csv+gspreadsheet'.")
-    
-    #DEBUG: put the query into BigQuery to check that its valid if this bugs
-    # print(f"Query is: {query}")
+        print(f"Pulling all {query_type.upper()} files from folder '{folder_id}'")
 
-    results = service.files().list(q=query, fields="files(id, name, mimeType)").execute()
-    if len(results) == 0:
-        return []
-    raw_files = results.get("files", [])
+    fields = RV_FIELDS[rv]
+    if (reporting or name_keywords) and 'name' not in fields: # keywords are matched against names client side
+        fields = f"{fields}, name"
 
-    if name_keywords: # default behavior is to set this to none and just pull everything
-        assert all(isinstance(word, str) for word in name_keywords), f"not all inputted keywords to search for are strings: {name_keywords}"
-        lower_keywords = [kw.lower() for kw in name_keywords]
-        updated_raw_files = []
-        for f in raw_files:
-            name = f['name'].lower()
-            if any(kw in name for kw in lower_keywords): # check for name contains
-                updated_raw_files.append(f)
-        raw_files = updated_raw_files
+    raw_files = list(iter_files(service, folder_id, query_type=query_type, fields=fields, name_keywords=name_keywords))
 
     if rv == 'PATH':
         files = [f"https://drive.google.com/uc?id={file['id']}" for file in raw_files]
@@ -97,19 +150,212 @@ def list_files(folder_id, query_type='ALL', rv='ID', name_keywords: Iterable[str
             'id': file['id'],
             'name': file['name'],
             'mimeType': file.get('mimeType'),
+            'md5Checksum': file.get('md5Checksum'),
+            'modifiedTime': file.get('modifiedTime'),
+            'headRevisionId': file.get('headRevisionId'),
             'path': f"https://drive.google.com/uc?id={file['id']}"
         } for file in raw_files]
     elif rv == 'FILE':
         files = raw_files
-    else:
-        raise ValueError(f"Unsupported return value '{rv}'.")
 
     if reporting:
         for f in raw_files:
-            print(f"Found file: {f['name']} (ID: {f['id']})")
+            print(f"Found file: {f['name']} (ID: {f.get('id')})")
         print(f"Process complete. Total files found: {len(files)}")
     return files
 
+def execute_batched(service, requests: Iterable[tuple[str, object]], batch_size=DRIVE_BATCH_SIZE) -> dict[str, tuple[dict, Exception]]:
+    """
+    Runs unexecuted Drive API requests (eg. service.files().update(...)) through the batch endpoint, up to 'batch_size' per HTTP round trip.
+    A failed call doesn't stop the rest of its batch, every call gets its own result.
+
+    requests (Iterable[tuple[str, HttpRequest]]): (key, request) pairs, keys must be unique.
+
+    Returns:
+    - dict[key] = (response, None) for calls that succeeded or (None, error) for calls that failed, in the same order as 'requests'
+    """
+    requests = list(requests)
+    results = {key: (None, None) for key, _ in requests}
+    if len(results) != len(requests):
+        raise ValueError("execute_batched request keys must be unique")
+
+    def callback(request_id, response, exception):
+        results[request_id] = (None, exception) if exception is not None else (response, None)
+
+    for start in range(0, len(requests), batch_size):
+        batch = service.new_batch_http_request(callback=callback)
+        for key, request in requests[start:start + batch_size]:
+            batch.add(request, request_id=key)
+        try:
+            batch.execute()
+        except Exception as e: # the whole round trip failed, fail every call in it that didn't already report back
+            for key, _ in requests[start:start + batch_size]:
+                if results[key] == (None, None):
+                    results[key] = (None, e)
+    return results
+
+NUMBERED_NAME = re.compile(r"^(.*) \((\d+)\)$") # 'ABSA-FY25-GF (3)' --> 'ABSA-FY25-GF', '3'
+
+class FolderNameIndex:
+    """
+    In-memory index of the file names in one or more drive folders, built from one paginated listing per folder.
+    Gives O(1) name checks and hands out numbered names ('name (1)', 'name (2)', ...) from a per-name counter instead of
+    probing the folder. Callers update it as they create, move or rename files so it stays in step with the drive
+    for the rest of a push.
+
+    listings (dict[str, Iterable[dict]]): folder id -> file metadata dictionaries with 'name' and optionally 'id' and 'appProperties'.
+    """
+    def __init__(self, listings: dict[str, Iterable[dict]]):
+        self._names = {} # folder id -> {name: file id}, file id is None for names reserved but not yet uploaded
+        self._counters = {} # (folder id, base name) -> next suffix to try
+        self._properties = {} # (folder id, name) -> the file's appProperties
+        for folder_id, files in listings.items():
+            self._names.setdefault(folder_id, {})
+            for f in files:
+                self.add(folder_id, f['name'], f.get('id'), f.get('appProperties'))
+
+    @classmethod
+    def from_drive(cls, service, folder_ids: Iterable[str], page_size=DEFAULT_PAGE_SIZE) -> "FolderNameIndex":
+        return cls({}).list_from_drive(service, folder_ids, page_size=page_size)
+
+    def list_from_drive(self, service, folder_ids: Iterable[str], page_size=DEFAULT_PAGE_SIZE) -> "FolderNameIndex":
+        """Lists and indexes the given folders that aren't indexed yet, so an index shared across pushes only lists each folder once."""
+        for folder_id in dict.fromkeys(folder_ids):
+            if not self.listed(folder_id):
+                self._names.setdefault(folder_id, {})
+                for f in iter_files(service, folder_id, fields="id, name, appProperties", page_size=page_size):
+                    self.add(folder_id, f['name'], f.get('id'), f.get('appProperties'))
+        return self
+
+    def listed(self, folder_id) -> bool:
+        """Whether the folder is indexed (listed from drive or given a listing)."""
+        return folder_id in self._names
+
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        folder_id, name = item
+        return name in self._names.get(folder_id, {})
+
+    def names(self, folder_id) -> set[str]:
+        return set(self._names.get(folder_id, {}))
+
+    def file_id(self, folder_id, name) -> str | None:
+        """Returns the id of the file with this name in the folder, None if there isn't one (or it hasn't been uploaded yet)."""
+        return self._names.get(folder_id, {}).get(name)
+
+    def app_properties(self, folder_id, name) -> dict:
+        """Returns the appProperties (eg. the content hash drive_push stores) of the file with this name in the folder."""
+        return self._properties.get((folder_id, name), {})
+
+    def add(self, folder_id, name, file_id=None, app_properties=None) -> None:
+        """Records a file (or a reserved name) in a folder. Doesn't replace the id of a name that's already indexed with one."""
+        folder = self._names.setdefault(folder_id, {})
+        if folder.get(name) is None:
+            folder[name] = file_id
+            if app_properties:
+                self._properties[(folder_id, name)] = app_properties
+        numbered = NUMBERED_NAME.match(name)
+        if numbered:
+            key = (folder_id, numbered.group(1))
+            self._counters[key] = max(self._counters.get(key, 1), int(numbered.group(2)) + 1)
+
+    def remove(self, folder_id, name) -> None:
+        self._names.get(folder_id, {}).pop(name, None)
+        self._properties.pop((folder_id, name), None)
+
+    def move(self, name, from_folder_id, to_folder_id, new_name=None) -> None:
+        """Records a file moving between folders, and being renamed to 'new_name' if given."""
+        file_id, app_properties = self.file_id(from_folder_id, name), self.app_properties(from_folder_id, name)
+        self.remove(from_folder_id, name)
+        self.add(to_folder_id, new_name if new_name is not None else name, file_id, app_properties)
+
+    def unique_name(self, folder_id, base_name) -> str:
+        """Returns 'base_name' if it's free in the folder, otherwise the next free 'base_name (n)'. Doesn't reserve it."""
+        if (folder_id, base_name) not in self:
+            return base_name
+        count = self._counters.get((folder_id, base_name), 1)
+        while (folder_id, f"{base_name} ({count})") in self: # only skips names that were indexed out of order
+            count += 1
+        self._counters[(folder_id, base_name)] = count
+        return f"{base_name} ({count})"
+
+    def reserve(self, folder_id, base_name) -> str:
+        """Returns a unique name like unique_name and records it in the folder so the next caller gets a different one."""
+        name = self.unique_name(folder_id, base_name)
+        self.add(folder_id, name)
+        return name
+
+# ----------------------------
+# Upload Handlers
+# ----------------------------
+
+class DataFrameMediaUpload(MediaUpload):
+    """
+    Resumable upload body that serialises a DataFrame while it's being uploaded instead of encoding the whole file up front.
+    Rows are encoded 'chunk_rows' at a time into a sliding window that starts at the last byte Drive acknowledged, so a
+    failed chunk can be re-sent but memory stays around two upload chunks no matter how big the file is.
+
+    The size is unknown until the frame is fully encoded. The window always reads one chunk ahead so the size is known
+    by the time the last chunk is sent, Drive requires the final chunk to carry the total size.
+    The bytes are hashed as they're encoded, content_hash() gives the same value as Format_Helpers.hash_dataframe once the upload is done.
+
+    fmt (str): 'csv', 'csv.gz' or 'parquet', see Format_Helpers.
+    chunksize (int): Upload chunk size in bytes, a multiple of 256 KiB.
+    """
+    def __init__(self, df: pd.DataFrame, fmt: str = 'csv', chunksize: int = 8 * 1024 * 1024, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self._mimetype = get_output_format(fmt)['content_type']
+        self._chunksize = chunksize
+        self._pieces = iter_dataframe_bytes(df, fmt, chunk_rows)
+        self._window = bytearray()
+        self._window_start = 0 # file offset of the first byte in the window
+        self._size = None
+        self._digest = hashlib.sha256()
+        self._fill(chunksize + 1) # files that fit in one chunk are fully encoded here
+
+    def _fill(self, end: int) -> None:
+        """Encodes rows until the window reaches file offset 'end' or the frame runs out."""
+        while self._size is None and self._window_start + len(self._window) < end:
+            piece = next(self._pieces, None)
+            if piece is None:
+                self._size = self._window_start + len(self._window)
+            else:
+                self._window += piece
+                self._digest.update(piece)
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return self._size
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return False
+
+    def getbytes(self, begin, length):
+        if begin < self._window_start:
+            raise ValueError(f"Bytes from {begin} were already released, the upload can only resume from byte {self._window_start}")
+        del self._window[:begin - self._window_start] # drive has acknowledged everything before 'begin'
+        self._window_start = begin
+        self._fill(begin + 2 * length + 1) # read the next chunk ahead so the last one is sent with the total size
+        return bytes(self._window[:length])
+
+    def read_all(self) -> bytes:
+        """Encodes the rest of the frame and returns the whole file, for single request uploads."""
+        self._fill(float('inf'))
+        return self.getbytes(0, self._size)
+
+    def content_hash(self) -> str | None:
+        """sha256 of the whole file, None until every row has been encoded."""
+        return None if self._size is None else f"sha256:{self._digest.hexdigest()}"
+
+    def to_json(self):
+        raise NotImplementedError("DataFrameMediaUpload can't be serialised")
+
 # ----------------------------
 # Download Handlers
 # ----------------------------
@@ -125,20 +371,48 @@ def download_file_buffer(request):
     return file_buffer
 
 
-def download_csv(file_id, service) -> pd.DataFrame:
+def download_cached(request, file_id, version=None, variant="media") -> io.BytesIO:
+    """
+    Download helper that serves the file from the local DriveCache when this exact version was downloaded before.
+    version (str): Version token from Drive_Cache.file_version. If None the cache is bypassed.
+    variant (str): Distinguishes different renderings of the same file version (eg. export MIME types).
+    """
+    if version is None:
+        return download_file_buffer(request)
+
+    cache = get_drive_cache()
+    key = cache.key(file_id, version, variant)
+    data = cache.get(key)
+    if data is not None:
+        return io.BytesIO(data)
+
+    buffer = download_file_buffer(request) # only new or changed files reach the network
+    cache.put(key, buffer.getvalue())
+    return buffer
+
+def download_csv(file_id, service, version=None) -> pd.DataFrame:
     request = service.files().get_media(fileId=file_id)
-    buffer = download_file_buffer(request)
+    buffer = download_cached(request, file_id, version=version)
     return pd.read_csv(buffer)
 
-def download_any_spreadsheet(file_id, mime_type, service, output='both') -> str:
+def download_dataframe(file_id, mime_type, service, version=None) -> pd.DataFrame:
+    """Downloads a cleaned output written in any of the Format_Helpers output formats (csv, csv.gz or parquet), picked by its MIME type."""
+    fmt = format_from_mimetype(mime_type)
+    request = service.files().get_media(fileId=file_id)
+    buffer = download_cached(request, file_id, version=version)
+    return read_dataframe(buffer, fmt)
+
+def download_any_spreadsheet(file_id, mime_type, service, output='both', version=None) -> str:
     if mime_type == 'application/vnd.google-apps.spreadsheet':
         request = service.files().export_media(fileId=file_id, mimeType='text/csv')
+        variant = 'export:text/csv'
     elif mime_type == 'text/csv':
         request = service.files().get_media(fileId=file_id)
+        variant = 'media'
     else:
         raise ValueError(f"Unsupported MIME type '{mime_type}' for csv export.")
     
-    buffer = download_file_buffer(request)
+    buffer = download_cached(request, file_id, version=version, variant=variant)
     match output.lower():
         case 'both':
             buffer.seek(0)
@@ -153,13 +427,15 @@ def download_any_spreadsheet(file_id, mime_type, service, output='both') -> str:
         case _:
             raise ValueError(f"output type not supported {output}")
 
-def download_text(file_id, mime_type, service) -> str:
+def download_text(file_id, mime_type, service, version=None) -> str:
     if mime_type == 'application/vnd.google-apps.document':
         request = service.files().export_media(fileId=file_id, mimeType='text/plain')
+        variant = 'export:text/plain'
     elif mime_type == 'text/plain':
         request = service.files().get_media(fileId=file_id)
+        variant = 'media'
     else:
         raise ValueError(f"Unsupported MIME type '{mime_type}' for text export.")
     
-    buffer = download_file_buffer(request)
-    return buffer.read().decode('utf-8')
\ No newline at end of file
+    buffer = download_cached(request, file_id, version=version, variant=variant)
+    return buffer.read().decode('utf-8')
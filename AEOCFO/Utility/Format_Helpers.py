@@ -0,0 +1,131 @@
+import io
+import gzip
+import zlib
+import hashlib
+from collections.abc import Iterator
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Serialisation formats cleaned outputs can be written in
+OUTPUT_FORMATS = {
+    'csv': {'extension': '.csv', 'content_type': 'text/csv'},
+    'csv.gz': {'extension': '.csv.gz', 'content_type': 'application/gzip'},
+    'parquet': {'extension': '.parquet', 'content_type': 'application/vnd.apache.parquet'}
+}
+
+DEFAULT_CHUNK_ROWS = 10000 # rows serialised at a time
+
+def get_output_format(fmt: str) -> dict:
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}'. Must be one of {list(OUTPUT_FORMATS.keys())}")
+    return OUTPUT_FORMATS[fmt]
+
+def format_from_mimetype(mime_type: str) -> str:
+    """Returns the output format ('csv', 'csv.gz' or 'parquet') a file with this MIME type was written in."""
+    for fmt, spec in OUTPUT_FORMATS.items():
+        if spec['content_type'] == mime_type:
+            return fmt
+    raise ValueError(f"Unsupported MIME type '{mime_type}'. Must be one of {[spec['content_type'] for spec in OUTPUT_FORMATS.values()]}")
+
+def read_dataframe(f, fmt: str = 'csv') -> pd.DataFrame:
+    """Reads a dataframe back from a binary file-like object written by write_dataframe. Parquet keeps the column types."""
+    get_output_format(fmt)
+    match fmt:
+        case 'csv':
+            return pd.read_csv(f)
+        case 'csv.gz':
+            return pd.read_csv(f, compression='gzip')
+        case 'parquet':
+            return pd.read_parquet(f)
+
+def write_dataframe(df: pd.DataFrame, f, fmt: str = 'csv', chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """
+    Serialises a dataframe into a binary file-like object (eg. a GCS blob writer) 'chunk_rows' rows at a time,
+    so the whole file is never held in memory as one string. The file object is left open.
+    fmt (str): 'csv', 'csv.gz' or 'parquet'
+    """
+    get_output_format(fmt)
+    match fmt:
+        case 'csv':
+            _write_csv(df, f, chunk_rows)
+        case 'csv.gz':
+            with gzip.GzipFile(fileobj=f, mode='wb') as gz: # closing the gzip stream doesn't close f
+                _write_csv(df, gz, chunk_rows)
+        case 'parquet':
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), f, row_group_size=chunk_rows)
+
+def _write_csv(df: pd.DataFrame, f, chunk_rows: int) -> None:
+    text = io.TextIOWrapper(f, encoding='utf-8', newline='')
+    try:
+        df.to_csv(text, index=False, chunksize=chunk_rows)
+        text.flush()
+    finally:
+        text.detach() # hand f back without closing it
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object that keeps what's written to it until it's drained, so a writer can be read from in pieces."""
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.buffer += b
+        self.position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+def iter_dataframe_bytes(df: pd.DataFrame, fmt: str = 'csv', chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Generator that serialises a dataframe 'chunk_rows' rows at a time and yields the encoded bytes of each chunk,
+    so a consumer (eg. a chunked upload) only ever holds about one chunk of the file. The bytes joined together are the
+    same file write_dataframe writes ('csv.gz' aside, whose gzip header differs).
+    """
+    get_output_format(fmt)
+    sink = _DrainableSink()
+    match fmt:
+        case 'csv':
+            for data in _iter_csv(df, sink, chunk_rows):
+                yield data
+        case 'csv.gz':
+            compressor = zlib.compressobj(wbits=31) # gzip container with a fixed header
+            for data in _iter_csv(df, sink, chunk_rows):
+                yield compressor.compress(data)
+            yield compressor.flush()
+        case 'parquet':
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pq.ParquetWriter(sink, table.schema) as writer:
+                for start in range(0, max(table.num_rows, 1), chunk_rows):
+                    writer.write_table(table.slice(start, chunk_rows), row_group_size=chunk_rows)
+                    yield sink.drain()
+            yield sink.drain() # footer
+
+def _iter_csv(df: pd.DataFrame, sink: _DrainableSink, chunk_rows: int) -> Iterator[bytes]:
+    text = io.TextIOWrapper(sink, encoding='utf-8', newline='')
+    try:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+            text.flush()
+            yield sink.drain()
+    finally:
+        text.detach()
+
+def hash_dataframe(df: pd.DataFrame, fmt: str = 'csv', chunk_rows: int = DEFAULT_CHUNK_ROWS) -> str:
+    """
+    Returns the sha256 of a dataframe serialised as iter_dataframe_bytes encodes it, without holding the serialised file in memory.
+    Frames that would produce the same bytes get the same hash across runs (the gzip header is written without a timestamp).
+    """
+    digest = hashlib.sha256()
+    for data in iter_dataframe_bytes(df, fmt, chunk_rows):
+        digest.update(data)
+    return f"sha256:{digest.hexdigest()}"
@@ -1,6 +1,9 @@
+import re
 import numpy as np
 import pandas as pd
+from bisect import bisect_left
 from collections.abc import Iterable
+from functools import lru_cache
 # import spacy
 # nlp_model = spacy.load("en_core_web_md")
 from sklearn.metrics.pairwise import cosine_similarity 
@@ -186,6 +189,150 @@ def _get_loc_wrapper(df, index_iter, elem=None):
             except Exception as e:
                 raise e
 
+class KeywordMatcher:
+    """
+    Compiled 'contains' matcher for heading_finder's ending values.
+    Literal keywords are escaped and compiled into one alternation, so a list like ['Total (GF)', 'SUBTOTAL'] matches the text as written.
+    Only string cells can match, the same as pandas' str.contains over an object column.
+    """
+    def __init__(self, keywords: Iterable[str], literal: bool = True):
+        self.keywords = tuple(str(keyword) for keyword in keywords)
+        self.pattern = re.compile('|'.join(re.escape(keyword) if literal else keyword for keyword in self.keywords))
+
+    def search(self, value) -> bool:
+        return isinstance(value, str) and self.pattern.search(value) is not None
+
+    def scan(self, values, start: int = 0, limit: int = None) -> list[int]:
+        """Row positions from 'start' onwards whose value matches, stopping as soon as 'limit' matches are found (None scans to the end)."""
+        found = []
+        search = self.pattern.search
+        for i in range(max(start, 0), len(values)):
+            value = values[i]
+            if isinstance(value, str) and search(value) is not None:
+                found.append(i)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+@lru_cache(maxsize=256)
+def _compiled_matcher(keywords: tuple, literal: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, literal=literal)
+
+def keyword_matcher(end) -> KeywordMatcher:
+    """
+    Cached KeywordMatcher for a heading_finder 'contains' ending value, or None if 'end' isn't a string or an iterable of keywords.
+    A single string keeps being treated as a regular expression; the keywords of an iterable are matched literally.
+    """
+    if isinstance(end, str):
+        return _compiled_matcher((end,), False)
+    elif isinstance(end, Iterable) and not isinstance(end, bytes):
+        return _compiled_matcher(tuple(str(keyword) for keyword in end), True)
+    return None
+
+def _start_mask(normalised: pd.Series, start, logic: str = 'exact') -> pd.Series:
+    """Boolean mask of the rows of a stripped string column equal to ('exact') or containing ('contains') 'start'."""
+    if logic == 'exact':
+        return normalised == str(start)
+    elif logic == 'contains':
+        return normalised.str.contains(str(start), regex=False, na=False)
+    raise ValueError("Invalid 'start_logic'. Use 'exact' or 'contains'.")
+
+def _end_mask(column: pd.Series, end, logic: str = 'exact') -> pd.Series:
+    """Boolean mask of the rows matching an ending value the way heading_finder matches 'end', for values keyword_matcher doesn't handle."""
+    if logic not in ('exact', 'contains'):
+        raise ValueError("Invalid 'end_logic'. Use 'exact' or 'contains'.")
+    if isinstance(end, Iterable) and not isinstance(end, (str, bytes)):
+        return column.isin(tuple(end))
+    elif isinstance(end, str):
+        return column == end
+    elif logic == 'exact': # brute force try to convert dataframe and 'end' input into a string to match
+        return column.astype(str) == str(end)
+    return column.fillna('').astype(str).str.contains(str(end), na=False)
+
+class PreparedSheet:
+    """
+    Read-only view over a DataFrame for running many heading_finder lookups against the same sheet.
+    The stripped string form of each searched column and a hash index from each cell value to the rows it occurs in are computed
+    the first time a column is searched and reused afterwards, as are the rows matched by every 'contains' search.
+    Building the index costs more than one vectorised search, so only wrap a sheet that will be searched several times.
+    Pass it to heading_finder (or section_index) in place of the DataFrame. Don't mutate 'df' while the sheet is in use.
+    """
+    def __init__(self, df: pd.DataFrame):
+        assert isinstance(df, pd.DataFrame), f"PreparedSheet wraps a DataFrame, not {type(df)}"
+        self.df = df
+        self._normalised = {} # column position -> df.iloc[:, col].astype(str).str.strip()
+        self._values = {} # column position -> raw cell values
+        self._indexes = {} # (column position, stripped or raw) -> {cell value: [row positions]}
+        self._matches = {} # (column position, search kind, value) -> [row positions]
+
+    def col_index(self, col) -> int:
+        return self.df.columns.get_loc(col) if isinstance(col, str) else col
+
+    def values(self, col_index: int) -> np.ndarray:
+        if col_index not in self._values:
+            self._values[col_index] = self.df.iloc[:, col_index].to_numpy()
+        return self._values[col_index]
+
+    def normalised(self, col_index: int) -> pd.Series:
+        if col_index not in self._normalised:
+            self._normalised[col_index] = self.df.iloc[:, col_index].astype(str).str.strip()
+        return self._normalised[col_index]
+
+    def value_index(self, col_index: int, stripped: bool = True) -> dict[str, list[int]]:
+        """Hash index from cell value (stripped string, or raw string cells only) to the row positions holding it."""
+        key = (col_index, stripped)
+        if key not in self._indexes:
+            values = self.normalised(col_index).tolist() if stripped else self.df.iloc[:, col_index].tolist()
+            index = {}
+            for i, value in enumerate(values):
+                if stripped or isinstance(value, str):
+                    index.setdefault(value, []).append(i)
+            self._indexes[key] = index
+        return self._indexes[key]
+
+    def _memo(self, col_index: int, kind: str, value, compute) -> list[int]:
+        key = (col_index, kind, value)
+        if key not in self._matches:
+            self._matches[key] = np.flatnonzero(compute()).tolist()
+        return self._matches[key]
+
+    def start_rows(self, col_index: int, start, logic: str = 'exact') -> list[int]:
+        """Row positions whose stripped value equals ('exact') or contains ('contains') 'start'."""
+        if logic == 'exact':
+            return self.value_index(col_index).get(str(start), [])
+        elif logic == 'contains':
+            return self._memo(col_index, 'contains', str(start), lambda: _start_mask(self.normalised(col_index), start, logic).to_numpy())
+        raise ValueError("Invalid 'start_logic'. Use 'exact' or 'contains'.")
+
+    def end_rows(self, col_index: int, end, logic: str = 'exact') -> list[int]:
+        """Row positions matching an ending value (a string, or an iterable of values) the way heading_finder matches 'end'."""
+        if logic not in ('exact', 'contains'):
+            raise ValueError("Invalid 'end_logic'. Use 'exact' or 'contains'.")
+        matcher = keyword_matcher(end) if logic == 'contains' else None
+        if matcher is not None:
+            key = (col_index, 'contains', matcher.pattern.pattern)
+            if key not in self._matches:
+                self._matches[key] = matcher.scan(self.values(col_index))
+            return self._matches[key]
+        elif isinstance(end, str): # exact
+            return self.value_index(col_index, stripped=False).get(end, [])
+        if isinstance(end, Iterable) and not isinstance(end, bytes):
+            end = tuple(end)
+        return self._memo(col_index, f"end {logic}", end if isinstance(end, tuple) else str(end), lambda: _end_mask(self.df.iloc[:, col_index], end, logic).to_numpy(dtype=bool))
+
+    def next_end_rows(self, col_index: int, end, logic: str = 'exact', start: int = 0, count: int = None) -> list[int]:
+        """
+        The first 'count' row positions at or after 'start' matching an ending value (all of them if 'count' is None).
+        'contains' searches over a string or keywords scan forward from 'start' and stop at the count-th hit, so finding a section's end
+        costs the length of the section rather than the sheet. Results the sheet has already computed for the whole column are reused.
+        """
+        matcher = keyword_matcher(end) if logic == 'contains' else None
+        if matcher is None or (col_index, 'contains', matcher.pattern.pattern) in self._matches:
+            rows = self.end_rows(col_index, end, logic=logic)
+            rows = rows[bisect_left(rows, start):]
+            return rows if count is None else rows[:count]
+        return matcher.scan(self.values(col_index), start, limit=count)
+
 def heading_finder(df, start_col, start, nth_start = 0, shift = 0, start_logic = 'exact', end_col = None, end = None, nth_end = 0, end_logic = 'exact') -> pd.DataFrame:
     """
     Non-destructively adjusts the DataFrame to start at the correct header. Can also specify where to end the new outputted dataframe.
@@ -193,7 +340,8 @@ def heading_finder(df, start_col, start, nth_start = 0, shift = 0, start_logic =
     TLDR this is a fansy pands loc/iloc wrapper. 
 
     Parameters:
-    - df (pd.DataFrame): The input DataFrame.
+    - df (pd.DataFrame or PreparedSheet): The input DataFrame. A DataFrame is searched with one vectorised pass per call. Pass a
+        PreparedSheet instead when searching the same sheet several times so the searched columns are only normalised and indexed once.
     - start_col (str or int): Column index or name to search for the header.
     - start (str): The name of the header/string to look for in the 'start_col' column where we want to start the new dataframe.
     - nth_start (int): If there are multiple occurences of 'start' in 'start_col', begin our new dataframe at the 'nth_start' occurences of 'start' in 'col'.
@@ -202,7 +350,8 @@ def heading_finder(df, start_col, start, nth_start = 0, shift = 0, start_logic =
     
     - end_col (str or int): Column index or name to search for the ending value.
     - end (str, int, or list, optional): The ending value(s) or row index to limit the DataFrame. 
-        The row corresponding to the end value is excluded
+        The row corresponding to the end value is excluded. With 'contains' matching a list is matched as literal keywords
+        and a single string as a regular expression, scanning down from the start row only until the 'nth_end' match.
     - nth_end (int): If there are multiple occurences of 'end' in 'col' start at the 'nth_start' occurences of 'header' in 'col'.
 
     - start_logic (str, optional): Matching method for the `start` value. Default is exact matching.
@@ -213,6 +362,9 @@ def heading_finder(df, start_col, start, nth_start = 0, shift = 0, start_logic =
     Returns:
     - pd.DataFrame: The adjusted DataFrame starting from the located header and ending at the specified end.
     """
+    sheet = df if isinstance(df, PreparedSheet) else None
+    if sheet is not None:
+        df = sheet.df
     assert isinstance(start_col, str) or isinstance(start_col, int), "'start_col' must be index of column or name of column."
     assert in_df(start_col, df), 'Given start_col is not in the given df.'
 
@@ -225,29 +377,19 @@ def heading_finder(df, start_col, start, nth_start = 0, shift = 0, start_logic =
     start_col_index = df.columns.get_loc(start_col) if isinstance(start_col, str) else start_col #extract index of start and end column
     end_col_index = df.columns.get_loc(end_col) if isinstance(end_col, str) else end_col #extract index of start and end column
 
-
-    # print(f"start_col_index value: {start_col_index}")
-    # print(f"Label: {start}")
-    # print(f"Inputted index iter: {df[df.iloc[:, start_col_index].str.strip() == start].index}")
-    
-    if start_logic == 'exact':
-        matching_indices: pd.Index = df[df.iloc[:, start_col_index].astype(str).str.strip() == str(start)].index 
-    elif start_logic == 'contains':
-        matching_indices: pd.Index = df[df.iloc[:, start_col_index].astype(str).str.strip().str.contains(str(start), regex=False, na=False)].index 
-    else: 
-        raise ValueError("Invalid 'start_logic'. Use 'exact' or 'contains'.") 
-
-    if matching_indices.empty:
+    if sheet is not None:
+        matching_rows = sheet.start_rows(start_col_index, start, logic=start_logic)
+    else:
+        matching_rows = np.flatnonzero(_start_mask(df.iloc[:, start_col_index].astype(str).str.strip(), start, logic=start_logic).to_numpy())
+    if len(matching_rows) == 0:
         raise ValueError(f"Header '{start}' not found in column '{start_col}'.")
 
-    start_index: int = df.index.get_loc(matching_indices[nth_start]) #select nth_start if multiple matches with header exist
-
-    # print(f"type start: {type(start_index)}")
-    # print(f"type shift: {type(shift)}")
+    start_index = int(matching_rows[nth_start]) #select nth_start if multiple matches with header exist
     start_index = start_index + shift
     if start_index >= len(df):
         raise ValueError("Shifted start index exceeds DataFrame length.")
 
+    first_row = start_index if start_index >= 0 else max(len(df) + start_index, 0) # row position df.iloc[start_index:] starts at
     df = df.iloc[start_index:]
 
     if end is not None:
@@ -256,31 +398,18 @@ def heading_finder(df, start_col, start, nth_start = 0, shift = 0, start_logic =
                 return df.iloc[:end]
             raise ValueError("Ending index exceeds the remaining DataFrame length.")
 
-        elif isinstance(end, Iterable) and not isinstance(end, (str, bytes)): # if 'end' is a iterable containing values to end by we want to iterate through it
-            pattern = '|'.join(map(str, end))
-            if end_logic == 'exact':
-                end_matches = df[df.iloc[:, end_col_index].isin(end)].index
-            elif end_logic == 'contains':
-                end_matches = df[df.iloc[:, end_col_index].fillna('').str.contains(pattern, na=False)].index
-            else:
-                raise ValueError("Invalid 'end_logic'. Use 'exact' or 'contains'.")
-        elif isinstance(end, str):
-            if end_logic == 'exact':
-                end_matches = df[df.iloc[:, end_col_index] == str(end)].index
-            elif end_logic == 'contains':
-                end_matches = df[df.iloc[:, end_col_index].fillna('').str.contains(str(end), na=False)].index
-            else:
-                raise ValueError("Invalid 'end_logic'. Use 'exact' or 'contains'.")
-        else: # brute force try to convert dataframe and 'end' input into a string to match
-            if end_logic == 'exact':
-                end_matches = df[df.iloc[:, end_col_index].astype(str) == str(end)].index
-            elif end_logic == 'contains':
-                end_matches = df[df.iloc[:, end_col_index].fillna('').astype(str).str.contains(str(end), na=False)].index
-            else:
-                raise ValueError("Invalid 'end_logic'. Use 'exact' or 'contains'.")
-
-        if not end_matches.empty:
-            end_index = df.index.get_loc(end_matches[nth_end])
+        # only ends at or below the start count, and only as many as nth_end needs
+        count = nth_end + 1 if nth_end >= 0 else None
+        matcher = keyword_matcher(end) if end_logic == 'contains' else None
+        if sheet is not None:
+            end_matches = sheet.next_end_rows(end_col_index, end, logic=end_logic, start=first_row, count=count)
+        elif matcher is not None:
+            end_matches = matcher.scan(df.iloc[:, end_col_index].to_numpy(), 0, limit=count)
+            end_matches = [row + first_row for row in end_matches]
+        else:
+            end_matches = (np.flatnonzero(_end_mask(df.iloc[:, end_col_index], end, logic=end_logic).to_numpy(dtype=bool)) + first_row).tolist()
+        if end_matches:
+            end_index = end_matches[nth_end] - first_row
             rv = df.iloc[:end_index]
             rv_header = df.iloc[0,:]
             rv = rv[1:]
@@ -296,6 +425,59 @@ def heading_finder(df, start_col, start, nth_start = 0, shift = 0, start_logic =
     rv = rv.reset_index(drop=True)
     return rv
 
+def section_index(df, col, starts: Iterable[str], end: str) -> tuple[dict[str, int], list[int]]:
+    """
+    Scans column 'col' once and records where every section starts and where every section could end, so many sections can be
+    sliced out of one sheet (see section_slicer) without a heading_finder scan per section.
+    Matches the same rows heading_finder does with start_logic = 'exact' and end_logic = 'contains'.
+
+    Parameters:
+    - df (pd.DataFrame or PreparedSheet): The input DataFrame.
+    - col (str or int): Column index or name holding the section labels and terminators.
+    - starts (Iterable[str]): Section labels, matched exactly against the stripped cell value.
+    - end (str): Terminator marking the end of a section (eg. 'SUBTOTAL'), matched against string cells containing it.
+
+    Returns:
+    - dict[label] = row position of the label's first occurrence (labels that never occur are left out)
+    - sorted list of the row positions of every terminator
+    """
+    sheet = df if isinstance(df, PreparedSheet) else PreparedSheet(df)
+    assert isinstance(col, str) or isinstance(col, int), "'col' must be index of column or name of column."
+    assert in_df(col, sheet.df), 'Given col is not in the given df.'
+    col_index = sheet.col_index(col)
+
+    wanted = set(str(label) for label in starts)
+    start_rows, end_rows = {}, []
+    for i, (value, label) in enumerate(zip(sheet.df.iloc[:, col_index].tolist(), sheet.normalised(col_index).tolist())):
+        if isinstance(value, str) and end in value:
+            end_rows.append(i)
+        if label in wanted and label not in start_rows:
+            start_rows[label] = i
+    return start_rows, end_rows
+
+def section_slicer(df, index: tuple[dict[str, int], list[int]], start: str, shift = 0) -> pd.DataFrame:
+    """
+    Slices one section out of a sheet indexed by section_index, returning the same DataFrame heading_finder would for
+    heading_finder(df, col, start, shift = shift, end = end, start_logic = 'exact', end_logic = 'contains').
+    The section runs from its (shifted) label row, which becomes the header, up to the first terminator at or after it.
+    """
+    start_rows, end_rows = index
+    if start not in start_rows:
+        raise ValueError(f"Header '{start}' not found in the indexed column.")
+    start_index = start_rows[start] + shift
+    if start_index >= len(df):
+        raise ValueError("Shifted start index exceeds DataFrame length.")
+
+    next_end = bisect_left(end_rows, start_index) # first terminator at or after the section's start
+    if next_end == len(end_rows):
+        raise ValueError(f"No end value found after header '{start}'.")
+    rv = df.iloc[start_index:end_rows[next_end]]
+    rv_header = df.iloc[start_index, :]
+    rv = rv[1:]
+    rv.columns = rv_header.values # so the index of the extracted row doesn't get set as the index label 
+    rv = rv.reset_index(drop=True)
+    return rv
+
 def ending_keyword_adder(df, given_start = 'Appx', start_col = 0, adding_end_keyword='END', end_col = 0, alphabet=None, reporting=False) -> pd.DataFrame:
     """Non-mutatively adds 'end_keyword' to signify end of a section for FR documents. Also shifts the dataframe down and updates the columns."""
     assert isinstance(start_col, str) or isinstance(start_col, int), "'start_col' must be index of column or name of column."
@@ -1,5 +1,7 @@
 from .Cleaning import is_valid_iter, is_type, in_df, any_in_df
 from .Utils import *
 from .Drive_Helpers import *
+from .Drive_Cache import DriveCache, get_drive_cache, get_bigquery_cache, file_version
 from .Logger_Utils import *
-from .BQ_Helpers import *
\ No newline at end of file
+from .BQ_Helpers import *
+from .Format_Helpers import *
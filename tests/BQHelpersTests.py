@@ -0,0 +1,286 @@
+import unittest
+import os
+import tempfile
+import importlib.util
+from unittest import mock
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from AEOCFO.Utility.BQ_Helpers import clean_name, resolve_bq_columns, to_arrow_table, name_columns, build_merge_query, build_replace_sources_query
+from AEOCFO.Load import BQ_Push
+from AEOCFO.Extract.BQ_Pull import _tables_version
+from AEOCFO.Config.BQ_Config import get_bq_schema, get_merge_config, get_run_metadata_columns
+
+class TestResolveBQColumns(unittest.TestCase):
+    def test_known_and_default_types(self):
+        schema = {'Columns': {'Amount Allocated': 'FLOAT64'}, 'Default Type': 'STRING'}
+        resolved = resolve_bq_columns(['Organization Name', 'Amount Allocated'], schema)
+        self.assertEqual(resolved, [('Organization Name', 'Organization_Name', 'STRING'),
+                                    ('Amount Allocated', 'Amount_Allocated', 'FLOAT64')])
+
+    def test_colliding_names_raise(self):
+        with self.assertRaises(ValueError):
+            resolve_bq_columns(['Org Name', 'Org_Name'], {'Columns': {}, 'Default Type': 'STRING'})
+
+    def test_unlisted_columns_keep_numeric_types(self):
+        df = pd.DataFrame({'Organization': ['Club A', 'Club B'], 'FY25 Budget': [1234.0, 50.5], 'Members': [10, 12], 'Notes': ['1', '2']})
+        resolved = resolve_bq_columns(df.columns, get_bq_schema('ABSA'), dtypes=dict(df.dtypes))
+        self.assertEqual([bq_type for _, _, bq_type in resolved], ['STRING', 'FLOAT64', 'INT64', 'STRING'])
+        table = to_arrow_table(df, resolved)
+        self.assertEqual(table.column('FY25_Budget').to_pylist(), [1234.0, 50.5])
+
+    def test_unregistered_type_defaults_to_string(self):
+        self.assertEqual(get_bq_schema('ACCOUNTS'), {'Columns': {}, 'Default Type': 'STRING'})
+
+class TestToArrowTable(unittest.TestCase):
+    def test_contingency_types(self):
+        df = pd.DataFrame({
+            'Organization Name': ['Club A', 'Club B', 'Club C'],
+            'Ficomm Decision': ['Approved', 'Denied', 'Approved'],
+            'Amount Allocated': ['300', np.nan, 150],
+            'Date': ['04/12/2024'] * 3
+        })
+        table = to_arrow_table(df, resolve_bq_columns(df.columns, get_bq_schema('CONTINGENCY')))
+        self.assertEqual(table.column_names, ['Organization_Name', 'Ficomm_Decision', 'Amount_Allocated', 'Date'])
+        self.assertEqual(table.schema.field('Amount_Allocated').type, pa.float64())
+        self.assertEqual(table.schema.field('Date').type, pa.date32())
+        self.assertEqual(table.column('Amount_Allocated').to_pylist(), [300.0, None, 150.0])
+
+    def test_mixed_object_column_loads_as_string(self):
+        df = pd.DataFrame({'Org Name': ['Club A', 12, None]})
+        table = to_arrow_table(df, resolve_bq_columns(df.columns, get_bq_schema('FR')))
+        self.assertEqual(table.column('Org_Name').to_pylist(), ['Club A', '12', None])
+
+    def test_dataframe_is_untouched(self):
+        df = pd.DataFrame({'Blue Heart': [True, False], 'Active': [1, 0]})
+        to_arrow_table(df, resolve_bq_columns(df.columns, get_bq_schema('OASIS')))
+        self.assertEqual(list(df.columns), ['Blue Heart', 'Active'])
+        self.assertEqual(df['Active'].dtype, np.int64)
+
+    def test_constant_columns(self):
+        df = pd.DataFrame({'Org Name': ['Club A', 'Club B']})
+        constants = {'Date': '04/12/2024', 'FR Number': 'S09'}
+        table = to_arrow_table(df, resolve_bq_columns(list(df.columns) + list(constants), get_bq_schema('FR')), constants)
+        self.assertEqual(table.column_names, ['Org_Name', 'Date', 'FR_Number'])
+        self.assertEqual(table.column('FR_Number').to_pylist(), ['S09', 'S09'])
+
+    def test_run_metadata_columns(self):
+        df = pd.DataFrame({'Organization Name': ['Club A']})
+        constants = {'Source File': 'OASIS-FY25-GF', 'Loaded At': pd.Timestamp('2025-04-12 10:00', tz='UTC'), 'Fiscal Year': '25'}
+        table = to_arrow_table(df, resolve_bq_columns(list(df.columns) + list(constants), dict(get_bq_schema('OASIS'), Columns=dict(get_bq_schema('OASIS')['Columns'], **get_run_metadata_columns()))), constants)
+        self.assertEqual(table.schema.field('Loaded_At').type, pa.timestamp('us', tz='UTC'))
+        self.assertEqual(table.column('Fiscal_Year').to_pylist(), [25])
+
+class TestMerge(unittest.TestCase):
+    def test_name_columns(self):
+        _, _, patterns = get_merge_config('FR')
+        self.assertEqual(name_columns('Ficomm-Reso-FY25-04/12/2024-S09-GF', patterns), {'Date': '04/12/2024', 'FR Number': 'S09'})
+        self.assertEqual(name_columns('Ficomm-Reso-FY25-GF', patterns), {})
+
+    def test_no_merge_keys_raise(self):
+        with self.assertRaises(ValueError):
+            get_merge_config('FICCOMBINE')
+
+    def test_merge_query(self):
+        query = build_merge_query('p.d.FR_ALL', 'p.d._staging', ['Org_Name', 'Date', 'Amount'], ['Org_Name', 'Date'], '_batch_index')
+        self.assertIn("MERGE `p.d.FR_ALL` T", query)
+        self.assertIn("PARTITION BY `Org_Name`, `Date` ORDER BY `_batch_index` DESC", query)
+        self.assertIn("WHEN MATCHED THEN UPDATE SET `Amount` = S.`Amount`", query)
+        self.assertIn("INSERT (`Org_Name`, `Date`, `Amount`)", query)
+
+    def test_merge_query_missing_key(self):
+        with self.assertRaises(ValueError):
+            build_merge_query('p.d.T', 'p.d.S', ['Org_Name'], ['Org_Name', 'Date'], '_batch_index')
+
+class FakeJob:
+    num_dml_affected_rows = 0
+    def result(self):
+        return self
+
+class FakeBQClient:
+    """Records the jobs bigquery_push submits instead of running them."""
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.loads = []
+        self.queries = []
+        self.copies = []
+    def get_table(self, table_ref):
+        from google.api_core.exceptions import NotFound
+        from google.cloud import bigquery
+        if table_ref not in self.existing:
+            raise NotFound(table_ref)
+        return bigquery.Table(table_ref)
+    def copy_table(self, source, destination, job_config=None):
+        self.copies.append((source, destination, job_config.operation_type))
+        return FakeJob()
+    def create_table(self, table, exists_ok=False):
+        self.existing.add(f"{table.project}.{table.dataset_id}.{table.table_id}")
+        return table
+    def update_table(self, table, fields):
+        return table
+    def query(self, query, job_config=None):
+        self.queries.append(query)
+        return FakeJob()
+    def load_table_from_file(self, buffer, table_ref, job_config=None):
+        self.loads.append((table_ref, pq.read_table(buffer), job_config))
+        return FakeJob()
+    def delete_table(self, table_ref, not_found_ok=False):
+        self.existing.discard(table_ref)
+
+class TestMergeLoad(unittest.TestCase):
+    def test_nothing_to_stage(self):
+        client = FakeBQClient(existing=['ocfo-primary.FR.FR_ALL'])
+        empty = pd.DataFrame({'Org Name': pd.Series([], dtype=object)})
+        with mock.patch.object(BQ_Push, 'get_cached_bigquery_client', return_value=client):
+            self.assertEqual(BQ_Push.bigquery_push('FR', [], [], 'FR', duplicate_handling='merge'), {'FR_ALL': 0})
+            self.assertEqual(BQ_Push.bigquery_push('FR', [empty], ['Ficomm-Reso-FY25-04/12/2024-S09-GF'], 'FR', duplicate_handling='merge'), {'FR_ALL': 0})
+        self.assertEqual(client.loads, [])
+        self.assertEqual(client.queries, [])
+        self.assertEqual(client.copies, []) # the target isn't archived when nothing is merged into it
+
+class TestStagedLoad(unittest.TestCase):
+    def test_local_stage_single_load(self):
+        from AEOCFO.Load import BQ_Push
+        from AEOCFO.Load.GCP_Push import LocalStage
+        client = FakeBQClient()
+        original = BQ_Push.get_cached_bigquery_client
+        BQ_Push.get_cached_bigquery_client = lambda project_id: client
+        try:
+            with tempfile.TemporaryDirectory() as root:
+                dfs = [pd.DataFrame({'Organization Name': ['Club A', 'Club B'], 'Amount Allocated': [100, 200], 'Date': ['04/12/2024'] * 2}),
+                       pd.DataFrame({'Organization Name': ['Club C'], 'Ficomm Decision': ['Approved'], 'Amount Allocated': [50], 'Date': ['04/19/2024']})]
+                names = ['Ficomm-Cont-FY25-04/12/2024-GF', 'Ficomm-Cont-FY25-04/19/2024-GF']
+                rv = BQ_Push.bigquery_push('CONTINGENCY', dfs, names, 'CONTINGENCY', duplicate_handling='consolidate', stage=LocalStage(root))
+
+                staged = [os.path.join(dirpath, f) for dirpath, _, files in os.walk(root) for f in files]
+                self.assertEqual(len(staged), 2)
+                self.assertTrue(all(path.endswith('.parquet') for path in staged))
+                self.assertEqual(len({tuple(pq.read_schema(path).names) for path in staged}), 1) # staged files share one schema
+        finally:
+            BQ_Push.get_cached_bigquery_client = original
+
+        self.assertEqual(rv, {'CONTINGENCY_ALL': 3})
+        self.assertEqual(len(client.loads), 1)
+        table_ref, table, _ = client.loads[0]
+        self.assertTrue(table_ref.startswith('ocfo-primary.CONTINGENCY._staging_CONTINGENCY_ALL_')) # loaded into staging, not the target
+        self.assertEqual(table.column('Source_File').to_pylist(), [names[0], names[0], names[1]])
+        self.assertEqual(table.column('Ficomm_Decision').to_pylist(), [None, None, 'Approved'])
+        self.assertEqual(len(client.queries), 1)
+        self.assertIn('BEGIN TRANSACTION', client.queries[0])
+        self.assertNotIn(table_ref, client.existing) # staging table dropped
+
+    def test_failed_load_leaves_target_untouched(self):
+        client = FakeBQClient(existing=['ocfo-primary.CONTINGENCY.CONTINGENCY_ALL'])
+        df = pd.DataFrame({'Organization Name': ['Club A'], 'Amount Allocated': [100], 'Date': ['04/12/2024']})
+        with mock.patch.object(BQ_Push, 'get_cached_bigquery_client', return_value=client), \
+             mock.patch.object(BQ_Push, '_append_arrow_table', side_effect=RuntimeError("load failed")):
+            with self.assertRaises(RuntimeError):
+                BQ_Push.bigquery_push('CONTINGENCY', [df], ['Ficomm-Cont-FY25-04/12/2024-GF'], 'CONTINGENCY', duplicate_handling='consolidate', archive_dataset_id=None)
+        self.assertEqual(client.queries, []) # no DELETE ran against the target
+
+    def test_replace_sources_query(self):
+        query = build_replace_sources_query('p.d.CONTINGENCY_ALL', 'p.d._staging', ['Org', 'Source_File'], 'Source_File')
+        self.assertLess(query.index('BEGIN TRANSACTION'), query.index('DELETE FROM `p.d.CONTINGENCY_ALL` WHERE `Source_File` IN UNNEST(@source_files)'))
+        self.assertLess(query.index('INSERT INTO `p.d.CONTINGENCY_ALL` (`Org`, `Source_File`) SELECT `Org`, `Source_File` FROM `p.d._staging`'), query.index('COMMIT TRANSACTION'))
+        self.assertIn('ROLLBACK TRANSACTION', query)
+
+class TestArchive(unittest.TestCase):
+    def test_replaced_tables_are_snapshotted(self):
+        from AEOCFO.Load import BQ_Push
+        client = FakeBQClient(existing=['ocfo-primary.OASIS.OASISFY24GF'])
+        original = BQ_Push.get_cached_bigquery_client
+        BQ_Push.get_cached_bigquery_client = lambda project_id: client
+        try:
+            dfs = [pd.DataFrame({'Org ID': ['1']}), pd.DataFrame({'Org ID': ['2']})]
+            BQ_Push.bigquery_push('OASIS', dfs, ['OASIS-FY24-GF', 'OASIS-FY25-GF'], 'OASIS', archive_dataset_id='OVERWRITE')
+        finally:
+            BQ_Push.get_cached_bigquery_client = original
+
+        self.assertEqual(len(client.copies), 1) # OASIS-FY25-GF doesn't exist yet so there's nothing to archive
+        source, destination, operation = client.copies[0]
+        self.assertEqual(source, 'ocfo-primary.OASIS.OASISFY24GF')
+        self.assertTrue(destination.startswith('ocfo-primary.OVERWRITE.OASIS__OASISFY24GF__'))
+        self.assertEqual(operation, 'SNAPSHOT')
+        self.assertEqual(len(client.loads), 2)
+
+class FakeDryRunClient:
+    """Answers the dry runs and table lookups _tables_version makes."""
+    def __init__(self, tables):
+        self.tables = tables # table id -> (modified, streaming_buffer)
+        self.dry_runs = 0
+    def query(self, query, job_config=None):
+        self.dry_runs += 1
+        return mock.Mock(referenced_tables=[table_id for table_id in self.tables if table_id in query])
+    def get_table(self, ref):
+        modified, streaming_buffer = self.tables[ref]
+        return mock.Mock(full_table_id=ref, modified=modified, streaming_buffer=streaming_buffer)
+
+class TestPullCacheKey(unittest.TestCase):
+    def setUp(self):
+        modified = pd.Timestamp('2025-04-12 10:00', tz='UTC')
+        self.client = FakeDryRunClient({'p.FR.FR_ALL': (modified, None), 'p.FR.FR_LIVE': (modified, mock.Mock())})
+
+    def test_versioned_by_modified_time(self):
+        self.assertEqual(_tables_version(self.client, "SELECT * FROM `p.FR.FR_ALL`"), "p.FR.FR_ALL@2025-04-12T10:00:00+00:00")
+
+    def test_uncacheable_queries(self):
+        self.assertIsNone(_tables_version(self.client, "SELECT 1")) # no tables
+        self.assertIsNone(_tables_version(self.client, "SELECT * FROM `p.FR.FR_LIVE`")) # streaming buffer
+        dry_runs = self.client.dry_runs
+        self.assertIsNone(_tables_version(self.client, "SELECT * FROM `p.FR.FR_ALL` WHERE Date > DATE_SUB(CURRENT_DATE(), INTERVAL 7 DAY)"))
+        self.assertIsNone(_tables_version(self.client, "SELECT * FROM `p.FR.FR_ALL` WHERE rand() < 0.1"))
+        self.assertEqual(self.client.dry_runs, dry_runs) # caught before the dry run
+
+class FakeWriteClient:
+    """Records the Arrow batches appended to a Storage Write API stream."""
+    def __init__(self):
+        self.batches = []
+        self.committed = []
+        self.metadata = []
+    def table_path(self, project, dataset, table):
+        return f"projects/{project}/datasets/{dataset}/tables/{table}"
+    def create_write_stream(self, parent, write_stream):
+        from google.cloud.bigquery_storage_v1 import types
+        return types.WriteStream(name=f"{parent}/streams/s1", type_=write_stream.type_)
+    def append_rows(self, requests, metadata=()):
+        from google.cloud.bigquery_storage_v1 import types
+        self.metadata.append(tuple(metadata))
+        for request in requests:
+            schema = pa.ipc.read_schema(pa.py_buffer(request.arrow_rows.writer_schema.serialized_schema))
+            self.batches.append((request.offset, pa.ipc.read_record_batch(pa.py_buffer(request.arrow_rows.rows.serialized_record_batch), schema)))
+            yield types.AppendRowsResponse()
+    def finalize_write_stream(self, name):
+        return None
+    def batch_commit_write_streams(self, request):
+        from google.cloud.bigquery_storage_v1 import types
+        self.committed.extend(request.write_streams)
+        return types.BatchCommitWriteStreamsResponse()
+
+@unittest.skipIf(importlib.util.find_spec('google.cloud.bigquery_storage_v1') is None, "google-cloud-bigquery-storage isn't installed")
+class TestWriteAPI(unittest.TestCase):
+    def test_pending_stream_round_trip(self):
+        from AEOCFO.Load import BQ_Push
+        write_client = FakeWriteClient()
+        table = pa.table({'Org_Name': ['Club A', 'Club B', 'Club C'], 'Amount_Requested': [1.0, None, 3.0]})
+        original = BQ_Push.STREAM_REQUEST_ROWS
+        BQ_Push.STREAM_REQUEST_ROWS = 2
+        try:
+            rows = BQ_Push.stream_arrow_table(table, 'p.FR.FR_ALL', write_client=write_client)
+        finally:
+            BQ_Push.STREAM_REQUEST_ROWS = original
+        self.assertEqual(rows, 3)
+        self.assertEqual([offset for offset, _ in write_client.batches], [0, 2])
+        self.assertEqual(pa.Table.from_batches([batch for _, batch in write_client.batches]), table)
+        self.assertEqual(write_client.committed, ['projects/p/datasets/FR/tables/FR_ALL/streams/s1'])
+        self.assertEqual(write_client.metadata, [(("x-goog-request-params", "write_stream=projects/p/datasets/FR/tables/FR_ALL/streams/s1"),)])
+
+    def test_auto_threshold(self):
+        from AEOCFO.Load.BQ_Push import use_write_api
+        self.assertTrue(use_write_api(10, 'auto', threshold=100))
+        self.assertFalse(use_write_api(1000, 'auto', threshold=100))
+        self.assertFalse(use_write_api(10, 'never'))
+
+if __name__ == "__main__":
+    unittest.main()
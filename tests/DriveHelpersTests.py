@@ -0,0 +1,289 @@
+import unittest
+import os
+import io
+import json
+import tempfile
+from unittest import mock
+import pandas as pd
+from googleapiclient.http import HttpRequest, HttpMockSequence, MediaIoBaseUpload
+
+from AEOCFO.Utility.Drive_Helpers import *
+from AEOCFO.Utility.Format_Helpers import write_dataframe, hash_dataframe
+from AEOCFO.Load import Drive_Push
+from AEOCFO.Utility.Drive_Cache import DriveCache, file_version
+
+class _FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+class _FakeFiles:
+    """Stands in for service.files() and serves a listing in fixed size pages."""
+    def __init__(self, files, page_size):
+        self.files = files
+        self.page_size = page_size
+        self.calls = []
+
+    def list(self, q=None, fields=None, pageSize=None, pageToken=None, **kwargs):
+        self.calls.append({'q': q, 'fields': fields, 'pageToken': pageToken})
+        start = int(pageToken) if pageToken else 0
+        end = start + self.page_size
+        requested = fields[fields.index('files(') + 6:-1].split(', ') if fields and 'files(' in fields else None
+        response = {'files': [{k: v for k, v in f.items() if requested is None or k in requested} for f in self.files[start:end]]} # only the requested fields
+        if end < len(self.files):
+            response['nextPageToken'] = str(end)
+        return _FakeRequest(response)
+
+class _FakeService:
+    def __init__(self, files, page_size=2):
+        self._files = _FakeFiles(files, page_size)
+
+    def files(self):
+        return self._files
+
+class TestBuildFilesQuery(unittest.TestCase):
+
+    def test_all_excludes_trashed(self):
+        self.assertEqual(build_files_query('abc'), "'abc' in parents and trashed = false")
+
+    def test_mime_combo(self):
+        query = build_files_query('abc', query_type='csv+gspreadsheet')
+        self.assertIn("(mimeType='text/csv' or mimeType='application/vnd.google-apps.spreadsheet')", query)
+        self.assertNotIn("name contains", query)
+        self.assertTrue(query.endswith("trashed = false"))
+
+    def test_folder_id_is_escaped(self):
+        self.assertIn("'O\\'Neil' in parents", build_files_query("O'Neil"))
+
+    def test_unsupported_query_type(self):
+        with self.assertRaises(ValueError):
+            build_files_query('abc', query_type='pdf')
+
+class TestIterFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.files = [{'id': str(i), 'name': f"FR S{i:02d}", 'mimeType': 'text/csv'} for i in range(5)]
+
+    def test_follows_every_page(self):
+        service = _FakeService(self.files, page_size=2)
+        result = list(iter_files(service, 'abc', fields="id, name"))
+        self.assertEqual([f['id'] for f in result], ['0', '1', '2', '3', '4'])
+        self.assertEqual(len(service.files().calls), 3)
+        self.assertEqual(service.files().calls[0]['fields'], "nextPageToken, files(id, name)")
+
+    def test_keyword_substring_guard(self):
+        service = _FakeService(self.files, page_size=10)
+        result = list(iter_files(service, 'abc', name_keywords=['s03']))
+        self.assertEqual([f['id'] for f in result], ['3'])
+
+    def test_keywords_match_mid_word(self):
+        files = [{'id': '0', 'name': 'Ficomm-Reso-FY25-04/12/2024-S09-GF'}, {'id': '1', 'name': 'OASIS-FY24-GF'}]
+        service = _FakeService(files, page_size=10)
+        result = list(iter_files(service, 'abc', name_keywords=['FY25', 'S09']))
+        self.assertEqual([f['id'] for f in result], ['0'])
+        self.assertNotIn("name contains", service.files().calls[0]['q'])
+
+    def test_keywords_with_id_only_listing(self):
+        service = _FakeService(self.files, page_size=10)
+        self.assertEqual(list_files('abc', rv='ID', name_keywords=['S03'], service=service), ['3'])
+        self.assertIn("name", service.files().calls[0]['fields'])
+
+    def test_is_lazy(self):
+        service = _FakeService(self.files, page_size=2)
+        gen = iter_files(service, 'abc')
+        next(gen)
+        self.assertEqual(len(service.files().calls), 1)
+
+class TestFolderNameIndex(unittest.TestCase):
+
+    def test_built_from_paginated_listing(self):
+        service = _FakeService([{'id': str(i), 'name': f"ABSA-FY{i}-GF"} for i in range(5)], page_size=2)
+        index = FolderNameIndex.from_drive(service, ['folder'])
+        self.assertEqual(len(service.files().calls), 3)
+        self.assertIn(('folder', 'ABSA-FY4-GF'), index)
+        self.assertEqual(index.file_id('folder', 'ABSA-FY4-GF'), '4')
+        self.assertNotIn(('other', 'ABSA-FY4-GF'), index)
+
+    def test_numbered_names_continue_from_existing(self):
+        index = FolderNameIndex({'folder': [{'name': 'FR-GF'}, {'name': 'FR-GF (1)'}, {'name': 'FR-GF (2)'}]})
+        self.assertEqual(index.reserve('folder', 'FR-GF'), 'FR-GF (3)')
+        self.assertEqual(index.reserve('folder', 'FR-GF'), 'FR-GF (4)')
+        self.assertEqual(index.reserve('folder', 'OASIS-GF'), 'OASIS-GF')
+        self.assertEqual(index.reserve('folder', 'OASIS-GF'), 'OASIS-GF (1)')
+
+    def test_move_to_archive(self):
+        index = FolderNameIndex({'folder': [{'id': 'a', 'name': 'FR-GF'}], 'archive': [{'id': 'b', 'name': 'OVERWRITE-FR-GF'}]})
+        archive_name = index.unique_name('archive', 'OVERWRITE-FR-GF')
+        index.move('FR-GF', 'folder', 'archive', new_name=archive_name)
+        self.assertEqual(archive_name, 'OVERWRITE-FR-GF (1)')
+        self.assertNotIn(('folder', 'FR-GF'), index)
+        self.assertEqual(index.file_id('archive', archive_name), 'a')
+
+class TestSharedNameIndex(unittest.TestCase):
+
+    def test_folder_listed_once_across_pushes(self):
+        service = _FakeService([{'id': 'a', 'name': 'FR-GF'}], page_size=10)
+        uploaded, recorded, hashed = [], [], []
+        def fake_upload(df, file_name, folder_id, account, **kwargs):
+            uploaded.append(file_name)
+            return f"id-{len(uploaded)}", f"sha256:{len(uploaded)}"
+        def fake_hash(df, fmt):
+            hashed.append(fmt)
+            return "sha256:other"
+        def fake_record(service, ids, hashes, logger, reporting=False):
+            recorded.append(dict(hashes))
+        index = FolderNameIndex({})
+        df = pd.DataFrame({'Org Name': ['Club A']})
+        with mock.patch.object(Drive_Push, 'authenticate_credentials', return_value=service), \
+             mock.patch.object(Drive_Push, '_upload_df', side_effect=fake_upload), \
+             mock.patch.object(Drive_Push, '_record_hashes', side_effect=fake_record), \
+             mock.patch.object(Drive_Push, 'hash_dataframe', side_effect=fake_hash):
+            for _ in range(2):
+                Drive_Push.drive_push('folder', [df], ['FR-GF'], 'FR', duplicate_handling='Number', name_index=index)
+        self.assertEqual(hashed, []) # 'FR-GF' has no stored hash so nothing is hashed up front
+        self.assertEqual(recorded, [{'FR-GF (1)': 'sha256:1'}, {'FR-GF (2)': 'sha256:2'}])
+        self.assertEqual(len(service.files().calls), 1)
+        self.assertEqual(uploaded, ['FR-GF (1)', 'FR-GF (2)']) # the second push numbers past the first push's upload
+        self.assertEqual(index.file_id('folder', 'FR-GF (1)'), 'id-1')
+        self.assertIn(Drive_Push.CONTENT_HASH_PROPERTY, index.app_properties('folder', 'FR-GF (2)'))
+
+class _FakeBatch:
+    """Stands in for service.new_batch_http_request(), calling back with each request's response or error."""
+    def __init__(self, callback, log):
+        self.callback = callback
+        self.requests = []
+        log.append(self)
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            if isinstance(request, Exception):
+                self.callback(request_id, None, request)
+            else:
+                self.callback(request_id, request.execute(), None)
+
+class TestExecuteBatched(unittest.TestCase):
+
+    def test_batches_and_per_call_results(self):
+        batches = []
+        service = type('Service', (), {'new_batch_http_request': lambda self, callback: _FakeBatch(callback, batches)})()
+        requests = [(f"file-{i}", _FakeRequest({'id': str(i)})) for i in range(5)]
+        requests[3] = ('file-3', RuntimeError('rate limited'))
+        results = execute_batched(service, requests, batch_size=2)
+
+        self.assertEqual([len(batch.requests) for batch in batches], [2, 2, 1])
+        self.assertEqual(list(results), [f"file-{i}" for i in range(5)])
+        self.assertEqual(results['file-4'], ({'id': '4'}, None))
+        self.assertIsNone(results['file-3'][0])
+        self.assertIsInstance(results['file-3'][1], RuntimeError)
+
+class TestResumableUpload(unittest.TestCase):
+
+    def test_resumes_from_acknowledged_byte(self):
+        chunk = 256 * 1024
+        media = MediaIoBaseUpload(io.BytesIO(b'x' * (chunk * 2 + 10)), mimetype='text/csv', chunksize=chunk, resumable=True)
+        class _RecordingHttp(HttpMockSequence):
+            ranges = []
+            def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+                self.ranges.append((headers or {}).get('Content-Range'))
+                return super().request(uri, method, body, headers, **kwargs)
+
+        http = _RecordingHttp([
+            ({'status': '200', 'location': 'https://upload/session'}, ''),
+            ({'status': '308', 'range': f'bytes=0-{chunk - 1}'}, ''),
+            ({'status': '503'}, ''), # second chunk fails
+            ({'status': '308', 'range': f'bytes=0-{chunk - 1}'}, ''), # drive only has the first chunk
+            ({'status': '308', 'range': f'bytes=0-{2 * chunk - 1}'}, ''),
+            ({'status': '200'}, json.dumps({'id': 'new-file'})),
+        ])
+        request = HttpRequest(http, lambda resp, content: json.loads(content), 'https://upload/files?uploadType=resumable', method='POST', body='{}', resumable=media)
+
+        with mock.patch.object(Drive_Push.time, 'sleep'):
+            self.assertEqual(Drive_Push._execute_resumable(request, 'FICCOMBINE-FY25'), {'id': 'new-file'})
+        total = chunk * 2 + 10
+        self.assertEqual(http.ranges[1:], [f'bytes 0-{chunk - 1}/{total}', f'bytes {chunk}-{2 * chunk - 1}/{total}', f'bytes */{total}',
+                                           f'bytes {chunk}-{2 * chunk - 1}/{total}', f'bytes {2 * chunk}-{total - 1}/{total}']) # the first chunk is never re-sent
+
+class TestDataFrameMediaUpload(unittest.TestCase):
+
+    def _upload(self, media, resend_at=None):
+        """Reads a media body the way HttpRequest.next_chunk does, re-sending the chunk at 'resend_at' once. Returns the bytes and the size sent with the last chunk."""
+        sent, progress, chunk = bytearray(), 0, media.chunksize()
+        while True:
+            size = media.size() # next_chunk checks the size before reading the chunk
+            data = media.getbytes(progress, chunk)
+            self.assertTrue(data or progress == 0, "an empty final chunk means the size wasn't known in time")
+            if progress == resend_at:
+                resend_at = None
+                continue
+            sent += data
+            progress += len(data)
+            if len(data) < chunk or size == progress:
+                return bytes(sent), size if size is not None else progress
+            self.assertLessEqual(len(media._window), 3 * chunk) # about two chunks plus one row chunk are held
+
+    def test_streams_same_bytes_as_write_dataframe(self):
+        df = pd.DataFrame({'Org ID': range(40000), 'Organization Name': ['Club A'] * 40000})
+        expected = io.BytesIO()
+        write_dataframe(df, expected, 'csv')
+
+        media = DataFrameMediaUpload(df, 'csv', chunksize=256 * 1024, chunk_rows=2000)
+        self.assertIsNone(media.size())
+        sent, size = self._upload(media, resend_at=256 * 1024)
+        self.assertEqual(sent, expected.getvalue())
+        self.assertEqual(size, len(sent))
+
+    def test_hash_computed_while_streaming(self):
+        df = pd.DataFrame({'Org ID': range(40000), 'Organization Name': ['Club A'] * 40000})
+        for fmt in ['csv', 'csv.gz', 'parquet']:
+            media = DataFrameMediaUpload(df, fmt, chunksize=256 * 1024, chunk_rows=2000)
+            self._upload(media)
+            self.assertEqual(media.content_hash(), hash_dataframe(df, fmt, chunk_rows=2000))
+
+    def test_last_chunk_on_boundary_carries_size(self):
+        chunk = 256 * 1024
+        df = pd.DataFrame({'a': ['x' * (chunk - 3), 'y' * (chunk - 1)]}) # 'a\n' + each row is exactly one chunk
+        sent, size = self._upload(DataFrameMediaUpload(df, 'csv', chunksize=chunk, chunk_rows=1))
+        self.assertEqual(size, 2 * chunk)
+        self.assertEqual(len(sent), 2 * chunk)
+
+class TestDriveCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DriveCache(cache_dir=self.tmp.name, max_bytes=10)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        key = DriveCache.key('abc', 'md5Checksum:1')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, b'hello')
+        self.assertEqual(self.cache.get(key), b'hello')
+
+    def test_version_and_variant_change_key(self):
+        self.assertNotEqual(DriveCache.key('abc', 'v1'), DriveCache.key('abc', 'v2'))
+        self.assertNotEqual(DriveCache.key('abc', 'v1', 'export:text/csv'), DriveCache.key('abc', 'v1'))
+
+    def test_lru_eviction(self):
+        a, b, c = DriveCache.key('a', 'v'), DriveCache.key('b', 'v'), DriveCache.key('c', 'v')
+        self.cache.put(a, b'1234')
+        self.cache.put(b, b'1234')
+        os.utime(os.path.join(self.tmp.name, a), (0, 0)) # make 'a' the least recently used
+        os.utime(os.path.join(self.tmp.name, b), (1, 1))
+        self.cache.get(a) # touching 'a' makes 'b' the eviction candidate
+        self.cache.put(c, b'1234')
+        self.assertIsNotNone(self.cache.get(a))
+        self.assertIsNone(self.cache.get(b))
+        self.assertIsNotNone(self.cache.get(c))
+        self.assertLessEqual(self.cache.size(), 10)
+
+    def test_file_version_preference(self):
+        self.assertEqual(file_version({'md5Checksum': 'x', 'modifiedTime': 't'}), 'md5Checksum:x')
+        self.assertEqual(file_version({'md5Checksum': None, 'modifiedTime': 't'}), 'modifiedTime:t')
+        self.assertIsNone(file_version({'id': 'abc'}))
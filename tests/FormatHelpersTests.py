@@ -0,0 +1,54 @@
+import unittest
+import io
+import hashlib
+from unittest import mock
+import pandas as pd
+
+from AEOCFO.Utility.Format_Helpers import write_dataframe, get_output_format, hash_dataframe, iter_dataframe_bytes, read_dataframe, format_from_mimetype
+from AEOCFO.Load import GCP_Push
+
+class TestWriteDataframe(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({'Organization Name': ['Club A', 'Club, B', 'Club C'], 'Amount Allocated': [100.0, 250.5, None]})
+
+    def test_round_trips(self):
+        readers = {
+            'csv': lambda data: pd.read_csv(io.BytesIO(data)),
+            'csv.gz': lambda data: pd.read_csv(io.BytesIO(data), compression='gzip'),
+            'parquet': lambda data: pd.read_parquet(io.BytesIO(data))
+        }
+        for fmt, reader in readers.items():
+            buffer = io.BytesIO()
+            write_dataframe(self.df, buffer, fmt=fmt, chunk_rows=2)
+            self.assertFalse(buffer.closed, f"{fmt} writer closed the file object")
+            pd.testing.assert_frame_equal(reader(buffer.getvalue()), self.df)
+
+    def test_hash_matches_serialised_bytes(self):
+        buffer = io.BytesIO()
+        write_dataframe(self.df, buffer, fmt='csv', chunk_rows=2)
+        self.assertEqual(hash_dataframe(self.df, chunk_rows=2), f"sha256:{hashlib.sha256(buffer.getvalue()).hexdigest()}")
+        self.assertEqual(hash_dataframe(self.df), hash_dataframe(self.df.copy()))
+        self.assertNotEqual(hash_dataframe(self.df), hash_dataframe(self.df.head(2)))
+
+    def test_streamed_bytes_read_back(self):
+        for fmt in ['csv', 'csv.gz', 'parquet']:
+            data = b''.join(iter_dataframe_bytes(self.df, fmt, chunk_rows=2))
+            pd.testing.assert_frame_equal(read_dataframe(io.BytesIO(data), format_from_mimetype(get_output_format(fmt)['content_type'])), self.df)
+            self.assertEqual(hash_dataframe(self.df, fmt), hash_dataframe(self.df.copy(), fmt), f"{fmt} hash isn't stable")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            get_output_format('xlsx')
+
+class TestGCSBlobNames(unittest.TestCase):
+    @mock.patch.object(GCP_Push, 'get_cached_storage_client')
+    @mock.patch.object(GCP_Push, 'push_df_to_gcs')
+    def test_csv_keeps_bare_name(self, push, _client):
+        df = pd.DataFrame({'Amount': [1]})
+        self.assertEqual(GCP_Push.gcs_push_from_dfs('bucket', [df], ['FR 25/26'], 'FR', output_format='csv'), [GCP_Push.clean_name('FR 25/26')])
+        self.assertEqual(GCP_Push.gcs_push_from_dfs('bucket', [df], ['FR 25/26'], 'FR', output_format='parquet'), [GCP_Push.clean_name('FR 25/26') + '.parquet'])
+        self.assertEqual([call.args[2] for call in push.call_args_list], [GCP_Push.clean_name('FR 25/26'), GCP_Push.clean_name('FR 25/26') + '.parquet'])
+
+
+if __name__ == "__main__":
+    unittest.main()
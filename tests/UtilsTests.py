@@ -547,6 +547,97 @@ class TestHeadingFinder(unittest.TestCase):
         with self.assertRaises(ValueError):
             heading_finder(self.df, start_col='A', start='Header1', end_col='A', end='NonExistentEnd')
 
+class TestSectionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            0: ['FY25 GENERAL BUDGET', 'Senate ', 'Item 1', 'Item 2', 'SUBTOTAL', 'Student Activity Groups (SAG)', 'Organization', 'Club A', 'SAG SUBTOTAL', 'Elections', np.nan, 'SUBTOTAL'],
+            1: [None, 'Amount', 10, 20, 30, None, 'Amount', 5, 5, 'Amount', 1, 1]
+        })
+        self.labels = ['Senate', 'Student Activity Groups (SAG)', 'Elections']
+
+    def test_single_pass_positions(self):
+        starts, ends = section_index(self.df, 0, self.labels + ['Operations'], end='SUBTOTAL')
+        self.assertEqual(starts, {'Senate': 1, 'Student Activity Groups (SAG)': 5, 'Elections': 9})
+        self.assertEqual(ends, [4, 8, 11])
+
+    def test_matches_heading_finder(self):
+        index = section_index(self.df, 0, self.labels, end='SUBTOTAL')
+        for label, shift in [('Senate', 0), ('Student Activity Groups (SAG)', 1), ('Elections', 0)]:
+            expected = heading_finder(self.df, start_col=0, start=label, shift=shift, end='SUBTOTAL', start_logic='exact', end_logic='contains')
+            pd.testing.assert_frame_equal(section_slicer(self.df, index, label, shift=shift), expected)
+
+    def test_missing_label_or_end(self):
+        index = section_index(self.df.iloc[:11], 0, self.labels, end='SUBTOTAL')
+        with self.assertRaises(ValueError):
+            section_slicer(self.df, index, 'Operations')
+        with self.assertRaises(ValueError):
+            section_slicer(self.df, index, 'Elections') # its SUBTOTAL row was cut off
+
+class TestPreparedSheet(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            0: ['Budget', ' Header ', 'Item 1', 'Item 2', 'SUBTOTAL', 'Header', 'Item 3', 'Total: 5', np.nan, 'SUBTOTAL'],
+            1: [None, 'Amount', 10, 20, 30, 'Amount', 5, 5, 1, 1]
+        })
+
+    def test_drop_in_for_dataframe(self):
+        sheet = PreparedSheet(self.df)
+        searches = [
+            dict(start_col=0, start='Header', end='SUBTOTAL'),
+            dict(start_col=0, start='Header', nth_start=1, end='SUBTOTAL'),
+            dict(start_col=0, start='Head', start_logic='contains', end='SUBTOTAL', end_logic='contains'),
+            dict(start_col=0, start='Header', nth_start=1, end=['Total: 5', 'SUBTOTAL']),
+            dict(start_col=0, start='Item 2', shift=-1, end='Total', end_logic='contains'),
+            dict(start_col=0, start='Header', shift=1),
+        ]
+        for kwargs in searches:
+            pd.testing.assert_frame_equal(heading_finder(sheet, **kwargs), heading_finder(self.df.copy(), **kwargs))
+
+    def test_lookups_are_memoised(self):
+        sheet = PreparedSheet(self.df)
+        self.assertEqual(sheet.start_rows(0, 'Header'), [1, 5])
+        self.assertIs(sheet.normalised(0), sheet.normalised(0))
+        self.assertIs(sheet.end_rows(0, 'SUBTOTAL', logic='contains'), sheet.end_rows(0, 'SUBTOTAL', logic='contains'))
+        self.assertEqual(sheet.end_rows(0, 'SUBTOTAL'), [4, 9])
+
+    def test_missing_values_raise(self):
+        sheet = PreparedSheet(self.df)
+        with self.assertRaises(ValueError):
+            heading_finder(sheet, start_col=0, start='Operations')
+        with self.assertRaises(ValueError):
+            heading_finder(sheet, start_col=0, start='Header', nth_start=1, end='Item 1')
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            0: ['Header', 'Item 1', 'Total (GF)', 'Header', 'Item 2', 'Total GF', 'SUBTOTAL', 12],
+            1: ['Amount', 10, 10, 'Amount', 5, 5, 15, 0]
+        })
+
+    def test_keywords_match_literally(self):
+        rv = heading_finder(self.df, start_col=0, start='Header', end=['Total (GF)', 'SUBTOTAL'], end_logic='contains')
+        self.assertEqual(rv[rv.columns[0]].tolist(), ['Item 1'])
+        rv = heading_finder(self.df, start_col=0, start='Header', nth_start=1, end=['Total (GF)', 'SUBTOTAL'], end_logic='contains')
+        self.assertEqual(rv[rv.columns[0]].tolist(), ['Item 2', 'Total GF']) # 'Total GF' doesn't match the escaped '(GF)'
+
+    def test_scan_stops_at_limit(self):
+        matcher = keyword_matcher(['Total', 'SUBTOTAL'])
+        self.assertIs(matcher, keyword_matcher(('Total', 'SUBTOTAL')))
+        values = self.df[0].to_numpy()
+        self.assertEqual(matcher.scan(values, start=3, limit=1), [5])
+        self.assertEqual(matcher.scan(values), [2, 5, 6])
+
+    def test_matches_full_column_search(self):
+        sheet = PreparedSheet(self.df)
+        for end in ['Total', ['Total (GF)', 'SUBTOTAL'], 'SUB|GF']:
+            for start in range(len(self.df)):
+                full = sheet.end_rows(0, end, logic='contains')
+                scanned = PreparedSheet(self.df).next_end_rows(0, end, logic='contains', start=start, count=2)
+                self.assertEqual(scanned, [row for row in full if row >= start][:2])
+
 class TestEndingKeywordAdder(unittest.TestCase):
     def setUp(self):
         self.df_base = pd.DataFrame({